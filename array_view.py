@@ -0,0 +1,117 @@
+import tkinter as tk
+
+
+class ArrayView(tk.Frame):
+    '''
+    Read-only, paged view of an in-memory array. Only the elements of the
+    current page are ever turned into text, so arrays with millions of elements
+    display instantly.
+    '''
+
+    def __init__(self, master: tk.Misc, font, button_bg: str, width: int = 80, page_size: int = 100) -> None:
+        '''
+        Constructor to initialize attributes and create the widgets
+        '''
+        super().__init__(master)
+        self.__array = None
+        self.__page_size = page_size
+        self.__first = 0
+
+        # Text-box showing the elements of the current page
+        self.__text = tk.Text(self,
+                              width=width,
+                              height=1,
+                              wrap=tk.NONE,
+                              borderwidth=5,
+                              font=font,
+                              state=tk.DISABLED)
+        self.__text.pack(side=tk.LEFT)
+
+        # Buttons to move to the first, previous, next and last page
+        for label, command in (("|<", self.first_page), ("<", self.previous_page),
+                               (">", self.next_page), (">|", self.last_page)):
+            button = tk.Button(self, text=label, bg=button_bg, font=font, width=2, command=command)
+            button.pack(side=tk.LEFT, padx=2)
+
+        # Position of the current page inside the array
+        self.__position = tk.Label(self, text="", font=font, width=22, anchor=tk.W)
+        self.__position.pack(side=tk.LEFT, padx=5)
+
+    def set_array(self, array) -> None:
+        '''
+        Shows the array starting from its first page. The array is kept by
+        reference and never converted as a whole.
+        '''
+        self.__array = array
+        self.first_page()
+
+    def get_array(self):
+        '''
+        Returns the array shown in the view, None if it shows nothing
+        '''
+        return self.__array
+
+    def set_message(self, message: str) -> None:
+        '''
+        Replaces the array with a text message
+        '''
+        self.__array = None
+        self.__show(message, "")
+
+    def clear(self) -> None:
+        '''
+        Removes the array or message from the view
+        '''
+        self.set_message("")
+
+    def first_page(self) -> None:
+        '''
+        Shows the first page of the array
+        '''
+        self.__go_to(0)
+
+    def previous_page(self) -> None:
+        '''
+        Shows the page before the current one
+        '''
+        self.__go_to(self.__first - self.__page_size)
+
+    def next_page(self) -> None:
+        '''
+        Shows the page after the current one
+        '''
+        self.__go_to(self.__first + self.__page_size)
+
+    def last_page(self) -> None:
+        '''
+        Shows the last page of the array
+        '''
+        if self.__array is not None:
+            last = max(len(self.__array) - 1, 0)
+            self.__go_to(last - last % self.__page_size)
+
+    def __go_to(self, first: int) -> None:
+        '''
+        Renders the page starting at index first, clamped to the array
+        '''
+        if self.__array is None:
+            return
+
+        size = len(self.__array)
+        self.__first = min(max(first, 0), max(size - 1, 0))
+        last = min(self.__first + self.__page_size, size)
+
+        # Only this slice is formatted, whatever the size of the array
+        page = " ".join(map(str, self.__array[self.__first:last]))
+        position = f"{self.__first + 1}-{last} of {size}" if size else "empty"
+        self.__show(page, position)
+
+    def __show(self, text: str, position: str) -> None:
+        '''
+        Replaces the content of the text-box and the position label
+        '''
+        self.__text.configure(state=tk.NORMAL)
+        self.__text.delete("1.0", tk.END)
+        self.__text.insert("1.0", text)
+        self.__text.configure(state=tk.DISABLED)
+        self.__position.configure(text=position)
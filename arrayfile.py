@@ -0,0 +1,116 @@
+import mmap
+import struct
+import sys
+from array import array
+from vectorized import VectorizedSorter, numpy
+
+
+class ArrayFile:
+    '''
+    Loads and saves integer arrays in a compact binary format: a 16 byte
+    header followed by the raw little-endian values. Files ending in .npy use
+    the NumPy format instead. Loading memory-maps the file, so even huge
+    arrays open instantly and can be passed to the Sorter as they are.
+    '''
+
+    # Magic bytes, format version, typecode, two padding bytes, item count
+    __HEADER = struct.Struct("<4sBcxxQ")
+    __MAGIC = b"SRTA"
+    __VERSION = 1
+
+    # Supported element types: int32 and int64
+    TYPECODES = ("i", "q")
+
+    # Extension of files handled by NumPy
+    NPY_EXTENSION = ".npy"
+
+    @staticmethod
+    def save(path: str, values, typecode: str = "q") -> None:
+        '''
+        Writes the integer values to path, as int32 (typecode "i") or int64
+        (typecode "q")
+        '''
+        if typecode not in ArrayFile.TYPECODES:
+            raise ValueError(f"Unknown typecode: {typecode}")
+
+        if path.endswith(ArrayFile.NPY_EXTENSION):
+            ArrayFile.__require_numpy()
+            try:
+                data = numpy.asarray(values, dtype=numpy.int32 if typecode == "i" else numpy.int64)
+            except OverflowError:
+                raise ValueError(f"values do not fit into typecode {typecode!r}") from None
+            # Converting a NumPy array wraps around instead of raising
+            if isinstance(values, numpy.ndarray) and not numpy.array_equal(data, values):
+                raise ValueError(f"values do not fit into typecode {typecode!r}")
+            numpy.save(path, data)
+            return
+
+        try:
+            data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+        except OverflowError:
+            raise ValueError(f"values do not fit into typecode {typecode!r}") from None
+        if sys.byteorder == "big":
+            data = array(typecode, data)
+            data.byteswap()
+
+        with open(path, "wb") as file:
+            file.write(ArrayFile.__HEADER.pack(
+                ArrayFile.__MAGIC, ArrayFile.__VERSION, typecode.encode(), len(data)))
+            data.tofile(file)
+
+    @staticmethod
+    def load(path: str, writable: bool = True):
+        '''
+        Memory-maps the array stored at path. Returns a memoryview of ints, or a
+        NumPy memmap for .npy files. A writable map is copy-on-write, so sorting
+        it in place never changes the file.
+        '''
+        access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+        if path.endswith(ArrayFile.NPY_EXTENSION):
+            ArrayFile.__require_numpy()
+            return numpy.load(path, mmap_mode="c" if writable else "r")
+
+        typecode, count = ArrayFile.read_header(path)
+        itemsize = array(typecode).itemsize
+        start = ArrayFile.__HEADER.size
+        end = start + count * itemsize
+
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=access)
+        if len(mapped) < end:
+            raise ValueError(f"{path} is shorter than its header says")
+
+        # The view keeps the map alive after the file is closed
+        view = memoryview(mapped)[start:end].cast(typecode)
+        if sys.byteorder == "big":
+            # Values are stored little-endian, fix them in a private copy
+            values = array(typecode, view)
+            values.byteswap()
+            return memoryview(values)
+        return view
+
+    @staticmethod
+    def read_header(path: str) -> tuple:
+        '''
+        Returns the typecode and item count stored in the header of path
+        '''
+        with open(path, "rb") as file:
+            header = file.read(ArrayFile.__HEADER.size)
+        if len(header) != ArrayFile.__HEADER.size:
+            raise ValueError(f"{path} is not an array file")
+
+        magic, version, typecode, count = ArrayFile.__HEADER.unpack(header)
+        typecode = typecode.decode()
+        if magic != ArrayFile.__MAGIC or typecode not in ArrayFile.TYPECODES:
+            raise ValueError(f"{path} is not an array file")
+        if version != ArrayFile.__VERSION:
+            raise ValueError(f"{path} uses unsupported format version {version}")
+        return typecode, count
+
+    @staticmethod
+    def __require_numpy() -> None:
+        '''
+        Private helper static method that fails clearly when NumPy is missing
+        '''
+        if not VectorizedSorter.is_available():
+            raise ImportError(".npy files need NumPy to be installed")
@@ -0,0 +1,355 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from sorter import Sorter
+
+
+class InputProfile:
+    '''
+    Cheap estimate of the properties of an array that decide which algorithm
+    is fastest, computed from a fixed size sample in sublinear time
+    '''
+
+    # Number of positions, adjacent pairs and random pairs sampled
+    SAMPLE_SIZE = 512
+
+    def __init__(self, array, seed: int = 0) -> None:
+        '''
+        Constructor that samples the array
+        '''
+        size = len(array)
+        rng = random.Random(seed)
+        self.size = size
+
+        # Sample values at random positions, or all of them for small arrays
+        if size <= InputProfile.SAMPLE_SIZE:
+            sample = list(array)
+        else:
+            sample = [array[rng.randrange(size)] for _ in range(InputProfile.SAMPLE_SIZE)]
+
+        self.is_integer = all(isinstance(value, int) for value in sample)
+        self.minimum = min(sample) if sample else 0
+        self.maximum = max(sample) if sample else 0
+        self.value_range = self.maximum - self.minimum + 1 if self.is_integer else None
+
+        # Share of repeated values in the sample
+        self.sample_size = len(sample)
+        self.sample_distinct = len(set(sample))
+        self.duplicate_ratio = 1 - self.sample_distinct / len(sample) if sample else 0.0
+
+        # Share of random adjacent pairs in ascending and in descending order
+        pairs = min(size - 1, InputProfile.SAMPLE_SIZE)
+        ascending = descending = 0
+        for _ in range(max(pairs, 0)):
+            i = rng.randrange(size - 1)
+            if array[i + 1] < array[i]:
+                descending += 1
+            elif array[i] < array[i + 1]:
+                ascending += 1
+        self.ascending_ratio = ascending / pairs if pairs > 0 else 1.0
+        self.descending_ratio = descending / pairs if pairs > 0 else 0.0
+
+        # Share of random pairs (i < j) that are inverted
+        inverted = 0
+        for _ in range(max(pairs, 0)):
+            i, j = sorted(rng.sample(range(size), 2))
+            if array[j] < array[i]:
+                inverted += 1
+        self.inversion_ratio = inverted / pairs if pairs > 0 else 0.0
+
+    def runs(self) -> float:
+        '''
+        Estimated number of natural runs, descending runs counting as runs too
+        '''
+        breaks = 1 - max(self.ascending_ratio, self.descending_ratio)
+        return 1 + breaks * max(self.size - 1, 0)
+
+    def distinct(self) -> float:
+        '''
+        Estimated number of distinct values. A sample with many repeats has
+        likely seen nearly every value, otherwise the repeats are scaled up.
+        '''
+        if self.sample_size == self.size or 2 * self.sample_distinct <= self.sample_size:
+            return self.sample_distinct
+        return max(self.size * (1 - self.duplicate_ratio), self.sample_distinct)
+
+    def inversions(self) -> float:
+        '''
+        Estimated number of inverted pairs
+        '''
+        return self.inversion_ratio * self.size * (self.size - 1) / 2
+
+    def as_dict(self) -> dict:
+        '''
+        Returns the profile as a dictionary
+        '''
+        return {
+            "size": self.size,
+            "value_range": self.value_range,
+            "duplicate_ratio": self.duplicate_ratio,
+            "distinct": self.distinct(),
+            "ascending_ratio": self.ascending_ratio,
+            "descending_ratio": self.descending_ratio,
+            "inversion_ratio": self.inversion_ratio,
+        }
+
+
+class CostModel:
+    '''
+    Predicts the running time of every algorithm from an InputProfile. Each
+    algorithm has a work formula (n log n, inversions, n + range, ...) and a
+    constant in seconds per unit of work that can be recalibrated on the host.
+    '''
+
+    # Seconds per unit of work measured on a reference machine
+    DEFAULT_CONSTANTS = {
+        "Insertion Sort": 2.0e-7,
+        "Heap Sort": 4.5e-7,
+        "Quick Sort": 1.2e-7,
+        "Three-Way Quick Sort": 1.5e-7,
+        "Merge Sort": 2.0e-7,
+        "Counting Sort": 1.5e-7,
+        "Radix Sort": 6.0e-7,
+    }
+
+    # Insertion sort is only a candidate up to this size. The sample cannot
+    # see a few inversions in a large array, and each costs up to n moves.
+    QUADRATIC_MAX_SIZE = 64
+
+    # Algorithms in the order they win ties, those with the best worst case
+    # first
+    TIE_ORDER = ("Merge Sort", "Quick Sort", "Three-Way Quick Sort", "Heap Sort",
+                 "Radix Sort", "Counting Sort", "Insertion Sort")
+
+    # Where calibrated constants are kept between runs
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "sorting-gui", "cost_model.json")
+
+    def __init__(self, constants: dict = None) -> None:
+        '''
+        Constructor to initialize the constants, the defaults if none are given
+        '''
+        self.constants = dict(CostModel.DEFAULT_CONSTANTS)
+        if constants:
+            self.constants.update(constants)
+
+    @staticmethod
+    def work(algorithm: str, profile: InputProfile) -> float:
+        '''
+        Units of work the algorithm needs for the profiled input, None if the
+        algorithm cannot sort it
+        '''
+        n = max(profile.size, 1)
+        n_log_n = n * max(math.log2(n), 1)
+
+        if algorithm == "Insertion Sort":
+            return n + profile.inversions()
+        if algorithm in ("Heap Sort", "Quick Sort"):
+            return n_log_n
+        if algorithm == "Merge Sort":
+            return n * max(math.log2(max(profile.runs(), 1)), 1)
+        if algorithm == "Three-Way Quick Sort":
+            distinct = max(profile.distinct(), 1)
+            distinct_log = distinct * max(math.log2(distinct), 1)
+            # Few distinct values are counted, then only they are sorted
+            if distinct <= n // Sorter.DUPLICATE_FACTOR:
+                return n + distinct_log
+            return n * max(math.log2(distinct), 1)
+
+        # Integer only algorithms
+        if not profile.is_integer:
+            return None
+        passes = max(math.ceil((profile.value_range - 1).bit_length() /
+                               (16 if n >= Sorter.RADIX_BASE else 8)), 1)
+        radix_work = passes * (2 * n + (Sorter.RADIX_BASE if n >= Sorter.RADIX_BASE else 256))
+        if algorithm == "Radix Sort":
+            return radix_work
+        if algorithm == "Counting Sort":
+            return 2 * n + profile.value_range
+        return None
+
+    def predict(self, algorithm: str, profile: InputProfile) -> float:
+        '''
+        Predicted running time in seconds, None if the algorithm cannot be used
+        '''
+        algorithm = CostModel.__runs_as(algorithm, profile)
+        work = CostModel.work(algorithm, profile)
+        if work is None or algorithm not in self.constants:
+            return None
+        return work * self.constants[algorithm]
+
+    @staticmethod
+    def __runs_as(algorithm: str, profile: InputProfile) -> str:
+        '''
+        Private helper static method, name of the algorithm that actually runs,
+        as counting sort hands wide ranges over to radix sort
+        '''
+        if algorithm == "Counting Sort" and profile.is_integer and \
+                profile.value_range > Sorter.COUNTING_RANGE_FACTOR * profile.size + Sorter.RADIX_BASE:
+            return "Radix Sort"
+        return algorithm
+
+    def choose(self, profile: InputProfile) -> str:
+        '''
+        Name of the algorithm with the lowest predicted running time
+        '''
+        candidates = []
+        for algorithm in self.constants:
+            if algorithm == "Insertion Sort" and profile.size > CostModel.QUADRATIC_MAX_SIZE:
+                continue
+            time = self.predict(algorithm, profile)
+            if time is not None:
+                candidates.append((time, CostModel.__tie_rank(algorithm), algorithm))
+        return min(candidates)[2]
+
+    @staticmethod
+    def __tie_rank(algorithm: str) -> int:
+        '''
+        Private helper static method, position of the algorithm in TIE_ORDER,
+        after all of them if it is not listed
+        '''
+        if algorithm in CostModel.TIE_ORDER:
+            return CostModel.TIE_ORDER.index(algorithm)
+        return len(CostModel.TIE_ORDER)
+
+    def fit(self, records: list) -> None:
+        '''
+        Recalibrates the constants from benchmark records (see benchmark.py),
+        which must carry the algorithm, shape, size and median_ns. Every
+        constant becomes the least squares fit of time = constant * work over
+        the records of its algorithm.
+        '''
+        from generator import Generator
+
+        sums = {}
+        for record in records:
+            if record.get("status") != "ok" or record["algorithm"] not in self.constants:
+                continue
+            # Profile the same input the benchmark generated
+            array = Generator.create_workload(int(record["size"]), int(record.get("min_limit", 0)),
+                                              int(record.get("max_limit", 1_000_000)), record["shape"],
+                                              seed=int(record.get("seed", 0)))
+            profile = InputProfile(array)
+            # Timings of the radix hand-over say nothing about counting sort
+            if CostModel.__runs_as(record["algorithm"], profile) != record["algorithm"]:
+                continue
+            work = CostModel.work(record["algorithm"], profile)
+            if not work:
+                continue
+            seconds = int(record["median_ns"]) / 1e9
+            total = sums.setdefault(record["algorithm"], [0.0, 0.0])
+            total[0] += work * seconds
+            total[1] += work * work
+
+        for algorithm, (work_time, work_squared) in sums.items():
+            if work_squared > 0:
+                self.constants[algorithm] = work_time / work_squared
+
+    def calibrate(self, sizes: list = (2_000, 20_000), shapes: list = ("uniform", "sorted"),
+                  repeat: int = 3) -> None:
+        '''
+        Times every algorithm on this machine with the benchmark harness and
+        refits the constants
+        '''
+        from benchmark import Benchmark
+
+        # Insertion sort is only timed on the smallest size to keep this quick
+        records = Benchmark.run(list(self.constants), list(sizes), list(shapes), repeat=repeat,
+                                max_quadratic_size=min(sizes))
+        self.fit(records)
+
+    def save(self, path: str = None) -> None:
+        '''
+        Writes the constants to a JSON file
+        '''
+        path = path or CostModel.DEFAULT_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.constants, file, indent=2)
+
+    @staticmethod
+    def load(path: str = None) -> "CostModel":
+        '''
+        Reads the constants saved by save, the defaults if there is no file
+        '''
+        path = path or CostModel.DEFAULT_PATH
+        try:
+            with open(path) as file:
+                return CostModel(json.load(file))
+        except (OSError, ValueError):
+            return CostModel()
+
+
+class AutoSorter:
+    '''
+    Picks the cheapest algorithm for an array from its profile and the cost
+    model calibrated for this machine
+    '''
+
+    # Cost model shared by all calls, loaded on first use
+    __model = None
+
+    @staticmethod
+    def model() -> CostModel:
+        '''
+        Returns the shared cost model, loading the calibrated one if it exists
+        '''
+        if AutoSorter.__model is None:
+            AutoSorter.__model = CostModel.load()
+        return AutoSorter.__model
+
+    @staticmethod
+    def set_model(model: CostModel) -> None:
+        '''
+        Replaces the shared cost model
+        '''
+        AutoSorter.__model = model
+
+    @staticmethod
+    def choose(array) -> str:
+        '''
+        Name of the algorithm the Auto mode would use for the array
+        '''
+        return AutoSorter.model().choose(InputProfile(array))
+
+    @staticmethod
+    def sort(array) -> list:
+        '''
+        Sorts the array with the algorithm chosen for it
+        '''
+        return Sorter.sort(array, AutoSorter.choose(array), "python")
+
+    @staticmethod
+    def sort_inplace(array) -> None:
+        '''
+        Sorts the mutable sequence in place with the algorithm chosen for it
+        '''
+        Sorter.sort_inplace(array, AutoSorter.choose(array), "python")
+
+    @staticmethod
+    def main(argv: list = None) -> int:
+        '''
+        Command line entry point that calibrates the cost model on this machine
+        and saves it for the Auto mode, returns the exit status
+        '''
+        parser = argparse.ArgumentParser(
+            description="Calibrate the cost model of the Auto mode on this machine")
+        parser.add_argument("--sizes", nargs="+", type=int, default=[2_000, 20_000])
+        parser.add_argument("--shapes", nargs="+", default=["uniform", "sorted"])
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--output", default=CostModel.DEFAULT_PATH,
+                            help="file the calibrated constants are written to")
+        args = parser.parse_args(argv)
+
+        model = CostModel()
+        model.calibrate(args.sizes, args.shapes, args.repeat)
+        model.save(args.output)
+        for algorithm, constant in model.constants.items():
+            print(f"{algorithm:<14} {constant * 1e9:8.3f} ns per unit of work")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(AutoSorter.main())
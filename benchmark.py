@@ -0,0 +1,254 @@
+import argparse
+import csv
+import gc
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from generator import Generator
+from instrumented import InstrumentedSorter, OperationCounter
+from memory import MemoryProfiler, MemoryUsage
+from sorter import Sorter
+
+
+class Benchmark:
+    '''
+    Headless benchmark harness that times the Sorter algorithms over several
+    sizes and input shapes, and compares result files for regressions
+    '''
+
+    # Columns written to CSV files, in this order
+    FIELDS = ("algorithm", "backend", "shape", "size", "repeat",
+              "min_ns", "median_ns", "p95_ns", "mean_ns", "status") + \
+        OperationCounter.FIELDS + MemoryUsage.FIELDS
+
+    # Fields holding integers, converted back when CSV files are loaded
+    __INTEGER_FIELDS = ("size", "repeat", "min_ns", "median_ns", "p95_ns",
+                        "mean_ns") + OperationCounter.FIELDS + MemoryUsage.FIELDS
+
+    # Algorithms that are quadratic on some of the shapes
+    __QUADRATIC = ("Insertion Sort",)
+
+    @staticmethod
+    def time_algorithm(algorithm: str, array, repeat: int = 5, warmup: int = 1,
+                       backend: str = None, disable_gc: bool = True) -> dict:
+        '''
+        Times the algorithm on the array repeat times after warmup untimed runs,
+        with the garbage collector paused during every timed run. Returns the
+        minimum, median, 95th percentile and mean in nanoseconds.
+        '''
+        for _ in range(warmup):
+            Sorter.sort(array, algorithm, backend)
+
+        samples = []
+        for _ in range(repeat):
+            # Start every run from a clean heap so collections do not leak into
+            # the next measurement
+            gc.collect()
+            if disable_gc:
+                gc.disable()
+            try:
+                start = time.perf_counter_ns()
+                Sorter.sort(array, algorithm, backend)
+                samples.append(time.perf_counter_ns() - start)
+            finally:
+                if disable_gc:
+                    gc.enable()
+
+        median, p95 = Sorter.percentiles(samples, [50, 95])
+        return {
+            "repeat": repeat,
+            "min_ns": min(samples),
+            "median_ns": median,
+            "p95_ns": p95,
+            "mean_ns": sum(samples) // len(samples),
+        }
+
+    @staticmethod
+    def run(algorithms: list, sizes: list, shapes: list, repeat: int = 5, warmup: int = 1,
+            min_limit: int = 0, max_limit: int = 1_000_000, seed: int = 0, backend: str = None,
+            max_quadratic_size: int = 20_000, disable_gc: bool = True, log=None,
+            count_operations: bool = False, measure_memory: bool = False) -> list:
+        '''
+        Sweeps every algorithm over every size and shape. Every (shape, size)
+        input is generated once from the seed and shared by all algorithms.
+        Quadratic algorithms are skipped above max_quadratic_size. With
+        count_operations, one extra instrumented run adds the operation counts,
+        and with measure_memory one extra traced run adds the memory usage.
+        '''
+        backend = backend or Sorter.get_backend()
+        results = []
+        for shape in shapes:
+            for size in sizes:
+                array = Generator.create_workload(
+                    size, min_limit, max_limit, shape, seed=seed)
+                for algorithm in algorithms:
+                    record = {"algorithm": algorithm, "backend": backend,
+                              "shape": shape, "size": size, "min_limit": min_limit,
+                              "max_limit": max_limit, "seed": seed}
+
+                    if algorithm in Benchmark.__QUADRATIC and size > max_quadratic_size:
+                        record["status"] = "skipped"
+                    else:
+                        record.update(Benchmark.time_algorithm(
+                            algorithm, array, repeat, warmup, backend, disable_gc))
+                        record["status"] = "ok"
+                        if count_operations and algorithm in InstrumentedSorter.ALGORITHMS:
+                            record.update(InstrumentedSorter.count(array, algorithm)[1].as_dict())
+                        if measure_memory:
+                            record.update(MemoryProfiler.measure(
+                                Sorter.sort, array, algorithm, backend)[1].as_dict())
+
+                    results.append(record)
+                    if log is not None:
+                        log(Benchmark.format_record(record))
+        return results
+
+    @staticmethod
+    def format_record(record: dict) -> str:
+        '''
+        One line summary of a result record
+        '''
+        name = f"{record['algorithm']:<14} {record['shape']:<13} {record['size']:>10}"
+        if record["status"] != "ok":
+            return f"{name}  {record['status']}"
+        return (f"{name}  min {record['min_ns'] / 1e6:10.3f} ms"
+                f"  median {record['median_ns'] / 1e6:10.3f} ms"
+                f"  p95 {record['p95_ns'] / 1e6:10.3f} ms")
+
+    @staticmethod
+    def save_json(path: str, results: list) -> None:
+        '''
+        Writes the results with a description of the host to a JSON file
+        '''
+        document = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(path, "w") as file:
+            json.dump(document, file, indent=2)
+
+    @staticmethod
+    def save_csv(path: str, results: list) -> None:
+        '''
+        Writes the results to a CSV file, one row per record
+        '''
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=Benchmark.FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+
+    @staticmethod
+    def load(path: str) -> list:
+        '''
+        Reads the result records from a JSON or CSV file
+        '''
+        if path.endswith(".csv"):
+            with open(path, newline="") as file:
+                results = list(csv.DictReader(file))
+            for record in results:
+                for field in Benchmark.__INTEGER_FIELDS:
+                    if record.get(field):
+                        record[field] = int(record[field])
+            return results
+
+        with open(path) as file:
+            return json.load(file)["results"]
+
+    @staticmethod
+    def compare(baseline: list, current: list, threshold: float = 0.1) -> list:
+        '''
+        Matches the records of both runs and returns one row per match with the
+        ratio of the median times. Rows slower than 1 + threshold are flagged.
+        '''
+        def key(record):
+            return (record["algorithm"], record["backend"], record["shape"], int(record["size"]))
+
+        old_records = {key(record): record for record in baseline if record["status"] == "ok"}
+
+        rows = []
+        for record in current:
+            old = old_records.get(key(record))
+            if old is None or record["status"] != "ok":
+                continue
+            ratio = record["median_ns"] / max(old["median_ns"], 1)
+            rows.append({
+                "algorithm": record["algorithm"],
+                "backend": record["backend"],
+                "shape": record["shape"],
+                "size": int(record["size"]),
+                "old_median_ns": old["median_ns"],
+                "new_median_ns": record["median_ns"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            })
+        return rows
+
+    @staticmethod
+    def main(argv: list = None) -> int:
+        '''
+        Command line entry point, returns the exit status
+        '''
+        parser = argparse.ArgumentParser(
+            description="Benchmark the Sorter algorithms without the GUI")
+        commands = parser.add_subparsers(dest="command", required=True)
+
+        run = commands.add_parser("run", help="time the algorithms")
+        run.add_argument("--algorithms", nargs="+", default=list(Sorter.ALGORITHMS),
+                         choices=list(Sorter.ALGORITHMS), metavar="NAME")
+        run.add_argument("--sizes", nargs="+", type=int, default=[1_000, 10_000, 100_000])
+        run.add_argument("--shapes", nargs="+", default=["uniform", "sorted", "reversed"],
+                         choices=Generator.SHAPES, metavar="SHAPE")
+        run.add_argument("--repeat", type=int, default=5)
+        run.add_argument("--warmup", type=int, default=1)
+        run.add_argument("--min", type=int, default=0, dest="min_limit")
+        run.add_argument("--max", type=int, default=1_000_000, dest="max_limit")
+        run.add_argument("--seed", type=int, default=0)
+        run.add_argument("--backend", choices=Sorter.BACKENDS)
+        run.add_argument("--max-quadratic-size", type=int, default=20_000)
+        run.add_argument("--keep-gc", action="store_true",
+                         help="leave the garbage collector on while timing")
+        run.add_argument("--count-ops", action="store_true",
+                         help="add operation counts from an instrumented run")
+        run.add_argument("--memory", action="store_true",
+                         help="add the memory usage of a traced run")
+        run.add_argument("--json", help="write the results to this JSON file")
+        run.add_argument("--csv", help="write the results to this CSV file")
+
+        compare = commands.add_parser("compare", help="diff two result files")
+        compare.add_argument("baseline")
+        compare.add_argument("current")
+        compare.add_argument("--threshold", type=float, default=0.1,
+                             help="flag medians slower by more than this fraction")
+
+        args = parser.parse_args(argv)
+
+        if args.command == "run":
+            if args.repeat < 1:
+                parser.error("--repeat must be at least 1")
+            results = Benchmark.run(args.algorithms, args.sizes, args.shapes, args.repeat,
+                                    args.warmup, args.min_limit, args.max_limit, args.seed,
+                                    args.backend, args.max_quadratic_size, not args.keep_gc,
+                                    log=print, count_operations=args.count_ops,
+                                    measure_memory=args.memory)
+            if args.json:
+                Benchmark.save_json(args.json, results)
+            if args.csv:
+                Benchmark.save_csv(args.csv, results)
+            return 0
+
+        rows = Benchmark.compare(Benchmark.load(args.baseline),
+                                 Benchmark.load(args.current), args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['algorithm']:<14} {row['shape']:<13} {row['size']:>10}"
+                  f"  {row['old_median_ns'] / 1e6:10.3f} ms -> {row['new_median_ns'] / 1e6:10.3f} ms"
+                  f"  x{row['ratio']:.2f}  {flag}")
+        return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(Benchmark.main())
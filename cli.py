@@ -0,0 +1,144 @@
+import argparse
+import os
+import sys
+import time
+from memory import MemoryProfiler
+from sorter import Sorter
+
+
+class CommandLine:
+    '''
+    Headless sorter for shell pipelines, e.g. "python -m cli < numbers.txt".
+    Reads whitespace or comma separated integers from stdin or files, sorts
+    them with any Sorter algorithm and writes one integer per line. It never
+    imports tkinter, and NumPy only when its backend is asked for.
+    '''
+
+    # Bytes read from the input at once, every block is parsed in one go
+    READ_SIZE = 1 << 20
+
+    # Integers formatted into one write to the output
+    WRITE_ITEMS = 1 << 16
+
+    @staticmethod
+    def read_integers(stream, values: list = None) -> list:
+        '''
+        Static method that parses every integer of the binary stream into values,
+        a new list if none is given. Each block is split and converted in bulk,
+        a number cut at the end of a block is carried over to the next one.
+        '''
+        values = [] if values is None else values
+        tail = b""
+        while True:
+            block = stream.read(CommandLine.READ_SIZE)
+            if not block:
+                break
+            block = (tail + block).replace(b",", b" ")
+            parts = block.split()
+            # The last number may continue in the next block
+            tail = parts.pop() if parts and not block[-1:].isspace() else b""
+            values.extend(map(int, parts))
+        if tail:
+            values.append(int(tail))
+        return values
+
+    @staticmethod
+    def write_integers(stream, values) -> None:
+        '''
+        Static method that writes the integers to the binary stream, one per
+        line, formatting WRITE_ITEMS of them into every write
+        '''
+        step = CommandLine.WRITE_ITEMS
+        for start in range(0, len(values), step):
+            block = "\n".join(map(str, values[start:start + step]))
+            stream.write(block.encode())
+            stream.write(b"\n")
+
+    @staticmethod
+    def write_counts(stream, pairs) -> None:
+        '''
+        Static method that writes run-length encoded (value, count) pairs to the
+        binary stream, one "value count" pair per line
+        '''
+        step = CommandLine.WRITE_ITEMS
+        for start in range(0, len(pairs), step):
+            block = "\n".join(f"{value} {count}" for value, count in pairs[start:start + step])
+            stream.write(block.encode())
+            stream.write(b"\n")
+
+    @staticmethod
+    def main(argv: list = None) -> int:
+        '''
+        Command line entry point, returns the exit status
+        '''
+        parser = argparse.ArgumentParser(
+            prog="python -m cli",
+            description="Sort integers from files or stdin without the GUI")
+        parser.add_argument("inputs", nargs="*", default=["-"], metavar="FILE",
+                            help="files to read, - or nothing for stdin")
+        parser.add_argument("-a", "--algorithm", choices=list(Sorter.ALGORITHMS),
+                            default="Quick Sort")
+        parser.add_argument("-b", "--backend", choices=Sorter.BACKENDS)
+        parser.add_argument("-r", "--reverse", action="store_true",
+                            help="sort in descending order")
+        parser.add_argument("-c", "--counts", action="store_true",
+                            help="write every distinct value once with its count")
+        parser.add_argument("-o", "--output", help="file to write, stdout by default")
+        parser.add_argument("-t", "--time", action="store_true",
+                            help="report the sorting time on stderr")
+        parser.add_argument("-m", "--memory", action="store_true",
+                            help="report the memory usage on stderr, tracing slows the sort down")
+        args = parser.parse_args(argv)
+
+        # Parse every input into one list
+        values = []
+        try:
+            for path in args.inputs:
+                if path == "-":
+                    CommandLine.read_integers(sys.stdin.buffer, values)
+                else:
+                    with open(path, "rb") as file:
+                        CommandLine.read_integers(file, values)
+        except ValueError as error:
+            parser.exit(2, f"{parser.prog}: invalid input: {error}\n")
+        except OSError as error:
+            parser.exit(2, f"{parser.prog}: {error}\n")
+
+        warning = MemoryProfiler.warning(values, args.algorithm)
+        if warning is not None:
+            print(f"{parser.prog}: warning: {warning}", file=sys.stderr)
+
+        def sort():
+            if args.counts:
+                return Sorter.run_length_sort(values, args.algorithm, args.backend, args.reverse)
+            return Sorter.sort_inplace(values, args.algorithm, args.backend, reverse=args.reverse)
+
+        start = time.perf_counter()
+        if args.memory:
+            result, usage = MemoryProfiler.measure(sort)
+        else:
+            result = sort()
+        time_taken = time.perf_counter() - start
+        if args.time:
+            print(f"{args.algorithm}: {len(values)} integers in {time_taken:.6f} seconds",
+                  file=sys.stderr)
+        if args.memory:
+            print(f"{args.algorithm}: {usage}", file=sys.stderr)
+
+        write = CommandLine.write_counts if args.counts else CommandLine.write_integers
+        try:
+            if args.output:
+                with open(args.output, "wb") as file:
+                    write(file, result)
+            else:
+                write(sys.stdout.buffer, result)
+                sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. head), keep the exit quiet
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(CommandLine.main())
@@ -0,0 +1,492 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from auto import AutoSorter, InputProfile
+from generator import Generator
+from memory import MemoryProfiler
+from sorter import Sorter
+
+
+class ScalingModel:
+    '''
+    Cost curve fitted to measurements on small samples: cost = intercept +
+    slope * f(n, k), where f is one of the COMPLEXITIES, n the size and k the
+    value range of the input
+    '''
+
+    COMPLEXITIES = {
+        "n": lambda n, k: n,
+        "n log n": lambda n, k: n * max(math.log2(max(n, 1)), 1),
+        "n^2": lambda n, k: n * n,
+        "n + k": lambda n, k: n + k,
+    }
+
+    def __init__(self, complexity: str, intercept: float, slope: float, error: float = 0.0) -> None:
+        '''
+        Constructor to initialize the fitted curve, error is how far its
+        growth exponent was from the measured one
+        '''
+        if complexity not in ScalingModel.COMPLEXITIES:
+            raise ValueError(f"Unknown complexity: {complexity}")
+        self.complexity = complexity
+        self.intercept = intercept
+        self.slope = slope
+        self.error = error
+
+    def predict(self, size: int, value_range: int = 0) -> float:
+        '''
+        Predicted cost for an input of the given size and value range
+        '''
+        work = ScalingModel.COMPLEXITIES[self.complexity](size, value_range)
+        return max(self.intercept + self.slope * work, 0.0)
+
+    def as_dict(self) -> dict:
+        '''
+        Returns the model as a dictionary
+        '''
+        return {"complexity": self.complexity, "intercept": self.intercept,
+                "slope": self.slope, "error": self.error}
+
+    @staticmethod
+    def from_dict(values: dict) -> "ScalingModel":
+        '''
+        Static method that rebuilds a model written by as_dict
+        '''
+        return ScalingModel(values["complexity"], float(values["intercept"]),
+                            float(values["slope"]), float(values.get("error", 0.0)))
+
+    @staticmethod
+    def fit(points: list, complexities: list = None) -> "ScalingModel":
+        '''
+        Static method that fits the (n, k, cost) points. The growth exponent of
+        the measurements, the slope of log cost over log n, picks the
+        complexity whose own exponent over the same sizes is the closest, then
+        its line is fitted by least squares. Curves that would need a negative
+        slope are left out.
+        '''
+        points = sorted(points)
+        complexities = list(complexities or ScalingModel.COMPLEXITIES)
+
+        # A value range that barely changes between the samples is part of
+        # the intercept, n + k would only fit its noise
+        ranges = [k for _, k, _ in points]
+        if "n + k" in complexities and max(ranges) - min(ranges) <= max(ranges) / 10:
+            complexities.remove("n + k")
+
+        exponent = ScalingModel.__growth_exponent(
+            [(n, cost) for n, _, cost in points if cost > 0])
+        best = None
+        if exponent is not None:
+            (first_n, first_k, _), (last_n, last_k, _) = points[0], points[-1]
+            for complexity in complexities:
+                model = ScalingModel.__least_squares(complexity, points)
+                if model is None:
+                    continue
+                function = ScalingModel.COMPLEXITIES[complexity]
+                growth = (math.log(function(last_n, last_k) / function(first_n, first_k)) /
+                          math.log(last_n / first_n))
+                model.error = abs(growth - exponent)
+                if best is None or model.error < best.error:
+                    best = model
+
+        if best is None:
+            # Nothing grows with the input, the cost is flat
+            costs = [cost for _, _, cost in points]
+            best = ScalingModel("n", sum(costs) / len(costs), 0.0)
+        return best
+
+    @staticmethod
+    def __growth_exponent(points: list) -> float:
+        '''
+        Private helper static method that returns the least squares slope of
+        log cost over log n, None without two different sizes
+        '''
+        logs = [(math.log(n), math.log(cost)) for n, cost in points]
+        if len({n for n, _ in logs}) < 2:
+            return None
+        mean_n = sum(n for n, _ in logs) / len(logs)
+        mean_cost = sum(cost for _, cost in logs) / len(logs)
+        return (sum((n - mean_n) * (cost - mean_cost) for n, cost in logs) /
+                sum((n - mean_n) ** 2 for n, _ in logs))
+
+    @staticmethod
+    def __least_squares(complexity: str, points: list) -> "ScalingModel":
+        '''
+        Private helper static method that fits the line cost = intercept +
+        slope * work to the points, None if it cannot be fitted or would need
+        a negative slope
+        '''
+        function = ScalingModel.COMPLEXITIES[complexity]
+        works = [function(n, k) for n, k, _ in points]
+        costs = [cost for _, _, cost in points]
+
+        count = len(points)
+        mean_work = sum(works) / count
+        mean_cost = sum(costs) / count
+        variance = sum((work - mean_work) ** 2 for work in works)
+        if variance == 0:
+            return None
+        slope = sum((work - mean_work) * (cost - mean_cost)
+                    for work, cost in zip(works, costs)) / variance
+        if slope < 0:
+            return None
+        return ScalingModel(complexity, mean_cost - slope * mean_work, slope)
+
+
+class Estimate:
+    '''
+    Predicted running time and memory of one algorithm on one input
+    '''
+
+    def __init__(self, algorithm: str, seconds: float, peak_bytes: float,
+                 time_model: ScalingModel, memory_model: ScalingModel) -> None:
+        '''
+        Constructor to initialize attributes
+        '''
+        self.algorithm = algorithm
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.time_model = time_model
+        self.memory_model = memory_model
+
+    def __str__(self) -> str:
+        return (f"{self.algorithm}: about {ComplexityEstimator.format_time(self.seconds)} "
+                f"({self.time_model.complexity}), "
+                f"peak {MemoryProfiler.format_size(self.peak_bytes)}")
+
+
+class ComplexityEstimator:
+    '''
+    Predicts how long and how much memory a sort will take before it starts.
+    Each algorithm is timed on growing samples of the actual input, a scaling
+    model is fitted to the timings and extrapolated to the full size. The
+    models are cached per machine and per kind of input, so the next estimate
+    for a similar input is instant.
+    '''
+
+    # Sample sizes timed for a fit, growing until the time budget is used
+    SAMPLE_SIZES = (1024, 2048, 4096, 8192, 16384, 32768)
+
+    # Sample sizes traced for the memory model, smaller than the timed ones
+    # because tracing slows a sort down about ten times
+    MEMORY_SIZES = (256, 512, 1024)
+
+    # Seconds a fit may spend timing and tracing samples
+    BUDGET = 1.0
+
+    # Growth exponent past which the timings are taken as quadratic, more
+    # samples would only confirm it at four times the cost each
+    QUADRATIC_EXPONENT = 1.8
+
+    # Inputs smaller than this sort quickly whatever the algorithm
+    MIN_SIZE = 10_000
+
+    # Predicted running times above this many seconds deserve a confirmation
+    CONFIRM_SECONDS = 10.0
+
+    # Where fitted models are kept between runs
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "sorting-gui", "complexity.json")
+
+    # Fitted models by cache key, loaded on first use
+    __models = None
+
+    @staticmethod
+    def machine() -> str:
+        '''
+        Static method that identifies this machine and interpreter, models
+        fitted elsewhere are not reused
+        '''
+        return f"{platform.node()}/{platform.machine()}/{platform.python_implementation()}-{platform.python_version()}"
+
+    @staticmethod
+    def input_class(array) -> str:
+        '''
+        Static method that names the kind of input, which decides the growth
+        rate of algorithms like insertion sort and merge sort
+        '''
+        profile = InputProfile(array)
+        # Equal neighbours count as in order, so sorted input with duplicates
+        # is still sorted
+        if profile.descending_ratio <= 0.1:
+            return "sorted"
+        if profile.ascending_ratio <= 0.1:
+            return "reversed"
+        if 2 * profile.sample_distinct <= profile.sample_size:
+            return "few-unique"
+        return "random"
+
+    @staticmethod
+    def fit(array, algorithm: str, budget: float = None, seed: int = 0) -> tuple:
+        '''
+        Static method that times the algorithm on samples of the array and
+        returns the fitted (time model, memory model). Samples keep the order
+        of the elements they are drawn from, so presorted input stays presorted.
+        The budget covers the memory tracing and the timing. Two samples of
+        each are always taken, a fit needs them; any further one only if its
+        predicted cost still fits and the timings are not yet clearly quadratic.
+        '''
+        budget = ComplexityEstimator.BUDGET if budget is None else budget
+        rng = random.Random(seed)
+        size = len(array)
+        spent = 0.0
+
+        # Counting sort hands over to radix sort on a value range wide for the
+        # size. An array that stays in the counting branch is sampled with its
+        # values scaled down to the same range to size ratio, so the samples
+        # take that branch too; wider ranges are sampled as they are.
+        minimum = None
+        if algorithm == "Counting Sort":
+            value_range = ComplexityEstimator.__value_range(array)
+            if 0 < value_range <= Sorter.COUNTING_RANGE_FACTOR * size + Sorter.RADIX_BASE:
+                minimum = int(min(array))
+
+        memory_points = []
+        costs = []  # (size, seconds) spent on each sample
+        for sample_size in ComplexityEstimator.MEMORY_SIZES:
+            if sample_size > size:
+                break
+            if len(costs) >= 2 and spent + ComplexityEstimator.__next_cost(costs, sample_size) > budget:
+                break
+            start = time.perf_counter()
+            sample, value_range = ComplexityEstimator.__sample(array, sample_size, rng, minimum)
+            usage = MemoryProfiler.measure(Sorter.sort, sample, algorithm)[1]
+            memory_points.append((sample_size, value_range, usage.peak_bytes))
+            costs.append((sample_size, time.perf_counter() - start))
+            spent += costs[-1][1]
+
+        time_points = []
+        costs = []
+        for sample_size in ComplexityEstimator.SAMPLE_SIZES:
+            if sample_size > size:
+                break
+            if len(time_points) >= 2:
+                (previous_size, _, previous), (last_size, _, last) = time_points[-2:]
+                if (previous > 0 and last > 0 and math.log(last / previous) / math.log(last_size / previous_size)
+                        >= ComplexityEstimator.QUADRATIC_EXPONENT):
+                    break
+                if spent + ComplexityEstimator.__next_cost(costs, sample_size) > budget:
+                    break
+            start = time.perf_counter()
+            sample, value_range = ComplexityEstimator.__sample(array, sample_size, rng, minimum)
+            seconds = ComplexityEstimator.__time(sample, algorithm)
+            time_points.append((sample_size, value_range, seconds))
+            costs.append((sample_size, time.perf_counter() - start))
+            spent += costs[-1][1]
+
+        if len(time_points) < 2:
+            raise ValueError("the array is too small to fit a scaling model")
+        return (ScalingModel.fit(time_points),
+                ScalingModel.fit(memory_points, ["n", "n + k"]))
+
+    @staticmethod
+    def models(array, algorithm: str) -> tuple:
+        '''
+        Static method that returns the (time model, memory model) for the
+        algorithm on this kind of input, fitting and caching them on first use
+        '''
+        models = ComplexityEstimator.__load()
+        key = f"{algorithm}|{ComplexityEstimator.input_class(array)}"
+        if key in models:
+            return models[key]
+
+        models[key] = ComplexityEstimator.fit(array, algorithm)
+        ComplexityEstimator.save()
+        return models[key]
+
+    @staticmethod
+    def estimate(array, algorithm: str) -> Estimate:
+        '''
+        Static method that predicts the running time and memory peak of sorting
+        the array with the algorithm, None for arrays below MIN_SIZE
+        '''
+        if len(array) < ComplexityEstimator.MIN_SIZE:
+            return None
+        if algorithm == "Auto":
+            # Estimate the algorithm the Auto mode will run
+            algorithm = AutoSorter.choose(array)
+
+        time_model, memory_model = ComplexityEstimator.models(array, algorithm)
+        value_range = ComplexityEstimator.__value_range(array)
+        return Estimate(algorithm,
+                        time_model.predict(len(array), value_range),
+                        memory_model.predict(len(array), value_range),
+                        time_model, memory_model)
+
+    @staticmethod
+    def warning(estimate: Estimate) -> str:
+        '''
+        Static method that returns a warning if the estimated running time is
+        above CONFIRM_SECONDS, None otherwise
+        '''
+        if estimate is None or estimate.seconds <= ComplexityEstimator.CONFIRM_SECONDS:
+            return None
+        return (f"{estimate.algorithm} is predicted to take about "
+                f"{ComplexityEstimator.format_time(estimate.seconds)} "
+                f"({estimate.time_model.complexity}) and to use "
+                f"{MemoryProfiler.format_size(estimate.peak_bytes)}")
+
+    @staticmethod
+    def save(path: str = None) -> None:
+        '''
+        Static method that writes the fitted models of this machine to a JSON file
+        '''
+        path = path or ComplexityEstimator.DEFAULT_PATH
+        models = {key: {"time": time_model.as_dict(), "memory": memory_model.as_dict()}
+                  for key, (time_model, memory_model) in ComplexityEstimator.__load().items()}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                json.dump({"machine": ComplexityEstimator.machine(), "models": models}, file, indent=2)
+        except OSError:
+            # The cache is only a speed-up, the models can be fitted again
+            pass
+
+    @staticmethod
+    def clear() -> None:
+        '''
+        Static method that forgets every fitted model, so the next estimates
+        are fitted again
+        '''
+        ComplexityEstimator.__models = {}
+        ComplexityEstimator.save()
+
+    @staticmethod
+    def reload() -> None:
+        '''
+        Static method that forgets the models in memory, so the next use reads
+        the cache file again, which another process may have written since
+        '''
+        ComplexityEstimator.__models = None
+
+    @staticmethod
+    def format_time(seconds: float) -> str:
+        '''
+        Static method that formats a duration with a readable unit
+        '''
+        if seconds < 1:
+            return f"{seconds * 1000:.0f} ms"
+        for unit, length in (("days", 86400), ("h", 3600), ("min", 60)):
+            if seconds >= length:
+                return f"{seconds / length:.1f} {unit}"
+        return f"{seconds:.1f} s"
+
+    @staticmethod
+    def __load(path: str = None) -> dict:
+        '''
+        Private helper static method that returns the cached models, reading
+        them on first use. Models of another machine are ignored.
+        '''
+        if ComplexityEstimator.__models is not None:
+            return ComplexityEstimator.__models
+
+        ComplexityEstimator.__models = {}
+        try:
+            with open(path or ComplexityEstimator.DEFAULT_PATH) as file:
+                cache = json.load(file)
+            if cache.get("machine") == ComplexityEstimator.machine():
+                for key, values in cache["models"].items():
+                    ComplexityEstimator.__models[key] = (ScalingModel.from_dict(values["time"]),
+                                                         ScalingModel.from_dict(values["memory"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return ComplexityEstimator.__models
+
+    @staticmethod
+    def __sample(array, sample_size: int, rng: random.Random, minimum: int = None) -> tuple:
+        '''
+        Private helper static method that draws sample_size elements in their
+        order in the array, returns the sample and its value range. With the
+        minimum of an integer array, the values above it are scaled by
+        sample_size / len(array), which keeps their order.
+        '''
+        positions = sorted(rng.sample(range(len(array)), sample_size))
+        sample = [array[i] for i in positions]
+        if minimum is not None:
+            sample = [minimum + (int(value) - minimum) * sample_size // len(array) for value in sample]
+        return sample, ComplexityEstimator.__value_range(sample)
+
+    @staticmethod
+    def __next_cost(costs: list, sample_size: int) -> float:
+        '''
+        Private helper static method that predicts the seconds the next sample
+        will take from the (size, seconds) of the last two, assuming the cost
+        grows at least linearly
+        '''
+        (previous_size, previous), (last_size, last) = costs[-2:]
+        exponent = 1.0
+        if previous > 0 and last > 0:
+            exponent = max(math.log(last / previous) / math.log(last_size / previous_size), 1.0)
+        return last * (sample_size / last_size) ** exponent
+
+    @staticmethod
+    def __time(sample: list, algorithm: str) -> float:
+        '''
+        Private helper static method that returns the fastest of a few runs in
+        seconds, a single run once it is slow enough to be measured reliably
+        '''
+        best = None
+        for _ in range(5):
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                Sorter.sort(sample, algorithm)
+                seconds = time.perf_counter() - start
+            finally:
+                gc.enable()
+            best = seconds if best is None else min(best, seconds)
+            if seconds > 0.05:
+                break
+        return best
+
+    @staticmethod
+    def __value_range(array) -> int:
+        '''
+        Private helper static method that returns the value range k of an
+        integer array, 0 for other values
+        '''
+        if len(array) == 0:
+            return 0
+        minimum = min(array)
+        maximum = max(array)
+        span = maximum - minimum
+        try:
+            return int(span) + 1 if int(span) == span else 0
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def main(argv: list = None) -> int:
+        '''
+        Command line entry point that prints the estimates for a random array,
+        returns the exit status
+        '''
+        parser = argparse.ArgumentParser(
+            description="Predict the running time and memory of every algorithm")
+        parser.add_argument("--size", type=int, default=1_000_000)
+        parser.add_argument("--min", type=int, default=20, dest="min_limit")
+        parser.add_argument("--max", type=int, default=100, dest="max_limit")
+        parser.add_argument("--shape", choices=Generator.SHAPES, default="uniform")
+        parser.add_argument("--algorithms", nargs="+", default=list(Sorter.ALGORITHMS),
+                            choices=list(Sorter.ALGORITHMS), metavar="NAME")
+        parser.add_argument("--refit", action="store_true", help="ignore the cached models")
+        args = parser.parse_args(argv)
+
+        array = Generator.create_workload(args.size, args.min_limit, args.max_limit, args.shape)
+
+        if args.refit:
+            ComplexityEstimator.clear()
+        print(f"{args.size} elements, {ComplexityEstimator.input_class(array)} input")
+        for algorithm in args.algorithms:
+            estimate = ComplexityEstimator.estimate(array, algorithm)
+            print(estimate if estimate is not None else f"{algorithm}: too small to estimate")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(ComplexityEstimator.main())
@@ -0,0 +1,201 @@
+import argparse
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from sorter import Sorter
+
+
+class ExternalSorter:
+    '''
+    Sorts integer files larger than the memory. The input is read in runs that
+    fit the memory budget, every run is sorted with a Sorter algorithm and
+    spilled to a temporary file, and the runs are streamed through a k-way
+    merge into the output file.
+    '''
+
+    # File formats: raw little-endian int64 values, or one integer per line
+    FORMATS = ("binary", "text")
+
+    # Rough cost of one element while a run is sorted: the int object, the
+    # list slots of the run and of the copy made by the Sorter
+    __BYTES_PER_SORTED_ITEM = 64
+
+    # Bytes of one stored value
+    __ITEM_SIZE = 8
+
+    def __init__(self, memory_budget: int = 256 << 20, algorithm: str = "Quick Sort",
+                 fan_in: int = 64, temp_dir: str = None) -> None:
+        '''
+        Constructor to initialize attributes. fan_in is the most runs merged in
+        one pass, more runs are merged over several passes.
+        '''
+        if algorithm not in Sorter.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.__run_length = max(memory_budget // ExternalSorter.__BYTES_PER_SORTED_ITEM, 1)
+        # Each merge pass splits the budget between its readers and the writer
+        self.__block_items = max(memory_budget // ((fan_in + 1) * ExternalSorter.__ITEM_SIZE * 4), 1024)
+        self.__algorithm = algorithm
+        self.__fan_in = fan_in
+        self.__temp_dir = temp_dir
+
+    def sort_file(self, input_path: str, output_path: str,
+                  input_format: str = "binary", output_format: str = None) -> int:
+        '''
+        Sorts the integers of input_path into output_path and returns how many
+        were sorted. The output uses the input format unless one is given.
+        '''
+        output_format = output_format or input_format
+        for file_format in (input_format, output_format):
+            if file_format not in ExternalSorter.FORMATS:
+                raise ValueError(f"Unknown format: {file_format}")
+
+        work_dir = tempfile.mkdtemp(prefix="external-sort-", dir=self.__temp_dir)
+        try:
+            runs, count = self.__write_runs(input_path, input_format, work_dir)
+
+            # Merge groups of runs until one pass can produce the output
+            generation = 0
+            while len(runs) > self.__fan_in:
+                merged = []
+                for first in range(0, len(runs), self.__fan_in):
+                    group = runs[first:first + self.__fan_in]
+                    path = os.path.join(work_dir, f"merge-{generation}-{first}.bin")
+                    self.__write(path, "binary", self.__merge(group))
+                    for run in group:
+                        os.remove(run)
+                    merged.append(path)
+                runs = merged
+                generation += 1
+
+            self.__write(output_path, output_format, self.__merge(runs))
+            return count
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def __write_runs(self, input_path: str, input_format: str, work_dir: str) -> tuple:
+        '''
+        Splits the input into sorted run files and returns their paths with the
+        number of integers read
+        '''
+        runs = []
+        count = 0
+        for chunk in self.__read(input_path, input_format, self.__run_length):
+            count += len(chunk)
+            run = Sorter.sort(chunk, self.__algorithm)
+            del chunk
+            path = os.path.join(work_dir, f"run-{len(runs)}.bin")
+            self.__write(path, "binary", [run])
+            runs.append(path)
+        return runs, count
+
+    def __merge(self, runs: list):
+        '''
+        Yields blocks of the k-way merge of the sorted run files
+        '''
+        block = []
+        merged = heapq.merge(*(self.__iterate(run) for run in runs))
+        for value in merged:
+            block.append(value)
+            if len(block) == self.__block_items:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def __iterate(self, path: str):
+        '''
+        Yields the values of a binary run file, reading it block by block
+        '''
+        for block in self.__read(path, "binary", self.__block_items):
+            yield from block
+
+    @staticmethod
+    def __read(path: str, file_format: str, items: int):
+        '''
+        Yields lists of at most items integers read from the file with bulk reads
+        '''
+        if file_format == "binary":
+            with open(path, "rb") as file:
+                while True:
+                    data = file.read(items * ExternalSorter.__ITEM_SIZE)
+                    if not data:
+                        return
+                    if len(data) % ExternalSorter.__ITEM_SIZE:
+                        raise ValueError(f"{path} is not a whole number of int64 values")
+                    block = array("q")
+                    block.frombytes(data)
+                    if sys.byteorder == "big":
+                        block.byteswap()
+                    yield block.tolist()
+        else:
+            with open(path, "rb") as file:
+                # Roughly items lines per read, a line being ~8 bytes on average
+                while True:
+                    lines = file.readlines(items * ExternalSorter.__ITEM_SIZE)
+                    if not lines:
+                        return
+                    yield [int(line) for line in lines if not line.isspace()]
+
+    @staticmethod
+    def __write(path: str, file_format: str, blocks) -> None:
+        '''
+        Writes the blocks of integers to the file with one bulk write per block
+        '''
+        with open(path, "wb") as file:
+            for block in blocks:
+                if file_format == "binary":
+                    try:
+                        data = array("q", block)
+                    except OverflowError:
+                        raise ValueError("values must fit into 64 bits") from None
+                    if sys.byteorder == "big":
+                        data.byteswap()
+                    data.tofile(file)
+                else:
+                    file.write("\n".join(map(str, block)).encode())
+                    file.write(b"\n")
+
+    @staticmethod
+    def parse_size(text: str) -> int:
+        '''
+        Parses a byte count such as 512M or 4G
+        '''
+        units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+        text = text.strip().upper().removesuffix("B")
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+
+    @staticmethod
+    def main(argv: list = None) -> int:
+        '''
+        Command line entry point, returns the exit status
+        '''
+        parser = argparse.ArgumentParser(
+            description="Sort an integer file larger than the memory")
+        parser.add_argument("input")
+        parser.add_argument("output")
+        parser.add_argument("--format", choices=ExternalSorter.FORMATS, default="binary",
+                            help="format of the input file")
+        parser.add_argument("--output-format", choices=ExternalSorter.FORMATS,
+                            help="format of the output file, the input format by default")
+        parser.add_argument("--memory", default="256M",
+                            help="memory budget, e.g. 512M or 4G")
+        parser.add_argument("--algorithm", choices=list(Sorter.ALGORITHMS), default="Quick Sort")
+        parser.add_argument("--fan-in", type=int, default=64)
+        parser.add_argument("--temp-dir")
+        args = parser.parse_args(argv)
+
+        sorter = ExternalSorter(ExternalSorter.parse_size(args.memory), args.algorithm,
+                                args.fan_in, args.temp_dir)
+        sorter.sort_file(args.input, args.output, args.format, args.output_format)
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(ExternalSorter.main())
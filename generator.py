@@ -1,5 +1,7 @@
 # Importing random module
 import random
+from array import array
+from sorter import Sorter
 
 
 class Generator:
@@ -7,6 +9,19 @@ class Generator:
     Generates the random array for user in given range
     '''
 
+    # Input shapes the workload generator can produce
+    SHAPES = ("uniform", "sorted", "reversed", "nearly_sorted", "few_unique",
+              "sawtooth", "organ_pipe", "zipf", "gaussian")
+
+    # Shapes whose values depend on the whole array and not only the position
+    __GLOBAL_SHAPES = ("sorted", "reversed", "nearly_sorted")
+
+    # Ranges up to this width are drawn from bulk random bytes
+    __BULK_SPAN = 1 << 32
+
+    # Upper bound on the distinct ranks of the Zipf table
+    __ZIPF_RANKS = 1 << 16
+
     # def create_random_array(array_size, lower_bound, upper_bound):
     #     '''
     #     create array from the user inputted values
@@ -22,5 +37,186 @@ class Generator:
     #     # returning the populated array
     #     return random_array
 
-    def create_random_array(size, min_limit, max_limit):
-        return [random.randint(min_limit, max_limit) for _ in range(size)]
+    def create_random_array(size, min_limit, max_limit, backend=None, seed=None):
+        return Generator.create_workload(size, min_limit, max_limit, seed=seed, backend=backend)
+
+    @staticmethod
+    def create_workload(size: int, min_limit: int, max_limit: int, shape: str = "uniform",
+                        seed=None, backend: str = None, **options):
+        '''
+        Creates an array of the given shape with values in [min_limit, max_limit].
+        The same seed always gives the same array. Extra options per shape:
+        swaps (nearly_sorted), unique (few_unique), teeth (sawtooth) and
+        exponent (zipf).
+        '''
+        Generator.__check_arguments(size, min_limit, max_limit, shape)
+        rng = random.Random(seed)
+
+        # The numpy backend draws uniform arrays in one vectorized call
+        numpy_backend = (backend or Sorter.get_backend()) == "numpy"
+        if numpy_backend:
+            # Imported here so the Python backend never loads NumPy
+            from vectorized import VectorizedSorter
+            if shape == "uniform":
+                return VectorizedSorter.create_random_array(size, min_limit, max_limit, seed)
+
+        if shape in Generator.__GLOBAL_SHAPES:
+            values = Generator.__uniform(rng, size, min_limit, max_limit)
+            values.sort(reverse=shape == "reversed")
+            if shape == "nearly_sorted":
+                Generator.__swap_randomly(
+                    rng, values, options.get("swaps", max(1, size // 100)))
+        else:
+            values = Generator.__chunk(
+                rng, shape, 0, size, size, min_limit, max_limit, options, {})
+
+        return VectorizedSorter.as_array(values) if numpy_backend else values
+
+    @staticmethod
+    def stream_workload(size: int, min_limit: int, max_limit: int, shape: str = "uniform",
+                        seed=None, chunk_size: int = 1 << 20, **options):
+        '''
+        Yields the array of the given shape as lists of at most chunk_size values,
+        so arrays larger than the memory can be written out piece by piece.
+        Sorted and reversed arrays are produced with sequential order statistics,
+        and nearly sorted arrays get their swaps inside every chunk.
+        '''
+        Generator.__check_arguments(size, min_limit, max_limit, shape)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        rng = random.Random(seed)
+
+        # Running maximum of the remaining uniform values for sorted shapes,
+        # and the tables shared between the chunks of the other shapes
+        state = {"current": 1.0}
+        cache = {}
+        swaps_per_chunk = None
+        if shape == "nearly_sorted":
+            swaps = options.get("swaps", max(1, size // 100))
+            swaps_per_chunk = -(-swaps * chunk_size // max(size, 1))
+
+        for start in range(0, size, chunk_size):
+            count = min(chunk_size, size - start)
+            if shape in Generator.__GLOBAL_SHAPES:
+                chunk = Generator.__order_statistics(
+                    rng, state, size - start, count, min_limit, max_limit,
+                    shape == "reversed")
+                if swaps_per_chunk:
+                    Generator.__swap_randomly(rng, chunk, swaps_per_chunk)
+            else:
+                chunk = Generator.__chunk(
+                    rng, shape, start, count, size, min_limit, max_limit, options, cache)
+            yield chunk
+
+    @staticmethod
+    def __check_arguments(size: int, min_limit: int, max_limit: int, shape: str) -> None:
+        '''
+        Rejects a negative size, an empty range or an unknown shape
+        '''
+        if size < 0:
+            raise ValueError("size must not be negative")
+        if min_limit > max_limit:
+            raise ValueError("min_limit must not be greater than max_limit")
+        if shape not in Generator.SHAPES:
+            raise ValueError(f"Unknown shape: {shape}")
+
+    @staticmethod
+    def __chunk(rng: random.Random, shape: str, start: int, count: int, size: int,
+                min_limit: int, max_limit: int, options: dict, cache: dict) -> list:
+        '''
+        Generates positions start..start + count - 1 of a shape whose values only
+        depend on the position. Tables shared by all chunks are kept in cache.
+        '''
+        span = max_limit - min_limit
+
+        if shape == "uniform":
+            return Generator.__uniform(rng, count, min_limit, max_limit)
+
+        if shape == "few_unique":
+            # Pick the distinct values once, then index them in bulk
+            if "few_unique" not in cache:
+                unique = max(1, min(options.get("unique", 8), span + 1))
+                cache["few_unique"] = rng.sample(
+                    range(min_limit, max_limit + 1), unique)
+            distinct = cache["few_unique"]
+            return [distinct[i] for i in Generator.__uniform(rng, count, 0, len(distinct) - 1)]
+
+        if shape == "sawtooth":
+            # Ascending ramps over the full range, teeth of them in the array
+            tooth = max(1, -(-size // max(1, options.get("teeth", 8))))
+            return [min_limit + (i % tooth) * span // max(1, tooth - 1)
+                    for i in range(start, start + count)]
+
+        if shape == "organ_pipe":
+            # Rises over the first half and falls back over the second half
+            half = max(1, (size - 1) / 2)
+            return [min_limit + int(span * (1 - abs(i - half) / half))
+                    for i in range(start, start + count)]
+
+        if shape == "zipf":
+            # Value min_limit + r - 1 has a weight proportional to 1 / r^s
+            ranks = min(span + 1, Generator.__ZIPF_RANKS)
+            exponent = options.get("exponent", 1.2)
+            if "zipf" not in cache:
+                total = 0.0
+                weights = []
+                for rank in range(1, ranks + 1):
+                    total += rank ** -exponent
+                    weights.append(total)
+                cache["zipf"] = weights
+            return rng.choices(range(min_limit, min_limit + ranks),
+                               cum_weights=cache["zipf"], k=count)
+
+        # Gaussian around the middle of the range, clamped to the range
+        mean = (min_limit + max_limit) / 2
+        deviation = max(span / 6, 1e-9)
+        gauss = rng.gauss
+        return [min(max(round(gauss(mean, deviation)), min_limit), max_limit)
+                for _ in range(count)]
+
+    @staticmethod
+    def __uniform(rng: random.Random, count: int, min_limit: int, max_limit: int) -> list:
+        '''
+        Draws count uniform integers. Narrow ranges come from one bulk block of
+        random bytes reduced modulo the range, the bias of which is at most
+        2^-32 for ranges up to 2^32.
+        '''
+        span = max_limit - min_limit + 1
+        if span > Generator.__BULK_SPAN:
+            randrange = rng.randrange
+            return [min_limit + randrange(span) for _ in range(count)]
+
+        words = array("Q")
+        words.frombytes(rng.randbytes(count * words.itemsize))
+        return [min_limit + word % span for word in words]
+
+    @staticmethod
+    def __order_statistics(rng: random.Random, state: dict, remaining: int, count: int,
+                           min_limit: int, max_limit: int, descending: bool) -> list:
+        '''
+        Draws the next count values of a sorted uniform sample without holding
+        the sample. The largest of m uniforms is U^(1/m), so the sample is
+        produced from the top down while state keeps the last maximum.
+        '''
+        span = max_limit - min_limit
+        current = state["current"]
+        chunk = []
+        for m in range(remaining, remaining - count, -1):
+            current *= rng.random() ** (1 / m)
+            offset = min(int(current * (span + 1)), span)
+            chunk.append(min_limit + offset if descending else max_limit - offset)
+        state["current"] = current
+        return chunk
+
+    @staticmethod
+    def __swap_randomly(rng: random.Random, values: list, swaps: int) -> None:
+        '''
+        Swaps swaps random pairs of positions in place
+        '''
+        if len(values) < 2:
+            return
+        last = len(values) - 1
+        for _ in range(swaps):
+            i = rng.randint(0, last)
+            j = rng.randint(0, last)
+            values[i], values[j] = values[j], values[i]
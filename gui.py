@@ -1,8 +1,14 @@
 import tkinter as tk
-from tkinter import ttk
-from datetime import datetime
-from generator import Generator
+from tkinter import filedialog, messagebox, ttk
+from array_view import ArrayView
+from arrayfile import ArrayFile
+from complexity import ComplexityEstimator
+from instrumented import OperationCounter
+from memory import MemoryProfiler
 from sorter import Sorter
+from visualizer import BarCanvas, SortEvents
+from worker import (SortJob, estimate_file_task, estimate_task, generate_task, race_file_task, race_task,
+                    sort_file_task, sort_task)
 
 class GUI:
     '''
@@ -23,6 +29,8 @@ class GUI:
         self.__main_window_color = "#7a6548"
         self.__frame_bg_color = "#a3947e"
         self.__lbl_btn_bg_color = "#634726"
+        self.__timeout_placeholder = "60"
+        self.__poll_interval = 50
 
         # Desktop Application widgets
         self.__array_size = None
@@ -30,11 +38,39 @@ class GUI:
         self.__upper_bound = None
         self.__generate_array_btn = None
         self.__generated_array = None
+        self.__open_array_btn = None
+        self.__save_array_btn = None
         self.__algorithm_selection = None
         self.__go_btn = None
+        self.__race_btn = None
         self.__result_frame = None
         self.__sorted_array = None
         self.__running_time = None
+        self.__operations = None
+        self.__memory = None
+        self.__count_operations = None
+        self.__measure_memory = None
+        self.__run_length = None
+        self.__timeout = None
+        self.__progress_bar = None
+        self.__status = None
+        self.__cancel_btn = None
+        self.__reset_btn = None
+
+        # Background work
+        self.__root = None
+        self.__job = None
+
+        # Jobs of the running race by algorithm, None when no race is running
+        self.__race_jobs = None
+
+        # File the generated array was opened from, None if it was generated
+        self.__array_path = None
+
+        # Types offered by the open and save dialogs
+        self.__array_filetypes = [("Array files", "*.arr"),
+                                  ("NumPy arrays", "*" + ArrayFile.NPY_EXTENSION),
+                                  ("All files", "*.*")]
 
     '''
     Different private events
@@ -88,8 +124,9 @@ class GUI:
         '''
         Resets the input enteries and destroys the result frame
         '''
-        # Does not reset if the result frame is not yet created
-        if self.__result_frame is None:
+        # Does not reset if the result frame is not yet created, or while a
+        # job still has to report into it
+        if self.__result_frame is None or self.__job is not None:
             return
 
         # Destroys the result frame
@@ -108,7 +145,8 @@ class GUI:
         self.__apply_placeholder(self.__upper_bound, self.__upper_placeholder)
 
         # Clears the previous generated array
-        self.__generated_array.delete(0, tk.END)
+        self.__generated_array.clear()
+        self.__array_path = None
 
         # Clears the reference of frame
         self.__result_frame = None
@@ -147,11 +185,10 @@ class GUI:
                                     width=13)
         sorted_array_lbl.place(x=10, y=80)
 
-        # Text-box that will display the sorted array
-        self.__sorted_array = tk.Entry(self.__result_frame,
-                                       width=110,
-                                       borderwidth=5,
-                                       font=self.__subheading_font)
+        # Paged view that will display the sorted array
+        self.__sorted_array = ArrayView(self.__result_frame,
+                                        self.__subheading_font,
+                                        self.__lbl_btn_bg_color)
         self.__sorted_array.place(x=10, y=110)
 
         # Label for the running-time
@@ -164,11 +201,41 @@ class GUI:
 
         # Text-box that will display the running-time
         self.__running_time = tk.Entry(self.__result_frame,
-                                       width=40,
+                                       width=20,
                                        borderwidth=5,
                                        font=self.__subheading_font)
         self.__running_time.place(x=10, y=210)
 
+        # Label for the memory usage
+        memory_lbl = tk.Label(self.__result_frame,
+                              text="Memory",
+                              font=self.__subheading_font,
+                              bg=self.__lbl_btn_bg_color,
+                              width=13)
+        memory_lbl.place(x=300, y=180)
+
+        # Text-box that will display the memory usage
+        self.__memory = tk.Entry(self.__result_frame,
+                                 width=22,
+                                 borderwidth=5,
+                                 font=self.__subheading_font)
+        self.__memory.place(x=300, y=210)
+
+        # Label for the operation counts
+        operations_lbl = tk.Label(self.__result_frame,
+                                  text="Operations",
+                                  font=self.__subheading_font,
+                                  bg=self.__lbl_btn_bg_color,
+                                  width=13)
+        operations_lbl.place(x=620, y=180)
+
+        # Text-box that will display the operation counts
+        self.__operations = tk.Entry(self.__result_frame,
+                                     width=60,
+                                     borderwidth=5,
+                                     font=self.__subheading_font)
+        self.__operations.place(x=620, y=210)
+
         # Creates the button which clears the current states of inputs and results
         self.__generate_reset_button(root)
 
@@ -187,21 +254,28 @@ class GUI:
 
         # do not create array if the lower bound is greater than upper bound
         if low > up:
-            self.__generated_array.insert(0, "Array cannot be generated")
+            self.__generated_array.set_message("Array cannot be generated")
             return
 
-        # call Generator's method to generate array with upper parameters
-        array = Generator.create_random_array(size, low, up)
+        # generate the array in a worker process, the entry is filled once it is done
+        self.__start_job(generate_task, (size, low, up), self.__show_generated_array)
 
-        # Clears the previous content and fill the entry with random generated array
-        self.__generated_array.delete(0, tk.END)
-        self.__generated_array.insert(0, array)
+    def __show_generated_array(self, job: SortJob):
+        '''
+        Fills the generated array text-box with the result of a generation job
+        '''
+        # Clears the previous content and shows the random generated array
+        self.__array_path = None
+        if job.state == SortJob.DONE:
+            self.__generated_array.set_array(job.result)
+        else:
+            self.__generated_array.clear()
 
     def __generate_result(self, root):
         '''
         Creates the result frame and applies the selected algorithm to sort the input array
         '''
-        if self.__generated_array.get() == '':
+        if self.__generated_array.get_array() is None:
             return
 
         # creates the result frame
@@ -211,64 +285,459 @@ class GUI:
         self.__apply_algorithm()
 
     def __generate_reset_button(self, root):
-        reset_button = tk.Button(root,
-                                 text="Reset",
-                                 bg=self.__lbl_btn_bg_color,
-                                 font=self.__subheading_font,
-                                 command=self.__reset,
-                                 width=10)
-        reset_button.place(x=1320, y=750)
+        self.__reset_btn = tk.Button(root,
+                                     text="Reset",
+                                     bg=self.__lbl_btn_bg_color,
+                                     font=self.__subheading_font,
+                                     command=self.__reset,
+                                     width=10)
+        self.__reset_btn.place(x=1320, y=750)
 
     def __apply_algorithm(self):
         '''
-        Applies the user selected algorithm to sort the array and displays it's running time.
+        Applies the user selected algorithm to sort the array in a worker process.
+        Large arrays are first estimated in a worker too, __apply_estimate then
+        asks before a long sort and starts it.
         '''
         # takes the name of algorithm from text box
         algorithm = self.__algorithm_selection.get()
 
+        array = self.__generated_array.get_array()
+        if not self.__confirm_memory(array, [algorithm]):
+            return
+        if len(array) < ComplexityEstimator.MIN_SIZE:
+            self.__sort(array, algorithm, None)
+            return
+
+        # The first array of a kind is timed on samples, which can take a
+        # second, so the window stays responsive meanwhile
+        on_finish = lambda job: self.__apply_estimate(job, array, algorithm)
+        if self.__array_path is not None:
+            self.__start_job(estimate_file_task, (self.__array_path, algorithm), on_finish)
+        else:
+            self.__start_job(estimate_task, (array, algorithm), on_finish)
+
+    def __apply_estimate(self, job: SortJob, array, algorithm: str):
+        '''
+        Starts the sort once its estimate is done, unless the estimate was
+        cancelled or the user declines a long running sort. A failed estimate
+        does not stop the sort.
+        '''
+        if job.state in (SortJob.CANCELLED, SortJob.TIMEOUT):
+            return
+        estimate = job.result if job.state == SortJob.DONE else None
+        if not self.__confirm_estimate(estimate):
+            return
+        self.__sort(array, algorithm, estimate)
+
+    def __sort(self, array, algorithm: str, estimate):
+        '''
+        Starts the sorting job, the result is displayed by __show_result once
+        the worker is done
+        '''
         # clears the previous data in resulting text-boxes
-        self.__sorted_array.delete(0, tk.END)
+        self.__sorted_array.clear()
         self.__running_time.delete(0, tk.END)
+        self.__operations.delete(0, tk.END)
+        self.__memory.delete(0, tk.END)
+
+        # shows the prediction until the result replaces it
+        if estimate is not None:
+            self.__running_time.insert(0, f"~{ComplexityEstimator.format_time(estimate.seconds)} estimated")
+            self.__memory.insert(0, f"~{MemoryProfiler.format_size(estimate.peak_bytes)} estimated")
+
+        count_operations = self.__count_operations.get()
+        measure_memory = self.__measure_memory.get()
+        run_length = self.__run_length.get()
+
+        # An opened file is mapped again by the worker, a generated array is
+        # sorted as it is, without any parsing
+        if self.__array_path is not None:
+            self.__start_job(sort_file_task,
+                             (self.__array_path, algorithm, count_operations, measure_memory,
+                              run_length),
+                             self.__show_result)
+        else:
+            self.__start_job(sort_task,
+                             (array, algorithm, count_operations, measure_memory, run_length),
+                             self.__show_result)
+
+    def __confirm_estimate(self, estimate) -> bool:
+        '''
+        Asks before a sort predicted to run longer than
+        ComplexityEstimator.CONFIRM_SECONDS, returns whether to go ahead
+        '''
+        warning = ComplexityEstimator.warning(estimate)
+        if warning is None:
+            return True
+        return messagebox.askyesno("Long running sort",
+                                   warning + "\n\nSort anyway?",
+                                   icon=messagebox.WARNING)
 
-        # Creates the integer array from string to apply sorting algorithm
-        array_from_string = self.__generated_array.get().split(' ')
-        integer_array = []
+    def __confirm_memory(self, array, algorithms: list) -> bool:
+        '''
+        Asks before sorting with algorithms estimated to allocate more than
+        MemoryProfiler.WARNING_BYTES, returns whether to go ahead
+        '''
+        warnings = [MemoryProfiler.warning(array, algorithm) for algorithm in algorithms]
+        warnings = [warning for warning in warnings if warning is not None]
+        if not warnings:
+            return True
+        return messagebox.askyesno("Memory warning",
+                                   "\n".join(warnings) + "\n\nSort anyway?",
+                                   icon=messagebox.WARNING)
+
+    def __show_result(self, job: SortJob):
+        '''
+        Displays the sorted array and running time of a finished sorting job
+        '''
+        # A cancelled job leaves the previous results as they are
+        if job.state == SortJob.CANCELLED:
+            return
+        if job.state == SortJob.DONE:
+            answer, time_taken, counter, memory = job.result
+
+            # fill the entries with running time, memory, operation counts and sorted array
+            self.__running_time.delete(0, tk.END)
+            self.__memory.delete(0, tk.END)
+            self.__running_time.insert(0, f"{time_taken:.6f} seconds")
+            self.__memory.insert(0, memory)
+            self.__operations.insert(0, counter if counter is not None else "Not Counted")
+            self.__sorted_array.set_array(answer)
+        else:
+            self.__running_time.delete(0, tk.END)
+            self.__memory.delete(0, tk.END)
+            self.__running_time.insert(0, "Not Calculated")
+            self.__memory.insert(0, "Not Measured")
+            self.__operations.insert(0, "Not Counted")
+            self.__sorted_array.set_message(
+                "Error! Sorting cannot be performed...")
+
+    def __start_job(self, task, args: tuple, on_finish):
+        '''
+        Runs the task in a worker process and polls it from the Tk event loop,
+        so the window stays responsive. on_finish is called with the job once
+        it is done, failed, cancelled or timed out.
+        '''
+        # Only one job runs at a time
+        if self.__job is not None:
+            return
 
-        for string_number in array_from_string:
-            integer_array.append(int(string_number))
+        self.__job = SortJob(task, args, self.__read_timeout())
+        self.__job.start()
 
-        start_time = datetime.now()
+        # Disable the actions and enable cancel while the job is running
+        self.__generate_array_btn.configure(state=tk.DISABLED)
+        self.__go_btn.configure(state=tk.DISABLED)
+        if self.__reset_btn is not None:
+            self.__reset_btn.configure(state=tk.DISABLED)
+        self.__cancel_btn.configure(state=tk.NORMAL)
+        self.__progress_bar.configure(mode="indeterminate")
+        self.__progress_bar.start()
+        self.__status.configure(text="Working...")
+
+        self.__root.after(self.__poll_interval, self.__poll_job, on_finish)
+
+    def __poll_job(self, on_finish):
+        '''
+        Checks the running job, updates the progress and reschedules itself
+        until the job is over
+        '''
+        job = self.__job
+        state = job.poll()
+
+        if state == SortJob.RUNNING:
+            # Switch to a real progress bar once the worker reports progress
+            if job.progress is not None:
+                self.__progress_bar.stop()
+                self.__progress_bar.configure(mode="determinate", value=job.progress * 100)
+            self.__status.configure(text=f"Working... {job.elapsed():.1f} s")
+            self.__root.after(self.__poll_interval, self.__poll_job, on_finish)
+            return
+
+        # The job is over, restore the controls and report how it ended
+        self.__job = None
+        self.__progress_bar.stop()
+        self.__progress_bar.configure(mode="determinate", value=0)
+        self.__generate_array_btn.configure(state=tk.NORMAL)
+        self.__go_btn.configure(state=tk.NORMAL)
+        if self.__reset_btn is not None:
+            self.__reset_btn.configure(state=tk.NORMAL)
+        self.__cancel_btn.configure(state=tk.DISABLED)
+
+        messages = {
+            SortJob.DONE: f"Done in {job.elapsed():.1f} s",
+            SortJob.CANCELLED: "Cancelled",
+            SortJob.TIMEOUT: "Timed out",
+            SortJob.ERROR: f"Error: {job.error}",
+        }
+        self.__status.configure(text=messages[state])
+        on_finish(job)
+
+    def __open_array(self):
+        '''
+        Asks for an array file and memory-maps it as the generated array
+        '''
+        if self.__job is not None:
+            return
+        path = filedialog.askopenfilename(filetypes=self.__array_filetypes)
+        if not path:
+            return
 
         try:
-            # If user selects the insertion sort, then its algorithm is called and time is saved
-            if algorithm == "Insertion Sort":
-                answer = Sorter.insertion_sort(integer_array)
+            array = ArrayFile.load(path)
+        except (OSError, ValueError, ImportError) as error:
+            self.__generated_array.set_message(f"Array cannot be opened: {error}")
+            self.__array_path = None
+            return
 
-            # If user selects the heap sort, then its algorithm is called and time is saved
-            elif algorithm == "Heap Sort":
-                answer = Sorter.heap_sort(integer_array)
+        self.__generated_array.set_array(array)
+        self.__array_path = path
+        self.__status.configure(text=f"Opened {len(array)} elements")
 
-            # If user selects the quick sort, then its algorithm is called and time is saved
-            elif algorithm == "Quick Sort":
-                answer = Sorter.quick_sort(integer_array)
+    def __save_array(self):
+        '''
+        Saves the sorted array, or the generated one if nothing is sorted yet
+        '''
+        array = None
+        if self.__result_frame is not None:
+            array = self.__sorted_array.get_array()
+        if array is None:
+            array = self.__generated_array.get_array()
+        if array is None:
+            return
 
-            # If user selects the counting sort, then its algorithm is called and time is saved
+        path = filedialog.asksaveasfilename(filetypes=self.__array_filetypes,
+                                            defaultextension=".arr")
+        if not path:
+            return
+
+        try:
+            ArrayFile.save(path, array)
+        except (OSError, ValueError, TypeError, ImportError) as error:
+            self.__status.configure(text=f"Save failed: {error}")
+            return
+        self.__status.configure(text=f"Saved {len(array)} elements")
+
+    def __visualize(self):
+        '''
+        Opens a window that animates the selected algorithm on the generated array
+        '''
+        array = self.__generated_array.get_array()
+        if array is None:
+            return
+
+        algorithm = self.__algorithm_selection.get()
+        if algorithm not in SortEvents.ALGORITHMS:
+            self.__status.configure(text=f"{algorithm} cannot be visualized")
+            return
+
+        window = tk.Toplevel(self.__root)
+        window.title(f"Visualizing {algorithm}")
+        window.configure(bg=self.__main_window_color)
+
+        # Status of the animation
+        state_lbl = tk.Label(window,
+                             text="Sorting...",
+                             font=self.__subheading_font,
+                             bg=self.__main_window_color)
+
+        bars = BarCanvas(window, on_finish=lambda: state_lbl.configure(text="Sorted"))
+        bars.canvas.pack(padx=10, pady=10)
+
+        controls = tk.Frame(window, bg=self.__main_window_color)
+        controls.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        # Speed as a power of ten of the events applied per frame, live adjustable
+        speed = tk.Scale(controls,
+                         label="Speed (10^x steps per frame)",
+                         from_=0,
+                         to=5,
+                         resolution=0.1,
+                         orient=tk.HORIZONTAL,
+                         length=400,
+                         bg=self.__frame_bg_color,
+                         command=lambda value: setattr(bars, "events_per_frame", 10 ** float(value)))
+        speed.set(2)
+        speed.pack(side=tk.LEFT)
+
+        # Button that pauses and resumes the animation
+        def toggle_pause():
+            if pause_btn.cget("text") == "Pause":
+                bars.pause()
+                pause_btn.configure(text="Resume")
             else:
-                answer = Sorter.counting_sort(integer_array)
+                bars.resume()
+                pause_btn.configure(text="Pause")
+
+        pause_btn = tk.Button(controls,
+                              text="Pause",
+                              bg=self.__lbl_btn_bg_color,
+                              font=self.__subheading_font,
+                              width=10,
+                              command=toggle_pause)
+        pause_btn.pack(side=tk.LEFT, padx=20)
+        state_lbl.pack(in_=controls, side=tk.LEFT)
+
+        # Stop the animation before the window goes away
+        def close():
+            bars.stop()
+            window.destroy()
+        window.protocol("WM_DELETE_WINDOW", close)
+
+        bars.set_array(array)
+        bars.play(SortEvents.events(array, algorithm))
+
+    def __race(self):
+        '''
+        Opens a window that races every algorithm on the generated array, each in
+        its own worker process with its own timeout. Rows are filled in as the
+        workers finish, fastest first, and the winner is highlighted.
+        '''
+        array = self.__generated_array.get_array()
+        if array is None or self.__race_jobs is not None:
+            return
+        if not self.__confirm_memory(array, list(Sorter.ALGORITHMS)):
+            return
 
-            end_time = datetime.now()
+        count_operations = self.__count_operations.get()
+        timeout = self.__read_timeout()
+
+        window = tk.Toplevel(self.__root)
+        window.title("Race")
+        window.configure(bg=self.__main_window_color)
+
+        # One row per algorithm, with the operation counts side by side
+        columns = ("algorithm", "status", "time") + OperationCounter.FIELDS
+        results = ttk.Treeview(window,
+                               columns=columns,
+                               show="headings",
+                               height=len(Sorter.ALGORITHMS))
+        for column in columns:
+            results.heading(column, text=column.replace("_", " ").capitalize())
+            results.column(column,
+                           width=200 if column == "status" else 140,
+                           anchor=tk.W if column in ("algorithm", "status") else tk.E)
+        results.tag_configure("winner", background="#e6c229")
+        results.pack(padx=10, pady=10)
+
+        controls = tk.Frame(window, bg=self.__main_window_color)
+        controls.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        # Outcome of the race
+        state_lbl = tk.Label(controls,
+                             text="Racing...",
+                             font=self.__subheading_font,
+                             bg=self.__main_window_color)
+
+        # Button that stops the algorithms still running
+        stop_btn = tk.Button(controls,
+                             text="Stop",
+                             bg=self.__lbl_btn_bg_color,
+                             font=self.__subheading_font,
+                             width=10,
+                             command=self.__cancel_race)
+        stop_btn.pack(side=tk.LEFT)
+        state_lbl.pack(side=tk.LEFT, padx=20)
+
+        # Every worker gets the array that is already parsed, or maps the
+        # opened file itself. All of them start at once, so a slow algorithm
+        # never holds back the results of the fast ones.
+        self.__race_jobs = {}
+        for algorithm in Sorter.ALGORITHMS:
+            if self.__array_path is not None:
+                job = SortJob(race_file_task, (self.__array_path, algorithm, count_operations), timeout)
+            else:
+                job = SortJob(race_task, (array, algorithm, count_operations), timeout)
+            job.start()
+            self.__race_jobs[algorithm] = job
+            results.insert("", tk.END, iid=algorithm, values=(algorithm, "Running"))
+
+        # Stop the workers before the window goes away
+        def close():
+            self.__cancel_race()
+            self.__race_jobs = None
+            self.__race_btn.configure(state=tk.NORMAL)
+            window.destroy()
+        window.protocol("WM_DELETE_WINDOW", close)
+
+        self.__race_btn.configure(state=tk.DISABLED)
+        self.__root.after(self.__poll_interval, self.__poll_race, results, state_lbl)
+
+    def __poll_race(self, results: ttk.Treeview, state_lbl: tk.Label):
+        '''
+        Polls every job of the race, refreshes the rows, keeps the finished ones
+        ordered by time and reschedules itself until every job is over
+        '''
+        jobs = self.__race_jobs
+        if jobs is None:
+            return
+        messages = {
+            SortJob.CANCELLED: "Cancelled",
+            SortJob.TIMEOUT: "Timed out",
+        }
+
+        finished = []
+        for algorithm, job in jobs.items():
+            state = job.poll()
+            if state == SortJob.RUNNING:
+                status = f"Running {job.elapsed():.1f} s"
+                results.item(algorithm, values=(algorithm, status), tags=())
+            elif state == SortJob.DONE:
+                time_taken, counter, in_order = job.result
+                counts = counter.as_dict() if counter is not None else {}
+                results.item(algorithm,
+                             values=(algorithm, "Done" if in_order else "Wrong order",
+                                     f"{time_taken:.6f} s") +
+                             tuple(counts.get(field, "") for field in OperationCounter.FIELDS),
+                             tags=())
+                if in_order:
+                    finished.append((time_taken, algorithm))
+            else:
+                status = messages.get(state, f"Error: {job.error}")
+                results.item(algorithm, values=(algorithm, status), tags=())
+
+        # Finished rows go to the top, fastest first, and the fastest one wins
+        finished.sort()
+        for index, (_, algorithm) in enumerate(finished):
+            results.move(algorithm, "", index)
+        if finished:
+            results.item(finished[0][1], tags=("winner",))
+
+        if any(job.state == SortJob.RUNNING for job in jobs.values()):
+            self.__root.after(self.__poll_interval, self.__poll_race, results, state_lbl)
+            return
 
-            # storing the running time
-            time_taken = end_time - start_time
+        # The race is over
+        self.__race_jobs = None
+        self.__race_btn.configure(state=tk.NORMAL)
+        state_lbl.configure(text=f"Winner: {finished[0][1]}" if finished else "No winner")
 
-            # fill the entries with running time and sorted array
-            self.__running_time.insert(0, time_taken)
-            self.__sorted_array.insert(0, answer)
+    def __cancel_race(self):
+        '''
+        Kills the jobs of the race that are still running, the next poll
+        reports them as cancelled
+        '''
+        if self.__race_jobs is not None:
+            for job in self.__race_jobs.values():
+                job.cancel()
 
-        except:
-            self.__running_time.insert(0, "Not Calculated")
-            self.__sorted_array.insert(
-                0, "Error! Sorting cannot be performed...")
+    def __cancel_job(self):
+        '''
+        Kills the running job, the next poll reports it as cancelled
+        '''
+        if self.__job is not None:
+            self.__job.cancel()
+
+    def __read_timeout(self):
+        '''
+        Reads the timeout in seconds from its text-box, no timeout if it is empty or 0
+        '''
+        try:
+            timeout = int(self.__timeout.get())
+        except ValueError:
+            return None
+        return timeout if timeout > 0 else None
 
     '''
     Public methods
@@ -279,6 +748,9 @@ class GUI:
         Creates the main frame in the start of program
         '''
 
+        # Keep the root to schedule polling of background jobs
+        self.__root = root
+
         # Creating and positioning the frame
         frame = self.__create_frame(root, 1350, self.__frame_bg_color, 3)
         frame.grid(row=0, column=0, padx=50, pady=30, ipadx=30, ipady=190)
@@ -387,6 +859,24 @@ class GUI:
                                               command=self.__generate_array)
         self.__generate_array_btn.place(x=800, y=150)
 
+        # Button that memory-maps an array file as the generated array
+        self.__open_array_btn = tk.Button(frame,
+                                          text="Open",
+                                          bg=self.__lbl_btn_bg_color,
+                                          font=self.__subheading_font,
+                                          width=7,
+                                          command=self.__open_array)
+        self.__open_array_btn.place(x=800, y=200)
+
+        # Button that saves the sorted or generated array to a file
+        self.__save_array_btn = tk.Button(frame,
+                                          text="Save",
+                                          bg=self.__lbl_btn_bg_color,
+                                          font=self.__subheading_font,
+                                          width=7,
+                                          command=self.__save_array)
+        self.__save_array_btn.place(x=910, y=200)
+
         # Label for Generated Array
         generated_lbl = tk.Label(frame,
                                  text="Generated Array",
@@ -396,11 +886,10 @@ class GUI:
                                  anchor=tk.W)
         generated_lbl.place(x=10, y=250)
 
-        # Text-box that will display the generated array
-        self.__generated_array = tk.Entry(frame,
-                                          width=110,
-                                          borderwidth=5,
-                                          font=self.__subheading_font)
+        # Paged view that will display the generated array
+        self.__generated_array = ArrayView(frame,
+                                           self.__subheading_font,
+                                           self.__lbl_btn_bg_color)
         self.__generated_array.place(x=10, y=280)
 
         # Label for sorting algorithm selection
@@ -411,12 +900,7 @@ class GUI:
         select_algorithm.place(x=10, y=330)
 
         # List that stores the sorting algorithms
-        sorting_algorithms = [
-            "Insertion Sort",
-            "Heap Sort",
-            "Quick Sort",
-            "Counting Sort"
-        ]
+        sorting_algorithms = list(Sorter.ALGORITHMS)
 
         # A combobox that displays the list of algorithms
         self.__algorithm_selection = ttk.Combobox(frame,
@@ -428,6 +912,80 @@ class GUI:
         # Initially selects the first item of Combobox
         self.__algorithm_selection.current(0)
 
+        # Label for the timeout of generation and sorting
+        timeout_lbl = tk.Label(frame,
+                               text="Timeout (s): ",
+                               font=self.__subheading_font)
+        timeout_lbl.place(x=1080, y=100)
+
+        # Text-box in which user input the timeout, 0 or empty disables it
+        self.__timeout = tk.Entry(frame,
+                                  width=8,
+                                  borderwidth=5,
+                                  font=self.__subheading_font,
+                                  validate="key",
+                                  validatecommand=(registered, '%P'))
+        self.__timeout.place(x=1240, y=100)
+        self.__timeout.insert(0, self.__timeout_placeholder)
+
+        # Progress of the running generation or sorting job
+        self.__progress_bar = ttk.Progressbar(frame,
+                                              orient=tk.HORIZONTAL,
+                                              length=290,
+                                              maximum=100)
+        self.__progress_bar.place(x=1080, y=160)
+
+        # Status of the running job
+        self.__status = tk.Label(frame,
+                                 text="",
+                                 font=self.__subheading_font,
+                                 width=22,
+                                 anchor=tk.W)
+        self.__status.place(x=1080, y=200)
+
+        # Check-box that adds an instrumented run counting the operations
+        self.__count_operations = tk.BooleanVar(root, value=False)
+        count_operations_chk = tk.Checkbutton(frame,
+                                              text="Count operations",
+                                              variable=self.__count_operations,
+                                              font=self.__subheading_font)
+        count_operations_chk.place(x=1080, y=250)
+
+        # Check-box that adds a traced run measuring the memory peak
+        self.__measure_memory = tk.BooleanVar(root, value=False)
+        measure_memory_chk = tk.Checkbutton(frame,
+                                            text="Measure memory",
+                                            variable=self.__measure_memory,
+                                            font=self.__subheading_font)
+        measure_memory_chk.place(x=1080, y=285)
+
+        # Check-box that shows the sorted array as (value, count) pairs
+        self.__run_length = tk.BooleanVar(root, value=False)
+        run_length_chk = tk.Checkbutton(frame,
+                                        text="Run-length output",
+                                        variable=self.__run_length,
+                                        font=self.__subheading_font)
+        run_length_chk.place(x=1250, y=250)
+
+        # Button that aborts the running job
+        self.__cancel_btn = tk.Button(frame,
+                                      text="Cancel",
+                                      bg=self.__lbl_btn_bg_color,
+                                      font=self.__subheading_font,
+                                      command=self.__cancel_job,
+                                      state=tk.DISABLED,
+                                      width=10)
+        self.__cancel_btn.place(x=1080, y=325)
+
+        # Button that opens the step by step animation of the selected algorithm
+        visualize_btn = tk.Button(frame,
+                                  text="Visualize",
+                                  bg=self.__lbl_btn_bg_color,
+                                  font=self.__subheading_font,
+                                  command=self.__visualize,
+                                  width=9)
+        visualize_btn.place(x=1230, y=325)
+
         # Button that displays the result of inputted values when created
         self.__go_btn = tk.Button(frame,
                                   text="Go",
@@ -435,9 +993,18 @@ class GUI:
                                   font=self.__subheading_font,
                                   command=lambda root=root: self.__generate_result(
                                       root),
-                                  width=15)
+                                  width=7)
         self.__go_btn.place(x=800, y=325)
 
+        # Button that races all algorithms on the generated array
+        self.__race_btn = tk.Button(frame,
+                                    text="Race",
+                                    bg=self.__lbl_btn_bg_color,
+                                    font=self.__subheading_font,
+                                    command=self.__race,
+                                    width=7)
+        self.__race_btn.place(x=910, y=325)
+
     def create_main_window(self):
         '''
         Public method for creating a main window
@@ -446,7 +1013,11 @@ class GUI:
         root = tk.Tk()
         root.geometry("1920x1024")
         root.title("Project")
-        root.iconbitmap("d:/Courses/tkinter/icons/one.ico")
+        # The icon only exists on the machine the project was made on
+        try:
+            root.iconbitmap("d:/Courses/tkinter/icons/one.ico")
+        except tk.TclError:
+            pass
         root.minsize(1920, 1024)
         root.configure(bg=self.__main_window_color)
         return root
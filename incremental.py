@@ -0,0 +1,282 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from sorter import Sorter
+
+
+class SortedCollection:
+    '''
+    Sorted container for data arriving in batches. Values are kept in a list of
+    sorted blocks of about load elements. A batch is sorted on its own with a
+    Sorter algorithm and merged only into the blocks its values fall into, so
+    the cost of an update follows the batch, not the whole collection. Lookups,
+    ranks and range queries bisect the block maxima, then one block.
+    '''
+
+    # Merges of at most this many values insert them one by one instead
+    __INSORT_LIMIT = 8
+
+    def __init__(self, values=(), algorithm: str = "Quick Sort", load: int = 1000,
+                 typecode: str = None) -> None:
+        '''
+        Constructor to initialize attributes and add the initial values. With a
+        typecode such as "q" the blocks are compact array.array buffers instead
+        of lists.
+        '''
+        if algorithm not in Sorter.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if load < 4:
+            raise ValueError("load must be at least 4")
+        self.__algorithm = algorithm
+        self.__load = load
+        self.__typecode = typecode
+
+        self.__blocks = []      # Sorted blocks, every value of a block <= the next block's
+        self.__maxes = []       # Largest value of every block
+        self.__offsets = None   # Values before every block, rebuilt after changes
+        self.__size = 0
+
+        self.update(values)
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self):
+        for block in self.__blocks:
+            yield from block
+
+    def __contains__(self, value) -> bool:
+        position = bisect_left(self.__maxes, value)
+        if position == len(self.__maxes):
+            return False
+        block = self.__blocks[position]
+        return block[bisect_left(block, value)] == value
+
+    def __getitem__(self, index: int):
+        position, offset = self.__locate(index)
+        return self.__blocks[position][offset]
+
+    def __delitem__(self, index: int) -> None:
+        position, offset = self.__locate(index)
+        self.__delete(position, offset)
+
+    def __repr__(self) -> str:
+        return f"SortedCollection({list(self)!r})"
+
+    def add(self, value) -> None:
+        '''
+        Inserts one value in O(log n + load)
+        '''
+        if not self.__blocks:
+            self.__blocks.append(self.__new_block([value]))
+            self.__maxes.append(value)
+        else:
+            position = min(bisect_left(self.__maxes, value), len(self.__maxes) - 1)
+            block = self.__blocks[position]
+            insort(block, value)
+            self.__maxes[position] = block[-1]
+            self.__split(position)
+        self.__size += 1
+        self.__offsets = None
+
+    def update(self, values) -> None:
+        '''
+        Adds a batch of values. The batch is sorted with the collection's Sorter
+        algorithm, then every stretch of it is merged in linear time into the
+        one block it belongs to.
+        '''
+        batch = list(values)
+        if not batch:
+            return
+        Sorter.sort_inplace(batch, self.__algorithm)
+
+        if not self.__blocks:
+            for start in range(0, len(batch), self.__load):
+                block = self.__new_block(batch[start:start + self.__load])
+                self.__blocks.append(block)
+                self.__maxes.append(block[-1])
+        else:
+            last = len(self.__blocks) - 1
+            touched = []
+            start = 0
+            position = 0
+            while start < len(batch):
+                # First block whose maximum is not below the next value, values
+                # above every maximum go to the last block
+                position = min(bisect_left(self.__maxes, batch[start], position), last)
+                if position == last:
+                    end = len(batch)
+                else:
+                    end = bisect_right(batch, self.__maxes[position], start)
+
+                self.__merge_into(position, batch, start, end)
+                touched.append(position)
+                start = end
+
+            # Split the grown blocks from the back, so positions stay valid
+            for position in reversed(touched):
+                self.__split(position)
+
+        self.__size += len(batch)
+        self.__offsets = None
+
+    def remove(self, value) -> None:
+        '''
+        Removes one occurrence of value, raises ValueError if there is none
+        '''
+        if not self.discard(value):
+            raise ValueError(f"{value!r} is not in the collection")
+
+    def discard(self, value) -> bool:
+        '''
+        Removes one occurrence of value if there is one, returns whether it did
+        '''
+        position = bisect_left(self.__maxes, value)
+        if position == len(self.__maxes):
+            return False
+        block = self.__blocks[position]
+        offset = bisect_left(block, value)
+        if block[offset] != value:
+            return False
+        self.__delete(position, offset)
+        return True
+
+    def pop(self, index: int = -1):
+        '''
+        Removes and returns the value at index, the largest by default
+        '''
+        position, offset = self.__locate(index)
+        value = self.__blocks[position][offset]
+        self.__delete(position, offset)
+        return value
+
+    def bisect_left(self, value) -> int:
+        '''
+        Rank of value: how many values are smaller than it
+        '''
+        position = bisect_left(self.__maxes, value)
+        if position == len(self.__maxes):
+            return self.__size
+        return self.__offset_of(position) + bisect_left(self.__blocks[position], value)
+
+    def bisect_right(self, value) -> int:
+        '''
+        How many values are smaller than or equal to value
+        '''
+        position = bisect_right(self.__maxes, value)
+        if position == len(self.__maxes):
+            return self.__size
+        return self.__offset_of(position) + bisect_right(self.__blocks[position], value)
+
+    def count(self, value) -> int:
+        '''
+        Number of occurrences of value
+        '''
+        return self.bisect_right(value) - self.bisect_left(value)
+
+    def index(self, value) -> int:
+        '''
+        Index of the first occurrence of value, raises ValueError if there is none
+        '''
+        rank = self.bisect_left(value)
+        if rank == self.__size or self[rank] != value:
+            raise ValueError(f"{value!r} is not in the collection")
+        return rank
+
+    def range_count(self, minimum, maximum) -> int:
+        '''
+        Number of values between minimum and maximum, both included
+        '''
+        return max(self.bisect_right(maximum) - self.bisect_left(minimum), 0)
+
+    def irange(self, minimum=None, maximum=None):
+        '''
+        Iterates over the values between minimum and maximum, both included,
+        without copying them. None leaves that side open.
+        '''
+        start = 0 if minimum is None else self.bisect_left(minimum)
+        end = self.__size if maximum is None else self.bisect_right(maximum)
+        if start >= end:
+            return
+
+        position, offset = self.__locate(start)
+        remaining = end - start
+        while remaining > 0:
+            block = self.__blocks[position]
+            stop = min(len(block), offset + remaining)
+            yield from block[offset:stop]
+            remaining -= stop - offset
+            position += 1
+            offset = 0
+
+    def __new_block(self, values):
+        '''
+        Creates a block from sorted values, a compact array if a typecode is set
+        '''
+        if self.__typecode is None:
+            return values if isinstance(values, list) else list(values)
+        return array(self.__typecode, values)
+
+    def __merge_into(self, position: int, batch: list, start: int, end: int) -> None:
+        '''
+        Merges the sorted batch[start..end - 1] into the block at position
+        '''
+        block = self.__blocks[position]
+        if end - start <= SortedCollection.__INSORT_LIMIT:
+            for i in range(start, end):
+                insort(block, batch[i])
+        else:
+            block = self.__new_block(heapq.merge(block, batch[start:end]))
+            self.__blocks[position] = block
+        self.__maxes[position] = block[-1]
+
+    def __split(self, position: int) -> None:
+        '''
+        Cuts the block at position into blocks of load values once it holds
+        more than twice that many
+        '''
+        block = self.__blocks[position]
+        if len(block) <= 2 * self.__load:
+            return
+        pieces = [block[start:start + self.__load] for start in range(0, len(block), self.__load)]
+        self.__blocks[position:position + 1] = pieces
+        self.__maxes[position:position + 1] = [piece[-1] for piece in pieces]
+
+    def __delete(self, position: int, offset: int) -> None:
+        '''
+        Deletes one value from a block, dropping the block once it is empty
+        '''
+        block = self.__blocks[position]
+        del block[offset]
+        if block:
+            self.__maxes[position] = block[-1]
+        else:
+            del self.__blocks[position]
+            del self.__maxes[position]
+        self.__size -= 1
+        self.__offsets = None
+
+    def __offset_of(self, position: int) -> int:
+        '''
+        Number of values before the block at position
+        '''
+        if self.__offsets is None:
+            # Running totals of the block sizes, rebuilt once after changes
+            self.__offsets = []
+            total = 0
+            for block in self.__blocks:
+                self.__offsets.append(total)
+                total += len(block)
+        return self.__offsets[position]
+
+    def __locate(self, index: int) -> tuple:
+        '''
+        Block position and offset inside it of the value at index
+        '''
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError("collection index out of range")
+        self.__offset_of(0)
+        position = bisect_right(self.__offsets, index) - 1
+        return position, index - self.__offsets[position]
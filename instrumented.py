@@ -0,0 +1,333 @@
+from sorter import Sorter
+
+
+class OperationCounter:
+    '''
+    Operation counts of one instrumented sort. Swaps are counted on their own
+    and do not add to moves, which count every other write of an element.
+    Allocations count the auxiliary slots (copies, counters, buffers) created.
+    '''
+
+    FIELDS = ("comparisons", "moves", "swaps", "max_depth", "allocations")
+
+    def __init__(self) -> None:
+        '''
+        Constructor to initialize all counters to zero
+        '''
+        self.comparisons = 0
+        self.moves = 0
+        self.swaps = 0
+        self.max_depth = 0
+        self.allocations = 0
+
+    def as_dict(self) -> dict:
+        '''
+        Returns the counters keyed by their field names
+        '''
+        return {field: getattr(self, field) for field in OperationCounter.FIELDS}
+
+    def __str__(self) -> str:
+        return (f"{self.comparisons} comparisons, {self.moves} moves, {self.swaps} swaps, "
+                f"depth {self.max_depth}, {self.allocations} allocated")
+
+
+class InstrumentedSorter:
+    '''
+    Counting twin of the Sorter. Every algorithm follows the same steps as its
+    Sorter version and returns the same result, while recording comparisons,
+    moves, swaps, partition depth and auxiliary allocations. It is a separate
+    code path, so the Sorter itself pays nothing for the instrumentation.
+    '''
+
+    # Algorithms that have an instrumented version, by their Sorter name
+    ALGORITHMS = {
+        "Insertion Sort": "insertion_sort",
+        "Heap Sort": "heap_sort",
+        "Quick Sort": "quick_sort",
+        "Counting Sort": "counting_sort",
+        "Radix Sort": "radix_sort",
+    }
+
+    def __init__(self) -> None:
+        '''
+        Constructor to initialize attributes
+        '''
+        self.counter = OperationCounter()
+
+    @staticmethod
+    def count(array, algorithm: str) -> tuple:
+        '''
+        Sorts the array with the named algorithm and returns the sorted list with
+        its OperationCounter
+        '''
+        if algorithm not in InstrumentedSorter.ALGORITHMS:
+            raise ValueError(f"No instrumented version of {algorithm}")
+        sorter = InstrumentedSorter()
+        method = getattr(sorter, InstrumentedSorter.ALGORITHMS[algorithm])
+        answer = method(array if isinstance(array, list) else list(array))
+        return answer, sorter.counter
+
+    def insertion_sort(self, array: list) -> list:
+        '''
+        Counting version of Sorter.insertion_sort
+        '''
+        array_copy = self.__copy(array)
+        for i in range(1, len(array_copy)):
+            j = i
+            while j > 0 and self.__less(array_copy[j], array_copy[j - 1]):
+                self.__swap(array_copy, j, j - 1)
+                j -= 1
+        return array_copy
+
+    def heap_sort(self, array: list) -> list:
+        '''
+        Counting version of Sorter.heap_sort
+        '''
+        array_copy = self.__copy(array)
+        self.__heap_sort_range(array_copy, 0, len(array_copy) - 1)
+        return array_copy
+
+    def quick_sort(self, array: list) -> list:
+        '''
+        Counting version of Sorter.quick_sort. max_depth is the deepest nesting
+        of partition steps.
+        '''
+        array_copy = self.__copy(array)
+        start, end = 0, len(array_copy) - 1
+        if end - start < 1:
+            return array_copy
+
+        depth_limit = 2 * (end - start + 1).bit_length()
+        stack = [(start, end, depth_limit)]
+
+        while stack:
+            start, end, depth = stack.pop()
+            while end - start + 1 > Sorter.INSERTION_CUTOFF:
+                if depth == 0:
+                    self.__heap_sort_range(array_copy, start, end)
+                    break
+                depth -= 1
+                self.counter.max_depth = max(self.counter.max_depth, depth_limit - depth)
+
+                split = self.__partition(
+                    array_copy, start, end, self.__choose_pivot(array_copy, start, end))
+                if split - start < end - split:
+                    stack.append((split + 1, end, depth))
+                    end = split
+                else:
+                    stack.append((start, split, depth))
+                    start = split + 1
+            else:
+                self.__insertion_sort_range(array_copy, start, end)
+        return array_copy
+
+    def counting_sort(self, array: list) -> list:
+        '''
+        Counting version of Sorter.counting_sort, including the hand-over to
+        radix sort for wide ranges
+        '''
+        array_copy = self.__copy(array)
+        if len(array_copy) < 2:
+            return array_copy
+
+        minimum, maximum = self.__min_max(array_copy)
+        size = (maximum - minimum) + 1
+
+        if size > Sorter.COUNTING_RANGE_FACTOR * len(array_copy) + Sorter.RADIX_BASE:
+            self.__lsd_radix_sort(array_copy, minimum, maximum)
+            return array_copy
+
+        frequency_array = [0] * (size + 1)
+        self.counter.allocations += size + 1
+        for value in array_copy:
+            frequency_array[value - minimum] += 1
+
+        sorted_index = 0
+        for i, occurences in enumerate(frequency_array):
+            for _ in range(occurences):
+                array_copy[sorted_index] = i + minimum
+                sorted_index += 1
+            self.counter.moves += occurences
+        return array_copy
+
+    def radix_sort(self, array: list) -> list:
+        '''
+        Counting version of Sorter.radix_sort
+        '''
+        array_copy = self.__copy(array)
+        if len(array_copy) > 1:
+            minimum, maximum = self.__min_max(array_copy)
+            self.__lsd_radix_sort(array_copy, minimum, maximum)
+        return array_copy
+
+    def __copy(self, array: list) -> list:
+        '''
+        Copies the input like every Sorter method does and counts the slots
+        '''
+        self.counter.allocations += len(array)
+        return array[:]
+
+    def __less(self, x, y) -> bool:
+        '''
+        Counted x < y
+        '''
+        self.counter.comparisons += 1
+        return x < y
+
+    def __swap(self, array: list, x: int, y: int) -> None:
+        '''
+        Counted swap of the elements at x and y
+        '''
+        self.counter.swaps += 1
+        array[x], array[y] = array[y], array[x]
+
+    def __min_max(self, array: list) -> tuple:
+        '''
+        min and max of the array, counted as the 2 * (n - 1) comparisons the
+        builtins perform
+        '''
+        self.counter.comparisons += 2 * (len(array) - 1)
+        return min(array), max(array)
+
+    def __lsd_radix_sort(self, array: list, minimum: int, maximum: int) -> None:
+        '''
+        Counting version of the Sorter's LSD radix sort
+        '''
+        size = len(array)
+        span = maximum - minimum
+        if span == 0:
+            return
+
+        digit_bits = 16 if size >= Sorter.RADIX_BASE else 8
+        base = 1 << digit_bits
+        mask = base - 1
+
+        source = [value - minimum for value in array]
+        target = [0] * size
+        self.counter.allocations += 2 * size
+        self.counter.moves += size
+
+        for shift in range(0, span.bit_length(), digit_bits):
+            counts = [0] * base
+            self.counter.allocations += base
+            for key in source:
+                counts[(key >> shift) & mask] += 1
+
+            position = 0
+            for digit in range(base):
+                counts[digit], position = position, position + counts[digit]
+
+            for key in source:
+                digit = (key >> shift) & mask
+                target[counts[digit]] = key
+                counts[digit] += 1
+            self.counter.moves += size
+
+            source, target = target, source
+
+        for i in range(size):
+            array[i] = source[i] + minimum
+        self.counter.moves += size
+
+    def __median_of_three(self, array: list, a: int, b: int, c: int) -> int:
+        '''
+        Counting version of the Sorter's median of three
+        '''
+        x, y, z = array[a], array[b], array[c]
+        if self.__less(x, y):
+            if self.__less(y, z):
+                return b
+            return c if self.__less(x, z) else a
+        if self.__less(x, z):
+            return a
+        return c if self.__less(y, z) else b
+
+    def __choose_pivot(self, array: list, start: int, end: int) -> int:
+        '''
+        Counting version of the Sorter's pivot choice
+        '''
+        middle = start + (end - start) // 2
+        if end - start + 1 <= Sorter.NINTHER_THRESHOLD:
+            return self.__median_of_three(array, start, middle, end)
+
+        step = (end - start + 1) // 8
+        first = self.__median_of_three(array, start, start + step, start + 2 * step)
+        second = self.__median_of_three(array, middle - step, middle, middle + step)
+        third = self.__median_of_three(array, end - 2 * step, end - step, end)
+        return self.__median_of_three(array, first, second, third)
+
+    def __partition(self, array: list, start: int, end: int, pivot_index: int) -> int:
+        '''
+        Counting version of the Sorter's Hoare partition
+        '''
+        self.__swap(array, start, pivot_index)
+        pivot = array[start]
+
+        i = start - 1
+        j = end + 1
+        while True:
+            i += 1
+            while self.__less(array[i], pivot):
+                i += 1
+            j -= 1
+            while self.__less(pivot, array[j]):
+                j -= 1
+            if i >= j:
+                return j
+            self.__swap(array, i, j)
+
+    def __insertion_sort_range(self, array: list, start: int, end: int) -> None:
+        '''
+        Counting version of the Sorter's shifting insertion sort
+        '''
+        for i in range(start + 1, end + 1):
+            value = array[i]
+            j = i - 1
+            while j >= start and self.__less(value, array[j]):
+                array[j + 1] = array[j]
+                self.counter.moves += 1
+                j -= 1
+            array[j + 1] = value
+            self.counter.moves += 1
+
+    def __heap_sort_range(self, array: list, start: int, end: int) -> None:
+        '''
+        Counting version of the Sorter's heap sort of a slice
+        '''
+        size = end - start + 1
+        for root in range(size // 2 - 1, -1, -1):
+            self.__sift_down(array, start, root, size, array[start + root])
+
+        for last in range(size - 1, 0, -1):
+            value = array[start + last]
+            array[start + last] = array[start]
+            self.counter.moves += 1
+            self.__sift_down(array, start, 0, last, value)
+
+    def __sift_down(self, array: list, offset: int, root: int, size: int, value) -> None:
+        '''
+        Counting version of the Sorter's hole-based sift-down
+        '''
+        child = 2 * root + 1
+        while child + 1 < size:
+            child_value = array[offset + child]
+            right_value = array[offset + child + 1]
+            if self.__less(child_value, right_value):
+                child += 1
+                child_value = right_value
+            if not self.__less(value, child_value):
+                array[offset + root] = value
+                self.counter.moves += 1
+                return
+            array[offset + root] = child_value
+            self.counter.moves += 1
+            root = child
+            child = 2 * root + 1
+
+        if child == size - 1 and self.__less(value, array[offset + child]):
+            array[offset + root] = array[offset + child]
+            self.counter.moves += 1
+            root = child
+
+        array[offset + root] = value
+        self.counter.moves += 1
@@ -1,3 +1,10 @@
+import sys
+
+# Any argument asks for the headless sorter, which never loads tkinter
+if len(sys.argv) > 1:
+    from cli import CommandLine
+    sys.exit(CommandLine.main())
+
 from gui import GUI
 gui = GUI()                         # Generating GUI instance
 root = gui.create_main_window()     # generate main window for user
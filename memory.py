@@ -0,0 +1,147 @@
+import sys
+import tracemalloc
+from sorter import Sorter
+
+# resource only exists on Unix, peak RSS is not reported elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class MemoryUsage:
+    '''
+    Memory used by one sort: the tracemalloc peak above the memory held before
+    the run, the allocated blocks still alive after it, and the growth of the
+    peak resident set size of the process. Unmeasured fields are None.
+    '''
+
+    FIELDS = ("peak_bytes", "allocated_blocks", "rss_delta_bytes")
+
+    def __init__(self, peak_bytes: int = None, allocated_blocks: int = None,
+                 rss_delta_bytes: int = None) -> None:
+        '''
+        Constructor to initialize the measured values
+        '''
+        self.peak_bytes = peak_bytes
+        self.allocated_blocks = allocated_blocks
+        self.rss_delta_bytes = rss_delta_bytes
+
+    def as_dict(self) -> dict:
+        '''
+        Returns the measurements keyed by their field names
+        '''
+        return {field: getattr(self, field) for field in MemoryUsage.FIELDS}
+
+    def __str__(self) -> str:
+        parts = []
+        if self.peak_bytes is not None:
+            parts.append(f"peak {MemoryProfiler.format_size(self.peak_bytes)}")
+        if self.allocated_blocks is not None:
+            parts.append(f"{self.allocated_blocks} blocks")
+        if self.rss_delta_bytes is not None:
+            parts.append(f"RSS +{MemoryProfiler.format_size(self.rss_delta_bytes)}")
+        return ", ".join(parts) if parts else "Not Measured"
+
+
+class MemoryProfiler:
+    '''
+    Measures and estimates the memory the Sorter algorithms need
+    '''
+
+    # Estimates above this many bytes deserve a warning before sorting
+    WARNING_BYTES = 1 << 30
+
+    # Rough bytes per list slot and per int object created by an algorithm
+    __SLOT_BYTES = 8
+    __INT_BYTES = 32
+
+    @staticmethod
+    def peak_rss() -> int:
+        '''
+        Static method that returns the peak resident set size of this process in
+        bytes, None where it cannot be read
+        '''
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    @staticmethod
+    def measure(function, *args) -> tuple:
+        '''
+        Static method that calls function(*args) under tracemalloc and returns
+        its result with a MemoryUsage. Tracing slows the call down, so time
+        it in a separate run.
+        '''
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        rss_before = MemoryProfiler.peak_rss()
+        try:
+            result = function(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            rss_after = MemoryProfiler.peak_rss()
+            blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        rss_delta = rss_after - rss_before if rss_before is not None else None
+        return result, MemoryUsage(peak - before, blocks, rss_delta)
+
+    @staticmethod
+    def estimate(array, algorithm: str) -> int:
+        '''
+        Static method that estimates the bytes the algorithm allocates to sort
+        the array: the copy every method makes plus its own buffers, like the
+        frequency list of counting sort that grows with the value range
+        '''
+        if algorithm == "Auto":
+            # Imported here because the auto module builds on the Sorter
+            from auto import AutoSorter
+            algorithm = AutoSorter.choose(array)
+
+        size = len(array)
+        slot = MemoryProfiler.__SLOT_BYTES
+        copy = size * slot
+        if size < 2:
+            return copy
+
+        if algorithm == "Merge Sort":
+            return copy + (size // 2 + 1) * slot
+        if algorithm not in ("Counting Sort", "Radix Sort"):
+            return copy
+
+        value_range = max(array) - min(array) + 1
+        radix = (algorithm == "Radix Sort" or
+                 value_range > Sorter.COUNTING_RANGE_FACTOR * size + Sorter.RADIX_BASE)
+        if not radix:
+            # One counter slot per value of the range
+            return copy + (value_range + 1) * slot
+        # Shifted keys, the ping-pong buffer and one count table
+        return copy + size * (2 * slot + MemoryProfiler.__INT_BYTES) + Sorter.RADIX_BASE * slot
+
+    @staticmethod
+    def warning(array, algorithm: str) -> str:
+        '''
+        Static method that returns a warning if sorting the array with the
+        algorithm is estimated to need more than WARNING_BYTES, None otherwise
+        '''
+        needed = MemoryProfiler.estimate(array, algorithm)
+        if needed <= MemoryProfiler.WARNING_BYTES:
+            return None
+        return f"{algorithm} may allocate about {MemoryProfiler.format_size(needed)}"
+
+    @staticmethod
+    def format_size(size: int) -> str:
+        '''
+        Static method that formats a byte count with a binary unit
+        '''
+        for unit in ("B", "KiB", "MiB", "GiB"):
+            if abs(size) < 1024 or unit == "GiB":
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
@@ -0,0 +1,170 @@
+import heapq
+import os
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from sorter import Sorter
+
+
+def _sort_chunk(name: str, start: int, end: int, algorithm: str, splitters: list) -> list:
+    '''
+    Worker function that sorts items start..end - 1 of the shared int64 buffer
+    in place, without copying them out, and returns how many of them fall
+    into every bucket between the splitters. Only the buffer name and the
+    bounds are sent to the worker.
+    '''
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        values = shared.buf.cast("q")
+        try:
+            chunk = values[start:end]
+            try:
+                Sorter.sort_inplace(chunk, algorithm)
+                # The chunk is sorted, so every bucket is one stretch of it
+                cuts = [0] + [bisect_right(chunk, splitter) for splitter in splitters] + [len(chunk)]
+            finally:
+                chunk.release()
+        finally:
+            values.release()
+    finally:
+        shared.close()
+    return [cuts[i + 1] - cuts[i] for i in range(len(cuts) - 1)]
+
+
+def _merge_bucket(source_name: str, target_name: str, pieces: list, offset: int) -> None:
+    '''
+    Worker function that merges the sorted (start, end) pieces of one bucket
+    from the source buffer into its final range of the target buffer, which
+    starts at offset
+    '''
+    source = shared_memory.SharedMemory(name=source_name)
+    target = shared_memory.SharedMemory(name=target_name)
+    try:
+        values = source.buf.cast("q")
+        output = target.buf.cast("q")
+        try:
+            merged = array("q", heapq.merge(*(values[start:end] for start, end in pieces)))
+            output[offset:offset + len(merged)] = merged
+        finally:
+            values.release()
+            output.release()
+    finally:
+        source.close()
+        target.close()
+
+
+class ParallelSorter:
+    '''
+    Sorts integer arrays on several cores with a sample sort. The input is
+    split into chunks that are sorted in place in a process pool with any
+    Sorter algorithm. Splitters drawn from a sample cut every sorted chunk
+    into buckets, and each bucket is merged by a worker of its own straight
+    into its final range of the output. Data travels through shared int64
+    buffers, so no chunk is ever pickled.
+    '''
+
+    # Arrays smaller than this are sorted in the calling process
+    MIN_PARALLEL_SIZE = 1 << 15
+
+    # Sampled values per bucket when choosing the splitters
+    OVERSAMPLING = 32
+
+    def __init__(self, workers: int = None, chunk_size: int = None) -> None:
+        '''
+        Constructor to initialize attributes. Without a chunk size the array is
+        split into one chunk per worker.
+        '''
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.__workers = workers or os.cpu_count() or 1
+        self.__chunk_size = chunk_size
+        self.__executor = None
+
+    def __enter__(self) -> "ParallelSorter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        '''
+        Shuts the process pool down, a later sort starts a new one
+        '''
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def sort(self, array_to_sort, algorithm: str = "Quick Sort") -> list:
+        '''
+        Sorts the integer array with the named algorithm as the per-chunk kernel
+        and returns a new sorted list
+        '''
+        if algorithm not in Sorter.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+        size = len(array_to_sort)
+        if size < ParallelSorter.MIN_PARALLEL_SIZE or self.__workers == 1:
+            return Sorter.sort(array_to_sort, algorithm)
+
+        try:
+            typed = array("q", array_to_sort)
+        except OverflowError:
+            raise ValueError("parallel sort needs values that fit into 64 bits") from None
+
+        chunk_size = self.__chunk_size or -(-size // self.__workers)
+        bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+        # One bucket per chunk, cut at evenly spaced values of a sorted sample
+        buckets = len(bounds)
+        rng = random.Random(size)
+        sample = sorted(typed[rng.randrange(size)]
+                        for _ in range(buckets * ParallelSorter.OVERSAMPLING))
+        splitters = sample[ParallelSorter.OVERSAMPLING::ParallelSorter.OVERSAMPLING]
+
+        source = shared_memory.SharedMemory(create=True, size=size * typed.itemsize)
+        target = None
+        try:
+            target = shared_memory.SharedMemory(create=True, size=size * typed.itemsize)
+            values = source.buf.cast("q")
+            try:
+                values[:] = typed
+            finally:
+                values.release()
+            del typed
+
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(self.__workers)
+
+            # Sort every chunk in place and count its values per bucket
+            futures = [self.__executor.submit(_sort_chunk, source.name, start, end, algorithm, splitters)
+                       for start, end in bounds]
+            counts = [future.result() for future in futures]
+
+            # Piece of every chunk in every bucket, and where each bucket starts
+            futures = []
+            offset = 0
+            for bucket in range(buckets):
+                pieces = []
+                for (start, _), chunk_counts in zip(bounds, counts):
+                    first = start + sum(chunk_counts[:bucket])
+                    pieces.append((first, first + chunk_counts[bucket]))
+                futures.append(self.__executor.submit(
+                    _merge_bucket, source.name, target.name, pieces, offset))
+                offset += sum(end - start for start, end in pieces)
+            for future in futures:
+                future.result()
+
+            output = target.buf.cast("q")
+            try:
+                return output.tolist()
+            finally:
+                output.release()
+        finally:
+            for shared in (source, target):
+                if shared is not None:
+                    shared.close()
+                    shared.unlink()
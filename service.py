@@ -0,0 +1,652 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from sorter import Sorter
+
+
+def _sort_payload(algorithm: str, data: bytes) -> bytes:
+    '''
+    Worker function that sorts one array of little-endian int64 values and
+    returns it in the same encoding
+    '''
+    values = SortProtocol.unpack_values(data)
+    return SortProtocol.pack_values(Sorter.sort(values.tolist(), algorithm))
+
+
+def _sort_batch(requests: list) -> list:
+    '''
+    Worker function that sorts a batch of small (algorithm, data) requests in
+    one round trip to the pool. Failures are returned per request as strings.
+    '''
+    answers = []
+    for algorithm, data in requests:
+        try:
+            answers.append(_sort_payload(algorithm, data))
+        except Exception as error:
+            answers.append(f"{type(error).__name__}: {error}")
+    return answers
+
+
+def _worker_loop(connection) -> None:
+    '''
+    Entry point of a pool worker process. Runs every (function, args) task it
+    receives and sends back the result, or the error as a message string,
+    until the connection is closed.
+    '''
+    while True:
+        try:
+            function, args = connection.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = function(*args)
+        except Exception as error:
+            result = f"{type(error).__name__}: {error}"
+        connection.send(result)
+
+
+class WorkerPool:
+    '''
+    Fixed number of worker processes that run one task at a time each. Unlike
+    a ProcessPoolExecutor, a worker whose task is cancelled, for example by a
+    timeout, is killed and replaced at once, so the capacity is freed.
+    '''
+
+    def __init__(self, workers: int = None) -> None:
+        '''
+        Constructor to initialize attributes, one worker per CPU by default
+        '''
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+
+        self.__idle = None      # Queue of the (process, connection) waiting for a task
+        self.__running = set()  # Every live (process, connection)
+        # One thread per worker waits for its answer, off the event loop
+        self.__threads = None
+
+    def start(self) -> None:
+        '''
+        Starts every worker process
+        '''
+        self.__idle = asyncio.Queue()
+        self.__threads = ThreadPoolExecutor(self.workers)
+        for _ in range(self.workers):
+            self.__idle.put_nowait(self.__spawn())
+
+    def close(self) -> None:
+        '''
+        Kills every worker, running tasks included
+        '''
+        for worker in list(self.__running):
+            self.__retire(worker)
+        if self.__threads is not None:
+            # The threads return as soon as their worker is gone
+            self.__threads.shutdown(wait=False, cancel_futures=True)
+            self.__threads = None
+
+    async def run(self, function, *args):
+        '''
+        Runs function(*args) in the next idle worker and returns its result, a
+        message string if it raised. If the caller is cancelled while the task
+        runs, the worker is killed and a fresh one takes its place.
+        '''
+        worker = await self.__idle.get()
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.__threads, WorkerPool.__call, worker[1], function, args)
+        except BaseException:
+            # Cancelled, or the worker died, either way it cannot be reused
+            self.__retire(worker)
+            if self.__threads is not None:
+                self.__idle.put_nowait(self.__spawn())
+            raise
+        self.__idle.put_nowait(worker)
+        return result
+
+    def __spawn(self) -> tuple:
+        '''
+        Starts one worker process connected by a pipe
+        '''
+        connection, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_worker_loop, args=(child,), daemon=True)
+        process.start()
+        child.close()
+        worker = (process, connection)
+        self.__running.add(worker)
+        return worker
+
+    def __retire(self, worker: tuple) -> None:
+        '''
+        Kills a worker. The thread waiting on its pipe then sees the end of
+        the connection and closes it.
+        '''
+        process, _ = worker
+        self.__running.discard(worker)
+        if process.is_alive():
+            process.kill()
+
+    @staticmethod
+    def __call(connection, function, args: tuple):
+        '''
+        Private helper static method run in a thread, sends one task and waits
+        for its result
+        '''
+        try:
+            connection.send((function, args))
+            return connection.recv()
+        except (EOFError, OSError):
+            connection.close()
+            raise ConnectionError("worker process ended") from None
+
+
+class SortProtocol:
+    '''
+    Binary framing of the sort service. A request is a header (magic, request
+    id, algorithm name length, timeout in milliseconds, item count) followed by
+    the algorithm name and the items as little-endian int64. A response is a
+    header (magic, request id, status, item count) followed by the sorted
+    items, or by a UTF-8 message of that many bytes if the status is not OK.
+    Requests on a connection may be pipelined, responses come back in the
+    order they finish.
+    '''
+
+    REQUEST_HEADER = struct.Struct("<4sIHIQ")
+    RESPONSE_HEADER = struct.Struct("<4sIBQ")
+    REQUEST_MAGIC = b"SRTQ"
+    RESPONSE_MAGIC = b"SRTR"
+
+    # Response statuses
+    OK = 0
+    ERROR = 1
+    TIMEOUT = 2
+
+    # Largest array accepted in one request
+    MAX_ITEMS = 1 << 27
+
+    @staticmethod
+    def pack_values(values) -> bytes:
+        '''
+        Static method that encodes integers as little-endian int64
+        '''
+        data = array("q", values)
+        if sys.byteorder == "big":
+            data.byteswap()
+        return data.tobytes()
+
+    @staticmethod
+    def unpack_values(data: bytes) -> array:
+        '''
+        Static method that decodes little-endian int64 integers
+        '''
+        values = array("q")
+        values.frombytes(data)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    @staticmethod
+    def encode_request(request_id: int, algorithm: str, values, timeout: float = None) -> bytes:
+        '''
+        Static method that frames one request
+        '''
+        name = algorithm.encode()
+        data = SortProtocol.pack_values(values)
+        timeout_ms = int(timeout * 1000) if timeout else 0
+        header = SortProtocol.REQUEST_HEADER.pack(
+            SortProtocol.REQUEST_MAGIC, request_id, len(name), timeout_ms, len(data) // 8)
+        return header + name + data
+
+    @staticmethod
+    async def read_request(reader: asyncio.StreamReader) -> tuple:
+        '''
+        Static method that reads one request, returns (request_id, algorithm,
+        timeout, data) or None once the peer closed the connection
+        '''
+        try:
+            header = await reader.readexactly(SortProtocol.REQUEST_HEADER.size)
+        except asyncio.IncompleteReadError as error:
+            if error.partial:
+                raise ValueError("truncated request header") from None
+            return None
+        magic, request_id, name_length, timeout_ms, count = SortProtocol.REQUEST_HEADER.unpack(header)
+        if magic != SortProtocol.REQUEST_MAGIC:
+            raise ValueError("bad request magic")
+        if count > SortProtocol.MAX_ITEMS:
+            raise ValueError(f"request of {count} items exceeds {SortProtocol.MAX_ITEMS}")
+        algorithm = (await reader.readexactly(name_length)).decode()
+        data = await reader.readexactly(count * 8)
+        return request_id, algorithm, (timeout_ms / 1000 if timeout_ms else None), data
+
+    @staticmethod
+    def encode_response(request_id: int, status: int, payload) -> bytes:
+        '''
+        Static method that frames one response, payload is the sorted data for
+        OK and a message otherwise
+        '''
+        if status == SortProtocol.OK:
+            return SortProtocol.RESPONSE_HEADER.pack(
+                SortProtocol.RESPONSE_MAGIC, request_id, status, len(payload) // 8) + payload
+        message = str(payload).encode()
+        return SortProtocol.RESPONSE_HEADER.pack(
+            SortProtocol.RESPONSE_MAGIC, request_id, status, len(message)) + message
+
+    @staticmethod
+    async def read_response(reader: asyncio.StreamReader) -> tuple:
+        '''
+        Static method that reads one response, returns (request_id, status,
+        payload) where payload is the sorted array or the error message
+        '''
+        header = await reader.readexactly(SortProtocol.RESPONSE_HEADER.size)
+        magic, request_id, status, count = SortProtocol.RESPONSE_HEADER.unpack(header)
+        if magic != SortProtocol.RESPONSE_MAGIC:
+            raise ValueError("bad response magic")
+        if status == SortProtocol.OK:
+            return request_id, status, SortProtocol.unpack_values(await reader.readexactly(count * 8))
+        return request_id, status, (await reader.readexactly(count)).decode()
+
+
+class SortService:
+    '''
+    Local asyncio sort server shared by several tools, on a Unix socket or a
+    localhost TCP port. Small requests arriving together are coalesced into
+    one batch for the process pool, large ones go to the pool on their own.
+    At most max_pending requests are in flight; beyond that the server stops
+    reading, so the sockets push back on the clients. Every request has a
+    timeout, after which its client gets a TIMEOUT response. A pool worker
+    that is already sorting it is killed and replaced by a fresh one, or, for
+    a batch, once every request of the batch has timed out.
+    '''
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, path: str = None,
+                 workers: int = None, small_size: int = 4096, batch_items: int = 1 << 16,
+                 batch_window: float = 0.002, max_pending: int = 256, timeout: float = 30.0) -> None:
+        '''
+        Constructor to initialize attributes. With a path the server listens on
+        that Unix socket instead of host and port. Requests of at most
+        small_size items are batched for batch_window seconds or until the
+        batch holds batch_items items.
+        '''
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.__host = host
+        self.__port = port
+        self.__path = path
+        self.__workers = workers
+        self.__small_size = small_size
+        self.__batch_items = batch_items
+        self.__batch_window = batch_window
+        self.__max_pending = max_pending
+        self.__timeout = timeout
+
+        self.__server = None
+        self.__pool = None
+        self.__slots = None
+        self.__queue = None
+        self.__batcher = None
+        self.__connections = {}  # Serving task of every open connection, by its writer
+
+    async def start(self) -> None:
+        '''
+        Starts the worker pool and the server
+        '''
+        # Every worker starts now, so they are warm for the first requests
+        self.__pool = WorkerPool(self.__workers)
+        self.__pool.start()
+
+        self.__slots = asyncio.Semaphore(self.__max_pending)
+        self.__queue = asyncio.Queue()
+        self.__batcher = asyncio.create_task(self.__collect_batches())
+
+        if self.__path is not None:
+            self.__server = await asyncio.start_unix_server(self.__serve, path=self.__path)
+        else:
+            self.__server = await asyncio.start_server(self.__serve, self.__host, self.__port)
+
+    async def close(self) -> None:
+        '''
+        Stops accepting connections and shuts the worker pool down
+        '''
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        # Closing the open connections ends their serving tasks at the end of
+        # stream, once their running requests finish or time out
+        connections = list(self.__connections.items())
+        for writer, _ in connections:
+            writer.close()
+        if connections:
+            await asyncio.gather(*(task for _, task in connections), return_exceptions=True)
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            self.__batcher = None
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool = None
+
+    async def serve_forever(self) -> None:
+        '''
+        Starts the service and serves until cancelled
+        '''
+        await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.close()
+
+    async def __serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        '''
+        Reads the requests of one connection and starts a task for each
+        '''
+        write_lock = asyncio.Lock()
+        tasks = set()
+        self.__connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                # No free slot means no reading, which is the backpressure
+                await self.__slots.acquire()
+                try:
+                    request = await SortProtocol.read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+                    request = None
+                if request is None:
+                    self.__slots.release()
+                    break
+
+                task = asyncio.create_task(self.__handle(request, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(lambda _: self.__slots.release())
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self.__connections.pop(writer, None)
+            writer.close()
+
+    async def __handle(self, request: tuple, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        '''
+        Sorts one request and writes its response
+        '''
+        request_id, algorithm, timeout, data = request
+        if algorithm not in Sorter.ALGORITHMS:
+            response = SortProtocol.encode_response(
+                request_id, SortProtocol.ERROR, f"Unknown algorithm: {algorithm}")
+        else:
+            try:
+                answer = await asyncio.wait_for(self.__submit(algorithm, data),
+                                                timeout or self.__timeout)
+                if isinstance(answer, str):
+                    response = SortProtocol.encode_response(request_id, SortProtocol.ERROR, answer)
+                else:
+                    response = SortProtocol.encode_response(request_id, SortProtocol.OK, answer)
+            except asyncio.TimeoutError:
+                response = SortProtocol.encode_response(request_id, SortProtocol.TIMEOUT, "Timed out")
+            except Exception as error:
+                response = SortProtocol.encode_response(
+                    request_id, SortProtocol.ERROR, f"{type(error).__name__}: {error}")
+
+        # One write per response, so pipelined responses never interleave
+        async with write_lock:
+            try:
+                writer.write(response)
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    def __submit(self, algorithm: str, data: bytes):
+        '''
+        Returns an awaitable of the sorted data, from a batch for small
+        requests and from a pool task of its own for large ones
+        '''
+        if len(data) // 8 > self.__small_size:
+            return self.__pool.run(_sort_payload, algorithm, data)
+        future = asyncio.get_running_loop().create_future()
+        self.__queue.put_nowait((algorithm, data, future))
+        return future
+
+    async def __collect_batches(self) -> None:
+        '''
+        Gathers queued small requests for up to batch_window seconds, or until
+        batch_items items, and sends each batch to the pool in one task
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.__queue.get()]
+            items = len(batch[0][1]) // 8
+            deadline = loop.time() + self.__batch_window
+            while items < self.__batch_items:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self.__queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(entry)
+                items += len(entry[1]) // 8
+
+            # Requests that timed out while waiting are not sent at all
+            batch = [entry for entry in batch if not entry[2].done()]
+            if not batch:
+                continue
+            task = asyncio.create_task(self.__run_batch(batch))
+            for _, _, future in batch:
+                future.add_done_callback(
+                    lambda _, batch=batch, task=task: SortService.__abandon(batch, task))
+
+    async def __run_batch(self, batch: list) -> None:
+        '''
+        Sorts a batch in one pool task and hands the answers to the waiting
+        requests
+        '''
+        try:
+            answers = await self.__pool.run(_sort_batch, [(algorithm, data) for algorithm, data, _ in batch])
+        except asyncio.CancelledError:
+            return
+        except Exception as error:
+            answers = [f"{type(error).__name__}: {error}"] * len(batch)
+        if isinstance(answers, str):
+            answers = [answers] * len(batch)
+        for (_, _, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+    @staticmethod
+    def __abandon(batch: list, task: asyncio.Task) -> None:
+        '''
+        Cancels the pool task of a batch once none of its requests waits for
+        it any more, which frees its worker
+        '''
+        if not task.done() and all(future.cancelled() for _, _, future in batch):
+            task.cancel()
+
+    @staticmethod
+    def main(argv: list = None) -> int:
+        '''
+        Command line entry point that serves, or load-tests a server, returns
+        the exit status
+        '''
+        parser = argparse.ArgumentParser(description="Local sort service")
+        commands = parser.add_subparsers(dest="command", required=True)
+
+        serve = commands.add_parser("serve", help="run the service")
+        load = commands.add_parser("load", help="load-test a running service")
+        for command in (serve, load):
+            command.add_argument("--host", default="127.0.0.1")
+            command.add_argument("--port", type=int, default=8765)
+            command.add_argument("--unix", metavar="PATH", help="use this Unix socket instead")
+        serve.add_argument("--workers", type=int)
+        serve.add_argument("--small-size", type=int, default=4096,
+                           help="requests up to this many items are batched")
+        serve.add_argument("--max-pending", type=int, default=256)
+        serve.add_argument("--timeout", type=float, default=30.0)
+
+        load.add_argument("--clients", type=int, default=8)
+        load.add_argument("--requests", type=int, default=100, help="requests per client")
+        load.add_argument("--size", type=int, default=1000, help="items per request")
+        load.add_argument("--algorithm", choices=list(Sorter.ALGORITHMS), default="Quick Sort")
+        load.add_argument("--timeout", type=float)
+        load.add_argument("--spawn", action="store_true",
+                          help="start a service in this process for the test")
+        args = parser.parse_args(argv)
+
+        if args.command == "serve":
+            service = SortService(args.host, args.port, args.unix, args.workers,
+                                  args.small_size, max_pending=args.max_pending,
+                                  timeout=args.timeout)
+            try:
+                asyncio.run(service.serve_forever())
+            except KeyboardInterrupt:
+                pass
+            return 0
+
+        report = asyncio.run(SortClient.load_test(
+            args.host, args.port, args.unix, args.clients, args.requests, args.size,
+            args.algorithm, args.timeout, args.spawn))
+        print(f"{report['requests']} requests, {report['errors']} failed, "
+              f"{report['elapsed']:.3f} s")
+        print(f"throughput {report['requests_per_second']:.1f} requests/s, "
+              f"{report['items_per_second']:.0f} items/s")
+        print(f"latency p50 {report['p50_ms']:.3f} ms, p99 {report['p99_ms']:.3f} ms")
+        return 1 if report["errors"] else 0
+
+
+class SortClient:
+    '''
+    asyncio client of the SortService. Requests are pipelined over one
+    connection and matched to their responses by id.
+    '''
+
+    def __init__(self) -> None:
+        '''
+        Constructor to initialize attributes
+        '''
+        self.__reader = None
+        self.__writer = None
+        self.__receiver = None
+        self.__pending = {}
+        self.__next_id = 0
+
+    async def connect(self, host: str = "127.0.0.1", port: int = 8765, path: str = None) -> None:
+        '''
+        Connects to the service, on the Unix socket at path if one is given
+        '''
+        if path is not None:
+            self.__reader, self.__writer = await asyncio.open_unix_connection(path)
+        else:
+            self.__reader, self.__writer = await asyncio.open_connection(host, port)
+        self.__receiver = asyncio.create_task(self.__receive())
+
+    async def close(self) -> None:
+        '''
+        Closes the connection, waiting requests fail with ConnectionError
+        '''
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
+            self.__writer = None
+        if self.__receiver is not None:
+            self.__receiver.cancel()
+            self.__receiver = None
+
+    async def sort(self, values, algorithm: str = "Quick Sort", timeout: float = None) -> array:
+        '''
+        Sorts the integers on the service and returns them as an int64 array.
+        Raises TimeoutError or RuntimeError if the service could not sort them.
+        '''
+        request_id = self.__next_id
+        self.__next_id = (self.__next_id + 1) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[request_id] = future
+
+        self.__writer.write(SortProtocol.encode_request(request_id, algorithm, values, timeout))
+        await self.__writer.drain()
+
+        status, payload = await future
+        if status == SortProtocol.OK:
+            return payload
+        if status == SortProtocol.TIMEOUT:
+            raise TimeoutError(payload)
+        raise RuntimeError(payload)
+
+    async def __receive(self) -> None:
+        '''
+        Reads responses and completes the matching requests
+        '''
+        try:
+            while True:
+                request_id, status, payload = await SortProtocol.read_response(self.__reader)
+                future = self.__pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, payload))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as error:
+            for future in self.__pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"connection lost: {error}"))
+            self.__pending.clear()
+
+    @staticmethod
+    async def load_test(host: str = "127.0.0.1", port: int = 8765, path: str = None,
+                        clients: int = 8, requests: int = 100, size: int = 1000,
+                        algorithm: str = "Quick Sort", timeout: float = None,
+                        spawn: bool = False) -> dict:
+        '''
+        Static method that runs clients concurrent connections, each sending
+        requests random arrays of size items one after the other, and returns
+        the throughput and the p50 / p99 latency
+        '''
+        service = None
+        if spawn:
+            service = SortService(host, port, path)
+            await service.start()
+
+        latencies = []
+        errors = 0
+
+        async def run_client(seed: int) -> None:
+            nonlocal errors
+            rng = random.Random(seed)
+            client = SortClient()
+            await client.connect(host, port, path)
+            try:
+                for _ in range(requests):
+                    values = [rng.randrange(-1 << 31, 1 << 31) for _ in range(size)]
+                    start = time.perf_counter()
+                    try:
+                        await client.sort(values, algorithm, timeout)
+                        latencies.append(time.perf_counter() - start)
+                    except (TimeoutError, RuntimeError, ConnectionError):
+                        errors += 1
+            finally:
+                await client.close()
+
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(run_client(seed) for seed in range(clients)))
+            elapsed = time.perf_counter() - start
+        finally:
+            if service is not None:
+                await service.close()
+
+        p50, p99 = Sorter.percentiles(latencies, [50, 99]) if latencies else (0.0, 0.0)
+        return {
+            "requests": clients * requests,
+            "errors": errors,
+            "elapsed": elapsed,
+            "requests_per_second": len(latencies) / elapsed,
+            "items_per_second": len(latencies) * size / elapsed,
+            "p50_ms": p50 * 1000,
+            "p99_ms": p99 * 1000,
+        }
+
+
+if __name__ == "__main__":
+    sys.exit(SortService.main())
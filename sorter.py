@@ -1,58 +1,193 @@
+import operator
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+
 class Sorter:
     '''
     Class to perform different sorting algorithms
     '''
+
+    # Algorithm names shown to the user mapped to the method sorting with it
+    ALGORITHMS = {
+        "Insertion Sort": "insertion_sort",
+        "Heap Sort": "heap_sort",
+        "Quick Sort": "quick_sort",
+        "Three-Way Quick Sort": "three_way_quick_sort",
+        "Counting Sort": "counting_sort",
+        "Radix Sort": "radix_sort",
+        "Merge Sort": "merge_sort",
+        "Auto": "auto_sort",
+    }
+
+    # Backends that can run the algorithms, "python" is the reference one
+    BACKENDS = ("python", "numpy")
+
+    # Backend used when a call does not pick one
+    __backend = "python"
+
+    @staticmethod
+    def set_backend(backend: str) -> None:
+        '''
+        Static method that selects the backend used by default in Sorter.sort
+        '''
+        if backend not in Sorter.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        Sorter.__backend = backend
+
+    @staticmethod
+    def get_backend() -> str:
+        '''
+        Static method that returns the backend used by default in Sorter.sort
+        '''
+        return Sorter.__backend
+
+    @staticmethod
+    def sort(array, algorithm: str = "Quick Sort", backend: str = None, key=None,
+             reverse: bool = False):
+        '''
+        Static method to sort the array with the algorithm of the given name on
+        the given backend, or on the default backend if none is given. key and
+        reverse work like in the builtin sorted.
+        '''
+        if algorithm not in Sorter.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        backend = backend or Sorter.__backend
+        method = Sorter.ALGORITHMS[algorithm]
+
+        if backend == "numpy":
+            # Imported here so the pure Python path never loads NumPy
+            from vectorized import VectorizedSorter
+            if key is not None or reverse:
+                return VectorizedSorter.sort_by_key(array, key, reverse)
+            return getattr(VectorizedSorter, method)(array)
+        elif backend == "python":
+            # The list-based algorithms need a list to copy and sort
+            if not isinstance(array, list):
+                array = list(array)
+            return getattr(Sorter, method)(array, key, reverse)
+        raise ValueError(f"Unknown backend: {backend}")
+
     @staticmethod
-    def insertion_sort(array: list) -> list:
+    def sort_inplace(array, algorithm: str = "Quick Sort", backend: str = None, copy: bool = False,
+                     key=None, reverse: bool = False):
+        '''
+        Static method to sort any mutable sequence or writable buffer in place:
+        a list, array.array, bytearray, one-dimensional memoryview or NumPy
+        array. Nothing is copied unless copy is set, in which case a sorted
+        copy of the same type is made and the input is left untouched. Returns
+        the sorted sequence. With key or reverse the order is computed on the
+        side and written back, which needs one index per element.
+        '''
+        if algorithm not in Sorter.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        backend = backend or Sorter.__backend
+        if backend not in Sorter.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        if isinstance(array, memoryview):
+            if array.readonly:
+                raise TypeError("cannot sort a read-only buffer in place")
+            if array.ndim != 1:
+                raise ValueError("only one-dimensional buffers can be sorted")
+        if copy:
+            array = Sorter.__copy(array)
+
+        if backend == "numpy":
+            # Imported here so the pure Python path never loads NumPy
+            from vectorized import VectorizedSorter
+            VectorizedSorter.sort_inplace(array, Sorter.ALGORITHMS[algorithm], key, reverse)
+        elif key is not None or reverse:
+            ordered = Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse,
+                                            Sorter.ALGORITHMS[algorithm])
+            for i, value in enumerate(ordered):
+                array[i] = value
+        else:
+            getattr(Sorter, Sorter.ALGORITHMS[algorithm] + "_inplace")(array)
+        return array
+
+    @staticmethod
+    def insertion_sort(array: list, key=None, reverse: bool = False) -> list:
         '''
         Static method to sort the array using insertion sort
         '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "insertion_sort")
         # Create copy of array
         array_copy = array[:]
+        Sorter.insertion_sort_inplace(array_copy)
+        # Return this sorted copy of the array
+        return array_copy
+
+    @staticmethod
+    def insertion_sort_inplace(array) -> None:
+        '''
+        Static method to sort the mutable sequence in place using insertion sort
+        '''
         # For i from 1 to n - 1
         for i in range(1, len(array)):
             j = i
             # Insert ith element at appropriate position in the left portion
-            while j > 0 and array_copy[j] < array_copy[j - 1]:
-                Sorter.__swap(array_copy, j, j - 1)
+            while j > 0 and array[j] < array[j - 1]:
+                Sorter.__swap(array, j, j - 1)
                 j -= 1
-        # Return this sorted copy of the array
-        return array_copy
 
     @staticmethod
-    def heap_sort(array: list) -> list:
+    def heap_sort(array: list, key=None, reverse: bool = False) -> list:
         '''
         Static method to sort the array using heap sort
         '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "heap_sort")
         array_copy = array[:]  # Create a copy of the array
-        last_index = len(array_copy) - 1  # Last index
-        # Build heap till last index
-        Sorter.__build_heap(array_copy, last_index)
-        # While the last index hasn't reached the first element
-        while last_index > 0:
-            # Perform heapify operation till the last index
-            Sorter.__heapify(array_copy, 0, last_index)
-            # Now the first element contains the maximum element, swap it with last index
-            Sorter.__swap(array_copy, 0, last_index)
-            # Reduce the last index by 1
-            last_index -= 1
+        Sorter.heap_sort_inplace(array_copy)
+
         # Return the sorted copy of the array
         return array_copy
 
     @staticmethod
-    def counting_sort(array):
+    def heap_sort_inplace(array) -> None:
+        '''
+        Static method to sort the mutable sequence in place using heap sort
+        '''
+        # Heap sort the whole sequence without any recursion
+        Sorter.__heap_sort_range(array, 0, len(array) - 1)
+
+    @staticmethod
+    def counting_sort(array, key=None, reverse: bool = False):
         '''
-        Static method to sort the array using counting sort
+        Static method to sort the array using counting sort. A key must map the
+        elements to integers.
         '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "counting_sort")
         array_copy = array[:]
+        Sorter.counting_sort_inplace(array_copy)
+        return array_copy
 
-        # Get the minimum and maximum element
-        minimum = min(array_copy)
-        maximum = max(array_copy)
+    @staticmethod
+    def counting_sort_inplace(array) -> None:
+        '''
+        Static method to sort the mutable integer sequence in place using
+        counting sort
+        '''
+        if len(array) < 2:
+            return
+
+        # Get the minimum and maximum element, as plain ints even when they come
+        # from a NumPy array
+        minimum = operator.index(min(array))
+        maximum = operator.index(max(array))
 
         # The size of frequency array will be the difference + 1
         size = (maximum - minimum) + 1
 
+        # A range much wider than the array would need a huge frequency array,
+        # so switch to radix sort which only needs O(n + base) memory
+        if size > Sorter.COUNTING_RANGE_FACTOR * len(array) + Sorter.RADIX_BASE:
+            Sorter.__lsd_radix_sort(array, minimum, maximum)
+            return
+
         # Frequency array of specified size, filled with 0
         frequency_array = [0 for i in range(size+1)]
 
@@ -62,8 +197,8 @@ class Sorter:
         # also make better use of space if the array is only positive because size
         # will be (max - min) + 1 rather than max + 1
 
-        for i in range(len(array_copy)):
-            frequency_array[array_copy[i] - minimum] += 1
+        for i in range(len(array)):
+            frequency_array[array[i] - minimum] += 1
 
         sortedIndex = 0             # Index to place sorted value on in the array
 
@@ -77,100 +212,1044 @@ class Sorter:
                 # index back to element, as we subtracted it earlier to convert
                 # element into frequency array index). Increment sorted index and
                 # decrement the frequency
-                array_copy[sortedIndex] = i + minimum
+                array[sortedIndex] = i + minimum
                 sortedIndex += 1
                 occurences -= 1
 
+    @staticmethod
+    def radix_sort(array: list, key=None, reverse: bool = False) -> list:
+        '''
+        Static method to sort the integer array using LSD radix sort. A key must
+        map the elements to integers.
+        '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "radix_sort")
+        array_copy = array[:]   # Create a copy of the array
+        Sorter.radix_sort_inplace(array_copy)
         return array_copy
 
     @staticmethod
-    def quick_sort(array: list) -> list:
+    def radix_sort_inplace(array) -> None:
+        '''
+        Static method to sort the mutable integer sequence in place using LSD
+        radix sort
+        '''
+        if len(array) > 1:
+            # Plain ints even for NumPy arrays, whose scalars lack bit_length
+            Sorter.__lsd_radix_sort(array, operator.index(min(array)), operator.index(max(array)))
+
+    @staticmethod
+    def quick_sort(array: list, key=None, reverse: bool = False) -> list:
         '''
         Static method to sort the array using quick sort
         '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "quick_sort")
         array_copy = array[:]   # Create a copy of the array
+        Sorter.quick_sort_inplace(array_copy)
+        return array_copy
+
+    @staticmethod
+    def quick_sort_inplace(array) -> None:
+        '''
+        Static method to sort the mutable sequence in place using quick sort
+        '''
+        # Call the iterative introsort engine from 0 to (size - 1)
+        Sorter.__helper_quick_sort(array, 0, len(array)-1)
+
+    @staticmethod
+    def three_way_quick_sort(array: list, key=None, reverse: bool = False) -> list:
+        '''
+        Static method to sort the array using three-way quick sort, which is
+        made for inputs with many duplicates
+        '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "three_way_quick_sort")
+        array_copy = array[:]   # Create a copy of the array
+        Sorter.three_way_quick_sort_inplace(array_copy)
+        return array_copy
 
-        # Call the helper recursive function from 0 to (size - 1)
-        Sorter.__helper_quick_sort(array_copy, 0, len(array_copy)-1)
+    @staticmethod
+    def three_way_quick_sort_inplace(array) -> None:
+        '''
+        Static method to sort the mutable sequence in place using three-way quick
+        sort. Every partition step gathers all elements equal to the pivot in the
+        middle and never touches them again, so d distinct values take
+        O(n log d) time. Inputs with only a few distinct values are counted in a
+        dictionary instead, in O(n + d log d) time.
+        '''
+        if not Sorter.__hash_count_sort(array):
+            Sorter.__helper_three_way_quick_sort(array, 0, len(array)-1)
 
+    @staticmethod
+    def merge_sort(array: list, key=None, reverse: bool = False) -> list:
+        '''
+        Static method to sort the array using a stable natural merge sort. It
+        runs in O(n) on sorted or reversed input and O(n log n) in the worst case.
+        '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "merge_sort")
+        array_copy = array[:]   # Create a copy of the array
+        Sorter.merge_sort_inplace(array_copy)
         return array_copy
 
     @staticmethod
-    def __helper_quick_sort(array, start, end):
+    def merge_sort_inplace(array) -> None:
         '''
-        Private Static method to help the quicksort method in implemention with proper parameters
+        Static method to sort the mutable sequence in place using the stable
+        natural merge sort. Only the merge buffer of n / 2 slots is allocated.
         '''
-        # Applying Recursive case
-        if start < end:
+        size = len(array)
+        if size < 2:
+            return
+
+        min_run = Sorter.__min_run_length(size)
+
+        # The smaller of two merged runs is never longer than half the array, so
+        # one buffer of that size serves every merge. It has the type of the
+        # array, as typed buffers only accept slices of their own type.
+        buffer = Sorter.__copy(array[:size // 2 + 1])
+
+        # Stack of (start, length) of the runs waiting to be merged
+        runs = []
+        start = 0
+        while start < size:
+            # Take the natural run starting here, reversing it if it descends
+            length = Sorter.__count_run(array, start, size)
+
+            # Extend short runs to min_run with binary insertion sort
+            if length < min_run:
+                forced = min(min_run, size - start)
+                Sorter.__binary_insertion_sort(array, start, start + forced, start + length)
+                length = forced
+
+            runs.append((start, length))
+            Sorter.__merge_collapse(array, runs, buffer)
+            start += length
+
+        # Merge whatever is left on the stack, from the top down
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            Sorter.__merge_at(array, runs, n, buffer)
+
+    @staticmethod
+    def auto_sort(array: list, key=None, reverse: bool = False) -> list:
+        '''
+        Static method that profiles a sample of the array and sorts it with the
+        algorithm the calibrated cost model predicts to be the fastest
+        '''
+        if key is not None or reverse:
+            return Sorter.__sort_by_keys(array, Sorter.__keys(array, key), reverse, "auto_sort")
+        # Imported here because the auto module builds on the Sorter
+        from auto import AutoSorter
+        return AutoSorter.sort(array)
+
+    @staticmethod
+    def auto_sort_inplace(array) -> None:
+        '''
+        Static method that sorts the mutable sequence in place with the algorithm
+        the Auto mode picks for it
+        '''
+        from auto import AutoSorter
+        AutoSorter.sort_inplace(array)
+
+    @staticmethod
+    def run_length_sort(array, algorithm: str = "Three-Way Quick Sort", backend: str = None,
+                        reverse: bool = False) -> list:
+        '''
+        Static method that returns the sorted array run-length encoded, as one
+        (value, count) pair per distinct value. Only the distinct values are
+        sorted with the algorithm, so d distinct values take O(n + d log d) time
+        and the result O(d) memory.
+        '''
+        if algorithm not in Sorter.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        backend = backend or Sorter.__backend
+
+        if backend == "numpy":
+            # Imported here so the pure Python path never loads NumPy
+            from vectorized import VectorizedSorter
+            return VectorizedSorter.run_length_sort(array, reverse)
+        elif backend == "python":
+            counts = Counter(array)
+            distinct = Sorter.sort(list(counts), algorithm, "python", reverse=reverse)
+            return [(value, counts[value]) for value in distinct]
+        raise ValueError(f"Unknown backend: {backend}")
+
+    @staticmethod
+    def select(array: list, k: int):
+        '''
+        Static method that returns the k-th smallest element (0-based) of the array
+        using introselect, in O(n) time
+        '''
+        if not -len(array) <= k < len(array):
+            raise IndexError("select index out of range")
+        if k < 0:
+            k += len(array)
+
+        array_copy = array[:]   # Create a copy of the array
+        Sorter.__introselect(array_copy, 0, len(array_copy) - 1, k)
+        return array_copy[k]
+
+    @staticmethod
+    def partial_sort(array: list, k: int, largest: bool = False) -> list:
+        '''
+        Static method that returns the k smallest elements in ascending order, or
+        the k largest in descending order, in O(n log k) time
+        '''
+        k = min(k, len(array))
+        if k <= 0:
+            return []
+
+        if largest:
+            # Move the k largest behind position n - k, then sort only them
+            array_copy = array[:]
+            start = len(array_copy) - k
+            Sorter.__introselect(array_copy, 0, len(array_copy) - 1, start)
+            Sorter.__heap_sort_range(array_copy, start, len(array_copy) - 1)
+            largest_part = array_copy[start:]
+            largest_part.reverse()
+            return largest_part
+
+        # Bounded max heap holding the k smallest elements seen so far
+        heap = array[:k]
+        Sorter.__build_heap(heap, 0, k)
+        for i in range(k, len(array)):
+            # Replace the largest of the k when a smaller element comes along
+            if array[i] < heap[0]:
+                Sorter.__sift_down(heap, 0, 0, k, array[i])
+
+        Sorter.__heap_sort_range(heap, 0, k - 1)
+        return heap
+
+    @staticmethod
+    def multi_select(array: list, ranks: list) -> list:
+        '''
+        Static method that returns the elements at several 0-based ranks of the
+        sorted order, sharing the partitioning work between all of them
+        '''
+        size = len(array)
+        wanted = []
+        for rank in ranks:
+            if not -size <= rank < size:
+                raise IndexError("select index out of range")
+            wanted.append(rank + size if rank < 0 else rank)
+        if not wanted:
+            return []
+
+        array_copy = array[:]   # Create a copy of the array
+        Sorter.__multi_select(array_copy, sorted(set(wanted)))
+        return [array_copy[rank] for rank in wanted]
+
+    @staticmethod
+    def percentiles(array: list, percents: list) -> list:
+        '''
+        Static method that returns the nearest-rank percentiles of the array for
+        every percentage in percents (0 to 100)
+        '''
+        if not array:
+            raise ValueError("percentiles of an empty array")
+
+        ranks = []
+        for percent in percents:
+            if not 0 <= percent <= 100:
+                raise ValueError("percent must be between 0 and 100")
+            # Nearest rank is ceil(p / 100 * n), counted from 1
+            rank = -(-percent * len(array) // 100)
+            ranks.append(max(int(rank), 1) - 1)
+
+        return Sorter.multi_select(array, ranks)
+
+    # Counting sort hands over to radix sort once the value range exceeds
+    # this many counters per element (plus one radix base worth of slack)
+    COUNTING_RANGE_FACTOR = 4
+
+    # Largest digit base used by radix sort, 16 bits per pass
+    RADIX_BASE = 1 << 16
+
+    # Three-way quick sort counts the values in a dictionary when there is at
+    # most one distinct value per this many elements
+    DUPLICATE_FACTOR = 4
+
+    # The values are counted in this many chunks, so that too many distinct
+    # values stop the count after little more than a quarter of the input
+    DUPLICATE_CHUNKS = 16
+
+    # Galloping starts once one run wins this many times in a row
+    MIN_GALLOP = 7
+
+    # Slices smaller than this are finished off with insertion sort
+    INSERTION_CUTOFF = 16
+
+    # Slices larger than this use the ninther instead of median of three
+    NINTHER_THRESHOLD = 128
+
+    @staticmethod
+    def __helper_quick_sort(array: list, start: int, end: int) -> None:
+        '''
+        Private Static method that sorts array[start..end] with introsort. It keeps
+        an explicit stack instead of recursing, always continues with the smaller
+        side and falls back to heap sort once the partition depth gets too large.
+        '''
+        if end - start < 1:
+            return
+
+        # Depth limit of 2 * log2(n) before switching to heap sort
+        depth_limit = 2 * (end - start + 1).bit_length()
+        stack = [(start, end, depth_limit)]
+
+        while stack:
+            start, end, depth = stack.pop()
+
+            # Keep partitioning while the slice is above the insertion cutoff
+            while end - start + 1 > Sorter.INSERTION_CUTOFF:
+                # Too many bad pivots, guarantee O(n log n) with heap sort
+                if depth == 0:
+                    Sorter.__heap_sort_range(array, start, end)
+                    break
+                depth -= 1
+
+                split = Sorter.__select_and_place_pivot_on_its_place(
+                    array, start, end)
+
+                # Push the larger side and continue with the smaller one, so the
+                # stack never holds more than log2(n) entries
+                if split - start < end - split:
+                    stack.append((split + 1, end, depth))
+                    end = split
+                else:
+                    stack.append((start, split, depth))
+                    start = split + 1
+            else:
+                # Small slice left, insertion sort is fastest here
+                Sorter.__insertion_sort_range(array, start, end)
+
+    @staticmethod
+    def __helper_three_way_quick_sort(array: list, start: int, end: int) -> None:
+        '''
+        Private Static method that sorts array[start..end] with three-way
+        partitioning. Like the introsort engine it keeps an explicit stack,
+        continues with the smaller side and falls back to heap sort once the
+        partition depth gets too large.
+        '''
+        if end - start < 1:
+            return
+
+        # Depth limit of 2 * log2(n) before switching to heap sort
+        depth_limit = 2 * (end - start + 1).bit_length()
+        stack = [(start, end, depth_limit)]
 
-            # Calls the helper function to Select and place pivot on appropriate position
-            pivot_index = Sorter.__select_and_place_pivot_on_its_place(
-                array, start, end)
+        while stack:
+            start, end, depth = stack.pop()
 
-            # Recursively repeating the quicksort algorithm for left and right sub arrays
-            Sorter.__helper_quick_sort(array, start, pivot_index - 1)
-            Sorter.__helper_quick_sort(array, pivot_index + 1, end)
+            # Keep partitioning while the slice is above the insertion cutoff
+            while end - start + 1 > Sorter.INSERTION_CUTOFF:
+                if depth == 0:
+                    Sorter.__heap_sort_range(array, start, end)
+                    break
+                depth -= 1
+
+                # array[lower..upper] holds every copy of the pivot, in place
+                lower, upper = Sorter.__three_way_partition(
+                    array, start, end, Sorter.__choose_pivot(array, start, end))
+
+                # Push the larger side and continue with the smaller one
+                if lower - start < end - upper:
+                    stack.append((upper + 1, end, depth))
+                    end = lower - 1
+                else:
+                    stack.append((start, lower - 1, depth))
+                    start = upper + 1
+            else:
+                # Small slice left, insertion sort is fastest here
+                Sorter.__insertion_sort_range(array, start, end)
 
     @staticmethod
-    def __select_and_place_pivot_on_its_place(array: list, start: int, end: int) -> None:
+    def __three_way_partition(array: list, start: int, end: int, pivot_index: int) -> tuple:
         '''
-        Helper function that selects a pivot and places it on it's appropriate position
+        Private helper static method, Dijkstra's three-way partitioning of
+        array[start..end]. Returns (lower, upper) such that the elements before
+        lower are smaller than the pivot, array[lower..upper] equal it and the
+        elements after upper are larger.
         '''
-        pivot = array[end]  # Select the last element as pivot
-        i = start - 1       # Pointer at previous index of pivot's position
+        pivot = array[pivot_index]
+        lower = start       # First element equal to the pivot
+        i = start           # Next element to look at
+        upper = end         # Last element not known to be larger
 
-        # Start j from start to second last element
-        for j in range(start, end):
-            # If jth element is less than pivot
-            if array[j] < pivot:
-                # Increment the i's previous position and swap ith and jth element
+        while i <= upper:
+            value = array[i]
+            if value < pivot:
+                array[i] = array[lower]
+                array[lower] = value
+                lower += 1
                 i += 1
-                Sorter.__swap(array, i, j)
+            elif pivot < value:
+                array[i] = array[upper]
+                array[upper] = value
+                upper -= 1
+            else:
+                i += 1
+        return lower, upper
+
+    @staticmethod
+    def __hash_count_sort(array) -> bool:
+        '''
+        Private helper static method that sorts low-cardinality input by counting
+        every value in a dictionary and sorting only the distinct values. Equal
+        values are written back as the first of them that was seen. Returns
+        False, leaving the array untouched, as soon as the count passes one
+        distinct value per DUPLICATE_FACTOR elements, or if the values cannot
+        be hashed.
+        '''
+        size = len(array)
+        if size <= Sorter.INSERTION_CUTOFF:
+            return False
+
+        limit = size // Sorter.DUPLICATE_FACTOR
+        chunk = -(-size // Sorter.DUPLICATE_CHUNKS)
+        counts = Counter()
+        try:
+            for start in range(0, size, chunk):
+                counts.update(array[start:start + chunk])
+                if len(counts) > limit:
+                    return False
+        except TypeError:
+            return False
+
+        distinct = list(counts)
+        Sorter.__helper_three_way_quick_sort(distinct, 0, len(distinct)-1)
+
+        # Write every value back as a run of its count
+        i = 0
+        for value in distinct:
+            count = counts[value]
+            if isinstance(array, list):
+                array[i:i + count] = [value] * count
+            else:
+                for j in range(i, i + count):
+                    array[j] = value
+            i += count
+        return True
+
+    @staticmethod
+    def __min_run_length(size: int) -> int:
+        '''
+        Private helper static method that returns the minimum run length, between
+        32 and 64, chosen so that size / min_run is close to a power of two
+        '''
+        remainder = 0
+        while size >= 64:
+            remainder |= size & 1
+            size >>= 1
+        return size + remainder
+
+    @staticmethod
+    def __count_run(array: list, start: int, size: int) -> int:
+        '''
+        Private helper static method that returns the length of the run starting
+        at start. A strictly descending run is reversed in place, so the returned
+        run is always ascending and stability is kept.
+        '''
+        end = start + 1
+        if end == size:
+            return 1
+
+        if array[end] < array[start]:
+            # Strictly descending run
+            while end + 1 < size and array[end + 1] < array[end]:
+                end += 1
+            array[start:end + 1] = array[start:end + 1][::-1]
+        else:
+            # Non-descending run
+            while end + 1 < size and not array[end + 1] < array[end]:
+                end += 1
+        return end + 1 - start
+
+    @staticmethod
+    def __binary_insertion_sort(array: list, start: int, end: int, sorted_end: int) -> None:
+        '''
+        Private helper static method that sorts array[start..end - 1] whose prefix
+        up to sorted_end is already sorted, placing each element with a binary
+        search and one slice shift
+        '''
+        for i in range(sorted_end, end):
+            value = array[i]
+            # bisect_right keeps equal elements in their original order
+            position = bisect_right(array, value, start, i)
+            array[position + 1:i + 1] = array[position:i]
+            array[position] = value
+
+    @staticmethod
+    def __merge_collapse(array: list, runs: list, buffer: list) -> None:
+        '''
+        Private helper static method that merges runs on top of the stack until
+        the run lengths satisfy len(X) > len(Y) + len(Z) and len(Y) > len(Z)
+        for any three consecutive runs X, Y, Z from the bottom up
+        '''
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+                    (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+            elif runs[n][1] > runs[n + 1][1]:
+                return
+            Sorter.__merge_at(array, runs, n, buffer)
+
+    @staticmethod
+    def __merge_at(array: list, runs: list, n: int, buffer: list) -> None:
+        '''
+        Private helper static method that merges the runs at stack positions n
+        and n + 1
+        '''
+        start, left_length = runs[n]
+        middle, right_length = runs[n + 1]
+        end = middle + right_length
+        runs[n] = (start, left_length + right_length)
+        del runs[n + 1]
+
+        # Elements of the left run not above the first right element are
+        # already in place
+        start = Sorter.__gallop(array, array[middle], start, middle, True, False)
+        if start == middle:
+            return
+
+        # Elements of the right run above the last left element are too
+        end = Sorter.__gallop(array, array[middle - 1], middle, end, False, True)
+        if end == middle:
+            return
+
+        # Copy the shorter run into the buffer
+        if middle - start <= end - middle:
+            Sorter.__merge_low(array, start, middle, end, buffer)
+        else:
+            Sorter.__merge_high(array, start, middle, end, buffer)
+
+    @staticmethod
+    def __gallop(array: list, value, low: int, high: int, right: bool, from_end: bool) -> int:
+        '''
+        Private helper static method that returns where value belongs in the
+        sorted array[low..high - 1], after equal elements if right is set and
+        before them otherwise. Probes exponentially from the start, or from the
+        end if from_end is set, before the final binary search, so the cost is
+        logarithmic in the distance from that side.
+        '''
+        search = bisect_right if right else bisect_left
 
-        # Swap the pivot with it's new position and return this position
-        Sorter.__swap(array, i + 1, end)
-        return i + 1
+        # Whether an element belongs before value
+        def before(element):
+            return not value < element if right else element < value
+
+        offset = 1
+        if from_end:
+            last = high
+            while high - offset >= low and not before(array[high - offset]):
+                last = high - offset
+                offset *= 2
+            return search(array, value, max(high - offset + 1, low), last)
+
+        last = low
+        while low + offset - 1 < high and before(array[low + offset - 1]):
+            last = low + offset
+            offset *= 2
+        return search(array, value, last, min(low + offset - 1, high))
+
+    @staticmethod
+    def __merge_low(array: list, start: int, middle: int, end: int, buffer: list) -> None:
+        '''
+        Private helper static method that merges the runs array[start..middle - 1]
+        and array[middle..end - 1] from the front, with the left run in the buffer
+        '''
+        length = middle - start
+        buffer[:length] = array[start:middle]
+        i = 0           # Next element of the left run in the buffer
+        j = middle      # Next element of the right run
+        k = start       # Next position to fill
+
+        min_gallop = Sorter.MIN_GALLOP
+
+        while i < length and j < end:
+            # One at a time until a run keeps winning
+            left_wins = right_wins = 0
+            while True:
+                if array[j] < buffer[i]:
+                    array[k] = array[j]
+                    k += 1
+                    j += 1
+                    right_wins += 1
+                    left_wins = 0
+                    if j == end or right_wins >= min_gallop:
+                        break
+                else:
+                    array[k] = buffer[i]
+                    k += 1
+                    i += 1
+                    left_wins += 1
+                    right_wins = 0
+                    if i == length or left_wins >= min_gallop:
+                        break
+
+            # Galloping, copy whole stretches while they stay long
+            while i < length and j < end:
+                stop = Sorter.__gallop(buffer, array[j], i, length, True, False)
+                left_count = stop - i
+                array[k:k + left_count] = buffer[i:stop]
+                k += left_count
+                i = stop
+                if i == length:
+                    break
+
+                stop = Sorter.__gallop(array, buffer[i], j, end, False, False)
+                right_count = stop - j
+                array[k:k + right_count] = array[j:stop]
+                k += right_count
+                j = stop
+
+                if left_count < min_gallop and right_count < min_gallop:
+                    break
+
+        # The rest of the right run is already in place
+        array[k:k + length - i] = buffer[i:length]
 
     @staticmethod
-    def __build_heap(array: list, size: int):
+    def __merge_high(array: list, start: int, middle: int, end: int, buffer: list) -> None:
         '''
-        Perform heapify operation from 2nd last level upto root
+        Private helper static method that merges the runs array[start..middle - 1]
+        and array[middle..end - 1] from the back, with the right run in the buffer
         '''
-        middle = int(len(array) / 2)
-        while middle >= 0:
-            Sorter.__heapify(array, middle, size)
-            middle -= 1
+        length = end - middle
+        buffer[:length] = array[middle:end]
+        i = middle - 1  # Last element of the left run
+        j = length - 1  # Last element of the right run in the buffer
+        k = end - 1     # Last position to fill
+
+        min_gallop = Sorter.MIN_GALLOP
+
+        while i >= start and j >= 0:
+            # One at a time until a run keeps winning
+            left_wins = right_wins = 0
+            while True:
+                if buffer[j] < array[i]:
+                    array[k] = array[i]
+                    k -= 1
+                    i -= 1
+                    left_wins += 1
+                    right_wins = 0
+                    if i < start or left_wins >= min_gallop:
+                        break
+                else:
+                    array[k] = buffer[j]
+                    k -= 1
+                    j -= 1
+                    right_wins += 1
+                    left_wins = 0
+                    if j < 0 or right_wins >= min_gallop:
+                        break
+
+            # Galloping, copy whole stretches while they stay long
+            while i >= start and j >= 0:
+                stop = Sorter.__gallop(array, buffer[j], start, i + 1, True, True)
+                left_count = i + 1 - stop
+                array[k - left_count + 1:k + 1] = array[stop:i + 1]
+                k -= left_count
+                i = stop - 1
+                if i < start:
+                    break
+
+                stop = Sorter.__gallop(buffer, array[i], 0, j + 1, False, True)
+                right_count = j + 1 - stop
+                array[k - right_count + 1:k + 1] = buffer[stop:j + 1]
+                k -= right_count
+                j = stop - 1
+
+                if left_count < min_gallop and right_count < min_gallop:
+                    break
+
+        # The rest of the left run is already in place
+        array[start:start + j + 1] = buffer[:j + 1]
 
     @staticmethod
-    def __heapify(array: list, index: int, size: int) -> None:
+    def __lsd_radix_sort(array: list, minimum: int, maximum: int) -> None:
         '''
-        Performs heapify operation on the max heap to restore heap property
+        Private Static method that sorts the integer array in place with LSD
+        radix sort. Values are shifted by the minimum so negative numbers become
+        non-negative keys, and each pass scatters the keys between two
+        preallocated buffers.
         '''
-        max_child = Sorter.__left_child_index(index)
-        right_child = Sorter.__right_child_index(index)
-        if max_child > size:
+        size = len(array)
+        span = maximum - minimum
+        if span == 0:
             return
-        elif right_child <= size:
-            if array[right_child] > array[max_child]:
-                max_child = right_child
 
-        if array[index] < array[max_child]:
-            Sorter.__swap(array, index, max_child)
-        Sorter.__heapify(array, max_child, size)
+        # Byte digits for small arrays, 16-bit digits once a pass can pay for
+        # the larger count table
+        digit_bits = 16 if size >= Sorter.RADIX_BASE else 8
+        base = 1 << digit_bits
+        mask = base - 1
+
+        # Signed values to non-negative keys, plus the ping-pong buffer
+        source = [value - minimum for value in array]
+        target = [0] * size
+
+        for shift in range(0, span.bit_length(), digit_bits):
+            # Count how many keys carry every digit value
+            counts = [0] * base
+            for key in source:
+                counts[(key >> shift) & mask] += 1
+
+            # Turn the counts into the first output position of each digit
+            position = 0
+            for digit in range(base):
+                counts[digit], position = position, position + counts[digit]
+
+            # Stable scatter into the other buffer
+            for key in source:
+                digit = (key >> shift) & mask
+                target[counts[digit]] = key
+                counts[digit] += 1
+
+            source, target = target, source
+
+        # Map the keys back to the original values
+        for i in range(size):
+            array[i] = source[i] + minimum
+
+    @staticmethod
+    def __introselect(array: list, start: int, end: int, k: int) -> None:
+        '''
+        Private Static method that rearranges array[start..end] so that array[k]
+        holds the element of that rank, smaller ones before it and larger after.
+        Switches to median of medians pivots once the depth limit is hit, which
+        keeps the worst case linear.
+        '''
+        depth = 2 * (end - start + 1).bit_length()
+
+        while end - start + 1 > Sorter.INSERTION_CUTOFF:
+            if depth > 0:
+                depth -= 1
+                pivot_index = Sorter.__choose_pivot(array, start, end)
+            else:
+                pivot_index = Sorter.__median_of_medians(array, start, end)
+
+            # Continue only in the side that holds rank k
+            split = Sorter.__partition(array, start, end, pivot_index)
+            if k <= split:
+                end = split
+            else:
+                start = split + 1
+
+        Sorter.__insertion_sort_range(array, start, end)
+
+    @staticmethod
+    def __median_of_medians(array: list, start: int, end: int) -> int:
+        '''
+        Private helper static method that returns the index of an approximate
+        median of array[start..end] using the medians of groups of five
+        '''
+        groups = 0
+        for group_start in range(start, end + 1, 5):
+            group_end = min(group_start + 4, end)
+            # Sort the group and move its median to the front of the slice
+            Sorter.__insertion_sort_range(array, group_start, group_end)
+            median = group_start + (group_end - group_start) // 2
+            Sorter.__swap(array, start + groups, median)
+            groups += 1
+
+        # Select the median of the group medians
+        middle = start + (groups - 1) // 2
+        Sorter.__introselect(array, start, start + groups - 1, middle)
+        return middle
 
     @staticmethod
-    def __left_child_index(index: int) -> int:
+    def __multi_select(array: list, ranks: list) -> None:
         '''
-        Private helper static method to get the left child of node
+        Private Static method that places every rank of the sorted list ranks at
+        its final position. Each partition step splits the ranks between both
+        sides, and slices without any rank are left alone.
         '''
-        return index * 2 + 1
+        stack = [(0, len(array) - 1, 0, len(ranks),
+                  2 * len(array).bit_length())]
+
+        while stack:
+            start, end, first, last, depth = stack.pop()
+            if first == last:
+                continue
+
+            # A single rank left is a plain selection
+            if last - first == 1:
+                Sorter.__introselect(array, start, end, ranks[first])
+                continue
+
+            if end - start + 1 <= Sorter.INSERTION_CUTOFF:
+                Sorter.__insertion_sort_range(array, start, end)
+                continue
+
+            if depth > 0:
+                pivot_index = Sorter.__choose_pivot(array, start, end)
+            else:
+                pivot_index = Sorter.__median_of_medians(array, start, end)
+            split = Sorter.__partition(array, start, end, pivot_index)
+
+            # Ranks first..middle - 1 fall on the left side of the split
+            middle = first
+            while middle < last and ranks[middle] <= split:
+                middle += 1
+
+            stack.append((start, split, first, middle, depth - 1))
+            stack.append((split + 1, end, middle, last, depth - 1))
+
+    @staticmethod
+    def __median_of_three(array: list, a: int, b: int, c: int) -> int:
+        '''
+        Private helper static method that returns the index holding the median of
+        array[a], array[b] and array[c]
+        '''
+        x, y, z = array[a], array[b], array[c]
+        if x < y:
+            if y < z:
+                return b
+            return c if x < z else a
+        if x < z:
+            return a
+        return c if y < z else b
+
+    @staticmethod
+    def __choose_pivot(array: list, start: int, end: int) -> int:
+        '''
+        Private helper static method that picks the pivot index of array[start..end]
+        using median of three, or Tukey's ninther for large slices
+        '''
+        middle = start + (end - start) // 2
+        if end - start + 1 <= Sorter.NINTHER_THRESHOLD:
+            return Sorter.__median_of_three(array, start, middle, end)
+
+        # Median of the medians of three evenly spaced triples
+        step = (end - start + 1) // 8
+        first = Sorter.__median_of_three(
+            array, start, start + step, start + 2 * step)
+        second = Sorter.__median_of_three(
+            array, middle - step, middle, middle + step)
+        third = Sorter.__median_of_three(
+            array, end - 2 * step, end - step, end)
+        return Sorter.__median_of_three(array, first, second, third)
+
+    @staticmethod
+    def __select_and_place_pivot_on_its_place(array: list, start: int, end: int) -> int:
+        '''
+        Helper function that selects a pivot and performs Hoare partitioning around
+        it. Returns the split index so that array[start..split] <= pivot and
+        array[split + 1..end] >= pivot, with both sides non-empty.
+        '''
+        return Sorter.__partition(
+            array, start, end, Sorter.__choose_pivot(array, start, end))
+
+    @staticmethod
+    def __partition(array: list, start: int, end: int, pivot_index: int) -> int:
+        '''
+        Hoare partitioning of array[start..end] around the element at pivot_index
+        '''
+        # Move the pivot to the front so the split is never at end
+        array[start], array[pivot_index] = array[pivot_index], array[start]
+        pivot = array[start]
+
+        i = start - 1       # Left pointer, moves right
+        j = end + 1         # Right pointer, moves left
+
+        while True:
+            # Find an element on the left that does not belong there
+            i += 1
+            while array[i] < pivot:
+                i += 1
+
+            # Find an element on the right that does not belong there
+            j -= 1
+            while array[j] > pivot:
+                j -= 1
+
+            # Pointers crossed, j is the split point
+            if i >= j:
+                return j
+
+            array[i], array[j] = array[j], array[i]
+
+    @staticmethod
+    def __insertion_sort_range(array: list, start: int, end: int) -> None:
+        '''
+        Private helper static method that insertion sorts array[start..end] by
+        shifting elements to the right instead of swapping them
+        '''
+        for i in range(start + 1, end + 1):
+            value = array[i]
+            j = i - 1
+            # Shift larger elements one place to the right
+            while j >= start and value < array[j]:
+                array[j + 1] = array[j]
+                j -= 1
+            array[j + 1] = value
+
+    @staticmethod
+    def __heap_sort_range(array: list, start: int, end: int) -> None:
+        '''
+        Private helper static method that heap sorts array[start..end] in place.
+        Used by heap sort and as the introsort fallback.
+        '''
+        size = end - start + 1
+
+        # Floyd's bottom-up build, sifting down from the last parent to the root
+        Sorter.__build_heap(array, start, size)
+
+        # Repeatedly move the maximum behind the shrinking heap. The old last
+        # element is sifted down from the root through the hole left there.
+        for last in range(size - 1, 0, -1):
+            value = array[start + last]
+            array[start + last] = array[start]
+            Sorter.__sift_down(array, start, 0, last, value)
+
+    @staticmethod
+    def __build_heap(array: list, offset: int, size: int) -> None:
+        '''
+        Builds a max heap of the given size stored at array[offset..], starting
+        at the last parent and moving up to the root
+        '''
+        for root in range(size // 2 - 1, -1, -1):
+            Sorter.__sift_down(array, offset, root, size, array[offset + root])
+
+    @staticmethod
+    def __sift_down(array: list, offset: int, root: int, size: int, value) -> None:
+        '''
+        Places value into the max heap of the given size stored at array[offset..],
+        starting with a hole at root. Larger children are moved up into the hole
+        until value fits, so every level costs one move instead of a swap.
+        '''
+        child = 2 * root + 1
+
+        # While the hole still has two children
+        while child + 1 < size:
+            # Pick the larger of the two children
+            child_value = array[offset + child]
+            right_value = array[offset + child + 1]
+            if child_value < right_value:
+                child += 1
+                child_value = right_value
+            # Stop early once the value is not smaller than the larger child
+            if not value < child_value:
+                array[offset + root] = value
+                return
+            # Move the child up into the hole
+            array[offset + root] = child_value
+            root = child
+            child = 2 * root + 1
+
+        # A single left child may remain at the bottom when size is even
+        if child == size - 1 and value < array[offset + child]:
+            array[offset + root] = array[offset + child]
+            root = child
+
+        array[offset + root] = value
+
+    @staticmethod
+    def __keys(array, key) -> list:
+        '''
+        Private helper static method that calls key exactly once per element, the
+        elements are their own keys without one
+        '''
+        if key is None:
+            return array
+        return [key(value) for value in array]
+
+    @staticmethod
+    def __sort_by_keys(array, keys, reverse: bool, method: str) -> list:
+        '''
+        Private helper static method behind key and reverse, returning the
+        elements of the array ordered by the precomputed keys. Comparison sorts
+        run on (key, index) pairs and counting and radix sort order the indices
+        by integer key, so every algorithm is stable here.
+        '''
+        if method == "auto_sort":
+            # Let the Auto mode pick the algorithm from the keys themselves
+            from auto import AutoSorter
+            method = Sorter.ALGORITHMS[AutoSorter.choose(keys)]
+
+        if method in ("counting_sort", "radix_sort"):
+            # Plain ints for any integer type, NumPy scalars would wrap around
+            # or overflow when negated, offset and shifted
+            try:
+                keys = [operator.index(key) for key in keys]
+            except TypeError:
+                raise TypeError("counting and radix sort need integer keys") from None
+            # Negated keys sort descending while equal keys keep their order
+            if reverse:
+                keys = [-key for key in keys]
+            order = Sorter.__integer_key_order(keys, method == "radix_sort")
+            return [array[i] for i in order]
+
+        # For reverse, sort with negated indices and flip the result, so equal
+        # keys still come out in their original order
+        sign = -1 if reverse else 1
+        decorated = [(key, sign * i) for i, key in enumerate(keys)]
+        getattr(Sorter, method + "_inplace")(decorated)
+        if reverse:
+            decorated.reverse()
+        return [array[sign * i] for _, i in decorated]
+
+    @staticmethod
+    def __integer_key_order(keys: list, radix: bool) -> list:
+        '''
+        Private helper static method that returns the indices of the plain int
+        keys in stable sorted order, with one counting pass when the key range is
+        small and LSD radix passes otherwise
+        '''
+        size = len(keys)
+        if size < 2:
+            return list(range(size))
+        minimum = min(keys)
+        span = max(keys) - minimum
+
+        if not radix and span + 1 <= Sorter.COUNTING_RANGE_FACTOR * size + Sorter.RADIX_BASE:
+            digit_bits = span.bit_length() or 1
+        else:
+            digit_bits = 16 if size >= Sorter.RADIX_BASE else 8
+        mask = (1 << digit_bits) - 1
+
+        shifted = [key - minimum for key in keys]
+        order = list(range(size))
+        target = [0] * size
+
+        # A single pass when the digit covers the whole span, which makes it
+        # a plain stable counting sort
+        for shift in range(0, max(span.bit_length(), 1), digit_bits):
+            counts = [0] * (mask + 1)
+            for key in shifted:
+                counts[(key >> shift) & mask] += 1
+
+            position = 0
+            for digit in range(mask + 1):
+                counts[digit], position = position, position + counts[digit]
+
+            for i in order:
+                digit = (shifted[i] >> shift) & mask
+                target[counts[digit]] = i
+                counts[digit] += 1
+
+            order, target = target, order
+        return order
 
     @staticmethod
-    def __right_child_index(index: int) -> int:
+    def __copy(array):
         '''
-        Private helper static method to get the right child of node
+        Private helper static method that copies a sequence into a new one of
+        the same type
         '''
-        return Sorter.__left_child_index(index) + 1
+        if isinstance(array, memoryview):
+            # Slicing a memoryview only makes another view, copy its bytes
+            return memoryview(bytearray(array)).cast(array.format)
+        if hasattr(array, "copy"):
+            # Lists, bytearrays and NumPy arrays, whose slices are views
+            return array.copy()
+        return array[:]
 
     @staticmethod
     def __swap(array: list, x: int, y: int):
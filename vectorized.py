@@ -0,0 +1,258 @@
+from sorter import Sorter
+
+# NumPy is optional, the pure Python Sorter stays usable without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class VectorizedSorter:
+    '''
+    NumPy backend of the Sorter algorithms. Every method accepts any integer
+    array-like and returns a new sorted NumPy array with exactly the same
+    values as the list-based implementation.
+    '''
+
+    # Radix digit width, at most 16 so every digit fits a uint16, NumPy handles
+    # a 16-bit histogram per pass cheaply
+    __DIGIT_BITS = 16
+
+    # Sorter methods that ndarray.sort can run in place, with their kind
+    __INPLACE_KINDS = {
+        "insertion_sort": "stable",
+        "heap_sort": "heapsort",
+        "quick_sort": "quicksort",
+        "three_way_quick_sort": "quicksort",
+        "merge_sort": "stable",
+        "auto_sort": "quicksort",
+    }
+
+    @staticmethod
+    def is_available() -> bool:
+        '''
+        Static method that tells whether NumPy could be imported
+        '''
+        return numpy is not None
+
+    @staticmethod
+    def insertion_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the array with the stable NumPy sort. Insertion sort
+        cannot be vectorized, but it is stable and so is this kernel.
+        '''
+        values = VectorizedSorter.as_array(array)
+        return numpy.sort(values, kind="stable")
+
+    @staticmethod
+    def heap_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the array using NumPy's compiled heap sort
+        '''
+        values = VectorizedSorter.as_array(array)
+        return numpy.sort(values, kind="heapsort")
+
+    @staticmethod
+    def quick_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the array using NumPy's compiled introsort
+        '''
+        values = VectorizedSorter.as_array(array)
+        return numpy.sort(values, kind="quicksort")
+
+    @staticmethod
+    def three_way_quick_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the array using NumPy's introsort, whose
+        partitioning already copes with duplicates
+        '''
+        values = VectorizedSorter.as_array(array)
+        return numpy.sort(values, kind="quicksort")
+
+    @staticmethod
+    def merge_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the array with NumPy's stable sort, a natural merge
+        sort (timsort) for comparison dtypes
+        '''
+        values = VectorizedSorter.as_array(array)
+        return numpy.sort(values, kind="stable")
+
+    @staticmethod
+    def auto_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the array with NumPy's default sort, which already
+        adapts to the dtype
+        '''
+        values = VectorizedSorter.as_array(array)
+        return numpy.sort(values)
+
+    @staticmethod
+    def counting_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the integer array using bincount and repeat
+        '''
+        values = VectorizedSorter.__as_int_array(array)
+        if values.size == 0:
+            return values.copy()
+
+        minimum = int(values.min())
+        maximum = int(values.max())
+        size = maximum - minimum + 1
+
+        # Wide ranges go through radix sort just like the list-based version
+        if size > Sorter.COUNTING_RANGE_FACTOR * values.size + (1 << VectorizedSorter.__DIGIT_BITS):
+            return VectorizedSorter.__lsd_radix_sort(values, minimum)
+
+        # Frequency of every value, then repeat each value that many times. The
+        # offsets are taken in 64 bits, narrow dtypes would wrap around.
+        frequency_array = numpy.bincount(
+            (values.astype(numpy.int64) - minimum).astype(numpy.intp), minlength=size)
+        return numpy.repeat(
+            numpy.arange(minimum, maximum + 1, dtype=values.dtype), frequency_array)
+
+    @staticmethod
+    def radix_sort(array) -> "numpy.ndarray":
+        '''
+        Static method to sort the integer array using vectorized LSD radix sort
+        '''
+        values = VectorizedSorter.__as_int_array(array)
+        if values.size < 2:
+            return values.copy()
+        return VectorizedSorter.__lsd_radix_sort(values, int(values.min()))
+
+    @staticmethod
+    def sort_by_key(array, key=None, reverse: bool = False) -> "numpy.ndarray":
+        '''
+        Static method that sorts the array by key, called once per element, with
+        a stable argsort of the keys. The order is the same for every algorithm,
+        and equal keys keep their order with reverse too. Compound keys such as
+        tuples are sorted with a stable Python sort instead.
+        '''
+        values = VectorizedSorter.as_array(array)
+        if key is None:
+            keys = values
+        else:
+            key_list = [key(value) for value in values.tolist()]
+            keys = numpy.asarray(key_list)
+            if keys.ndim != 1 or keys.dtype == object:
+                # Tuples and other compound keys do not make a 1-D key array,
+                # sort the indices by them in Python, which is stable for
+                # reverse too
+                order = sorted(range(len(key_list)), key=key_list.__getitem__, reverse=reverse)
+                return values[numpy.asarray(order, dtype=numpy.intp)]
+
+        if not reverse:
+            return values[numpy.argsort(keys, kind="stable")]
+        # Stable ascending order of the reversed keys, read backwards
+        order = numpy.argsort(keys[::-1], kind="stable")[::-1]
+        return values[len(keys) - 1 - order]
+
+    @staticmethod
+    def run_length_sort(array, reverse: bool = False) -> list:
+        '''
+        Static method that returns the sorted distinct values with their counts
+        as (value, count) pairs, using numpy.unique
+        '''
+        values, counts = numpy.unique(VectorizedSorter.as_array(array), return_counts=True)
+        if reverse:
+            values, counts = values[::-1], counts[::-1]
+        return list(zip(values.tolist(), counts.tolist()))
+
+    @staticmethod
+    def sort_inplace(array, method: str, key=None, reverse: bool = False) -> None:
+        '''
+        Static method that sorts a NumPy array, or any writable buffer such as
+        array.array, bytearray or memoryview, in place through a NumPy view of
+        its memory. Lists have no buffer, they get the sorted values written back.
+        '''
+        VectorizedSorter.__require_numpy()
+        if isinstance(array, list):
+            if key is not None or reverse:
+                array[:] = VectorizedSorter.sort_by_key(array, key, reverse).tolist()
+            else:
+                array[:] = getattr(VectorizedSorter, method)(array).tolist()
+            return
+
+        values = array if isinstance(array, numpy.ndarray) else numpy.asarray(memoryview(array))
+        if not values.flags.writeable:
+            raise TypeError("cannot sort a read-only buffer in place")
+
+        kind = VectorizedSorter.__INPLACE_KINDS.get(method)
+        if key is not None or reverse:
+            values[...] = VectorizedSorter.sort_by_key(values, key, reverse)
+        elif kind is not None:
+            values.sort(kind=kind)
+        else:
+            # Counting and radix sort build their output, copy it back once
+            values[...] = getattr(VectorizedSorter, method)(values)
+
+    @staticmethod
+    def create_random_array(size: int, min_limit: int, max_limit: int, seed=None) -> "numpy.ndarray":
+        '''
+        Static method that draws size integers in [min_limit, max_limit] with a
+        NumPy random generator in a single call
+        '''
+        VectorizedSorter.__require_numpy()
+        generator = numpy.random.default_rng(seed)
+        return generator.integers(min_limit, max_limit, size=size, endpoint=True, dtype=numpy.int64)
+
+    @staticmethod
+    def __lsd_radix_sort(values: "numpy.ndarray", minimum: int) -> "numpy.ndarray":
+        '''
+        Private Static method running LSD radix passes over whole arrays. Values
+        are shifted by the minimum into unsigned keys, every digit is extracted
+        for all keys at once and reordered with a stable argsort.
+        '''
+        # Signed to unsigned key transform, the wrap-around keeps the order
+        # because every difference fits into 64 bits
+        signed = values.astype(numpy.int64)
+        offset = numpy.array(minimum, dtype=numpy.int64).view(numpy.uint64)
+        keys = signed.view(numpy.uint64) - offset
+
+        digit_bits = VectorizedSorter.__DIGIT_BITS
+        mask = numpy.uint64((1 << digit_bits) - 1)
+        span = int(keys.max())
+
+        for shift in range(0, span.bit_length(), digit_bits):
+            # 16-bit digits let the stable argsort use NumPy's radix sort,
+            # which it only does for integer types of at most 16 bits
+            digits = ((keys >> numpy.uint64(shift)) & mask).astype(numpy.uint16)
+
+            # Skip passes where every key carries the same digit
+            histogram = numpy.bincount(digits)
+            if histogram.max() == keys.size:
+                continue
+
+            keys = keys[numpy.argsort(digits, kind="stable")]
+
+        # Map the keys back to the original values and dtype
+        return (keys + offset).view(numpy.int64).astype(values.dtype)
+
+    @staticmethod
+    def as_array(array) -> "numpy.ndarray":
+        '''
+        Static method converting the input to a NumPy array
+        '''
+        VectorizedSorter.__require_numpy()
+        return numpy.asarray(array)
+
+    @staticmethod
+    def __as_int_array(array) -> "numpy.ndarray":
+        '''
+        Private helper static method converting the input to an integer array
+        '''
+        values = VectorizedSorter.as_array(array)
+        if values.size and values.dtype.kind not in "iu":
+            raise TypeError("counting and radix sort need integer values")
+        if values.size == 0:
+            return values.astype(numpy.int64)
+        return values
+
+    @staticmethod
+    def __require_numpy() -> None:
+        '''
+        Private helper static method that fails clearly when NumPy is missing
+        '''
+        if numpy is None:
+            raise ImportError("the numpy backend needs NumPy to be installed")
@@ -0,0 +1,371 @@
+import tkinter as tk
+from sorter import Sorter
+
+
+class SortEvents:
+    '''
+    Generator versions of the Sorter algorithms for visualization. Each one
+    sorts its own copy of the array and yields compact event tuples:
+    (COMPARE, i, j), (SWAP, i, j) and (WRITE, i, value).
+    '''
+
+    COMPARE = 0
+    SWAP = 1
+    WRITE = 2
+
+    # Algorithms that can be visualized, by their Sorter name
+    ALGORITHMS = {
+        "Insertion Sort": "insertion_sort",
+        "Heap Sort": "heap_sort",
+        "Quick Sort": "quick_sort",
+        "Counting Sort": "counting_sort",
+        "Radix Sort": "radix_sort",
+    }
+
+    @staticmethod
+    def events(array, algorithm: str):
+        '''
+        Returns the event generator of the named algorithm over a copy of array
+        '''
+        if algorithm not in SortEvents.ALGORITHMS:
+            raise ValueError(f"{algorithm} cannot be visualized")
+        return getattr(SortEvents, SortEvents.ALGORITHMS[algorithm])(list(array))
+
+    @staticmethod
+    def insertion_sort(array: list):
+        '''
+        Events of Sorter.insertion_sort
+        '''
+        for i in range(1, len(array)):
+            j = i
+            while j > 0:
+                yield (SortEvents.COMPARE, j, j - 1)
+                if not array[j] < array[j - 1]:
+                    break
+                array[j], array[j - 1] = array[j - 1], array[j]
+                yield (SortEvents.SWAP, j, j - 1)
+                j -= 1
+
+    @staticmethod
+    def heap_sort(array: list):
+        '''
+        Events of Sorter.heap_sort
+        '''
+        yield from SortEvents.__heap_sort_range(array, 0, len(array) - 1)
+
+    @staticmethod
+    def quick_sort(array: list):
+        '''
+        Events of Sorter.quick_sort, the iterative introsort
+        '''
+        if len(array) < 2:
+            return
+        depth_limit = 2 * len(array).bit_length()
+        stack = [(0, len(array) - 1, depth_limit)]
+
+        while stack:
+            start, end, depth = stack.pop()
+            while end - start + 1 > Sorter.INSERTION_CUTOFF:
+                if depth == 0:
+                    yield from SortEvents.__heap_sort_range(array, start, end)
+                    break
+                depth -= 1
+
+                # Same pivot as the Sorter, moved to the front for Hoare partitioning
+                pivot_index = SortEvents.__choose_pivot(array, start, end)
+                array[start], array[pivot_index] = array[pivot_index], array[start]
+                yield (SortEvents.SWAP, start, pivot_index)
+                pivot = array[start]
+
+                i = start - 1
+                j = end + 1
+                while True:
+                    i += 1
+                    while array[i] < pivot:
+                        yield (SortEvents.COMPARE, i, start)
+                        i += 1
+                    j -= 1
+                    while array[j] > pivot:
+                        yield (SortEvents.COMPARE, j, start)
+                        j -= 1
+                    if i >= j:
+                        break
+                    array[i], array[j] = array[j], array[i]
+                    yield (SortEvents.SWAP, i, j)
+
+                if j - start < end - j:
+                    stack.append((j + 1, end, depth))
+                    end = j
+                else:
+                    stack.append((start, j, depth))
+                    start = j + 1
+            else:
+                yield from SortEvents.__insertion_sort_range(array, start, end)
+
+    @staticmethod
+    def counting_sort(array: list):
+        '''
+        Events of Sorter.counting_sort, writing every value back in sorted order
+        '''
+        if not array:
+            return
+        minimum = min(array)
+        maximum = max(array)
+        size = maximum - minimum + 1
+        if size > Sorter.COUNTING_RANGE_FACTOR * len(array) + Sorter.RADIX_BASE:
+            yield from SortEvents.radix_sort(array)
+            return
+
+        frequency_array = [0] * size
+        for value in array:
+            frequency_array[value - minimum] += 1
+
+        sorted_index = 0
+        for offset, occurences in enumerate(frequency_array):
+            for _ in range(occurences):
+                array[sorted_index] = offset + minimum
+                yield (SortEvents.WRITE, sorted_index, offset + minimum)
+                sorted_index += 1
+
+    @staticmethod
+    def radix_sort(array: list):
+        '''
+        Events of Sorter.radix_sort. The ping-pong buffer is not visible, so
+        the array is rewritten in the order of every finished pass.
+        '''
+        if len(array) < 2:
+            return
+        minimum = min(array)
+        span = max(array) - minimum
+        digit_bits = 16 if len(array) >= Sorter.RADIX_BASE else 8
+        mask = (1 << digit_bits) - 1
+
+        keys = [value - minimum for value in array]
+        for shift in range(0, span.bit_length(), digit_bits):
+            buckets = [[] for _ in range(mask + 1)]
+            for key in keys:
+                buckets[(key >> shift) & mask].append(key)
+            keys = [key for bucket in buckets for key in bucket]
+            for i, key in enumerate(keys):
+                array[i] = key + minimum
+                yield (SortEvents.WRITE, i, key + minimum)
+
+    @staticmethod
+    def __choose_pivot(array: list, start: int, end: int) -> int:
+        '''
+        Index of the median of three, or of the ninther for large slices, like
+        the Sorter picks it
+        '''
+        def median(a, b, c):
+            return sorted((a, b, c), key=array.__getitem__)[1]
+
+        middle = start + (end - start) // 2
+        if end - start + 1 <= Sorter.NINTHER_THRESHOLD:
+            return median(start, middle, end)
+        step = (end - start + 1) // 8
+        return median(median(start, start + step, start + 2 * step),
+                      median(middle - step, middle, middle + step),
+                      median(end - 2 * step, end - step, end))
+
+    @staticmethod
+    def __insertion_sort_range(array: list, start: int, end: int):
+        '''
+        Events of the Sorter's shifting insertion sort of a slice
+        '''
+        for i in range(start + 1, end + 1):
+            value = array[i]
+            j = i - 1
+            while j >= start and value < array[j]:
+                yield (SortEvents.COMPARE, i, j)
+                array[j + 1] = array[j]
+                yield (SortEvents.WRITE, j + 1, array[j])
+                j -= 1
+            array[j + 1] = value
+            yield (SortEvents.WRITE, j + 1, value)
+
+    @staticmethod
+    def __heap_sort_range(array: list, start: int, end: int):
+        '''
+        Events of the Sorter's hole-based heap sort of a slice
+        '''
+        size = end - start + 1
+        for root in range(size // 2 - 1, -1, -1):
+            yield from SortEvents.__sift_down(array, start, root, size, array[start + root])
+        for last in range(size - 1, 0, -1):
+            value = array[start + last]
+            array[start + last] = array[start]
+            yield (SortEvents.WRITE, start + last, array[start])
+            yield from SortEvents.__sift_down(array, start, 0, last, value)
+
+    @staticmethod
+    def __sift_down(array: list, offset: int, root: int, size: int, value):
+        '''
+        Events of the Sorter's sift-down
+        '''
+        child = 2 * root + 1
+        while child < size:
+            if child + 1 < size and array[offset + child] < array[offset + child + 1]:
+                child += 1
+            yield (SortEvents.COMPARE, offset + root, offset + child)
+            if not value < array[offset + child]:
+                break
+            array[offset + root] = array[offset + child]
+            yield (SortEvents.WRITE, offset + root, array[offset + root])
+            root = child
+            child = 2 * root + 1
+        array[offset + root] = value
+        yield (SortEvents.WRITE, offset + root, value)
+
+
+class BarCanvas:
+    '''
+    Canvas bar view that plays an event stream at a fixed frame rate. Many
+    events are applied per frame, only the bars they touched are redrawn, and
+    arrays wider than the canvas are downsampled to one bar per pixel column
+    showing the largest value of its bucket.
+    '''
+
+    __BAR_COLOR = "#634726"
+    __COMPARE_COLOR = "#2e7d32"
+    __CHANGE_COLOR = "#c62828"
+
+    def __init__(self, master: tk.Misc, width: int = 1200, height: int = 500,
+                 frame_rate: int = 30, on_finish=None) -> None:
+        '''
+        Constructor to initialize attributes and create the canvas
+        '''
+        self.canvas = tk.Canvas(master, width=width, height=height, bg="#a3947e",
+                                highlightthickness=0)
+        self.__width = width
+        self.__height = height
+        self.__frame_interval = max(1000 // frame_rate, 1)
+        self.__on_finish = on_finish
+
+        self.__values = []
+        self.__bars = []
+        self.__bucket = 1
+        self.__minimum = 0
+        self.__span = 1
+        self.__events = None
+        self.__highlighted = set()
+        self.__scheduled = None
+
+        # Events applied per frame, may be changed while playing
+        self.events_per_frame = 100
+
+    def set_array(self, array) -> None:
+        '''
+        Shows the array as bars, one bar per element or per bucket of elements
+        '''
+        self.stop()
+        self.__values = list(array)
+        self.canvas.delete("all")
+        self.__bars = []
+        if not self.__values:
+            return
+
+        count = len(self.__values)
+        self.__bucket = -(-count // self.__width)
+        self.__minimum = min(self.__values)
+        self.__span = max(max(self.__values) - self.__minimum, 1)
+
+        columns = -(-count // self.__bucket)
+        bar_width = self.__width / columns
+        for column in range(columns):
+            x = column * bar_width
+            bar = self.canvas.create_rectangle(x, self.__height, x + max(bar_width - 1, 1), self.__height,
+                                               fill=BarCanvas.__BAR_COLOR, outline="")
+            self.__bars.append(bar)
+            self.__redraw(column, BarCanvas.__BAR_COLOR)
+
+    def play(self, events) -> None:
+        '''
+        Starts playing the event stream
+        '''
+        self.stop()
+        self.__events = events
+        self.__schedule()
+
+    def pause(self) -> None:
+        '''
+        Stops playing but keeps the stream, resume continues it
+        '''
+        if self.__scheduled is not None:
+            self.canvas.after_cancel(self.__scheduled)
+            self.__scheduled = None
+
+    def resume(self) -> None:
+        '''
+        Continues a paused stream
+        '''
+        if self.__events is not None and self.__scheduled is None:
+            self.__schedule()
+
+    def stop(self) -> None:
+        '''
+        Stops playing and drops the stream
+        '''
+        self.pause()
+        self.__events = None
+
+    def __schedule(self) -> None:
+        self.__scheduled = self.canvas.after(self.__frame_interval, self.__frame)
+
+    def __frame(self) -> None:
+        '''
+        Applies up to events_per_frame events and redraws the touched bars once
+        '''
+        self.__scheduled = None
+        values = self.__values
+        bucket = self.__bucket
+        compared = set()
+        changed = set()
+        finished = False
+
+        for _ in range(max(int(self.events_per_frame), 1)):
+            event = next(self.__events, None)
+            if event is None:
+                finished = True
+                break
+            kind, i, j = event
+            if kind == SortEvents.COMPARE:
+                compared.add(i // bucket)
+                compared.add(j // bucket)
+            elif kind == SortEvents.SWAP:
+                values[i], values[j] = values[j], values[i]
+                changed.add(i // bucket)
+                changed.add(j // bucket)
+            else:
+                values[i] = j
+                changed.add(i // bucket)
+
+        # Restore the bars highlighted in the previous frame
+        for column in self.__highlighted - compared - changed:
+            self.__redraw(column, BarCanvas.__BAR_COLOR)
+        for column in compared - changed:
+            self.__redraw(column, BarCanvas.__COMPARE_COLOR)
+        for column in changed:
+            self.__redraw(column, BarCanvas.__CHANGE_COLOR)
+        self.__highlighted = compared | changed
+
+        if finished:
+            for column in self.__highlighted:
+                self.__redraw(column, BarCanvas.__BAR_COLOR)
+            self.__highlighted = set()
+            self.__events = None
+            if self.__on_finish is not None:
+                self.__on_finish()
+        else:
+            self.__schedule()
+
+    def __redraw(self, column: int, color: str) -> None:
+        '''
+        Resizes and recolors the bar of one column from the largest value of
+        its bucket
+        '''
+        first = column * self.__bucket
+        tallest = max(self.__values[first:first + self.__bucket])
+        top = self.__height - (tallest - self.__minimum + 1) * (self.__height - 1) / (self.__span + 1)
+        x0, _, x1, _ = self.canvas.coords(self.__bars[column])
+        self.canvas.coords(self.__bars[column], x0, top, x1, self.__height)
+        self.canvas.itemconfigure(self.__bars[column], fill=color)
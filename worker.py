@@ -0,0 +1,213 @@
+import multiprocessing
+import time
+from arrayfile import ArrayFile
+from complexity import ComplexityEstimator
+from generator import Generator
+from instrumented import InstrumentedSorter
+from memory import MemoryProfiler, MemoryUsage
+from sorter import Sorter
+
+
+def generate_task(report, size: int, min_limit: int, max_limit: int, chunk_size: int = 1 << 16) -> list:
+    '''
+    Worker task that generates a random array chunk by chunk, reporting the
+    fraction done after every chunk
+    '''
+    array = []
+    for chunk in Generator.stream_workload(size, min_limit, max_limit, chunk_size=chunk_size):
+        array.extend(chunk)
+        report(len(array) / size)
+    return array
+
+
+def sort_task(report, array: list, algorithm: str, count_operations: bool = False,
+              measure_memory: bool = False, run_length: bool = False) -> tuple:
+    '''
+    Worker task that sorts the array with the named algorithm. Returns the
+    sorted array, or its (value, count) pairs if run_length is set, with the running time in seconds, measured inside the worker
+    so it does not include any GUI work, the operation counts of a second,
+    instrumented run if they were asked for (None otherwise), and the
+    MemoryUsage: the peak RSS growth of the timed run, plus the tracemalloc
+    peak and blocks of a traced run if memory measuring was asked for.
+    '''
+    sort = Sorter.run_length_sort if run_length else Sorter.sort
+    rss_before = MemoryProfiler.peak_rss()
+    start = time.perf_counter()
+    answer = sort(array, algorithm)
+    time_taken = time.perf_counter() - start
+    rss_after = MemoryProfiler.peak_rss()
+
+    # The instrumented and traced runs are separate so they cannot slow down
+    # the timed one
+    counter = None
+    if count_operations and algorithm in InstrumentedSorter.ALGORITHMS:
+        counter = InstrumentedSorter.count(array, algorithm)[1]
+    memory = MemoryUsage()
+    if measure_memory:
+        memory = MemoryProfiler.measure(sort, array, algorithm)[1]
+    if rss_before is not None:
+        memory.rss_delta_bytes = rss_after - rss_before
+    return answer, time_taken, counter, memory
+
+
+def sort_file_task(report, path: str, algorithm: str, count_operations: bool = False,
+                   measure_memory: bool = False, run_length: bool = False) -> tuple:
+    '''
+    Worker task that memory-maps the array file at path and sorts it, so a
+    loaded file never has to be sent to the worker
+    '''
+    return sort_task(report, ArrayFile.load(path), algorithm, count_operations, measure_memory,
+                     run_length)
+
+
+def race_task(report, array: list, algorithm: str, count_operations: bool = False) -> tuple:
+    '''
+    Worker task of one race entry. Sorts like sort_task but only sends back the
+    running time, the operation counts and whether the answer is in order, so
+    the sorted array is not copied back once for every algorithm.
+    '''
+    answer, time_taken, counter, _ = sort_task(report, array, algorithm, count_operations)
+    in_order = all(not answer[i + 1] < answer[i] for i in range(len(answer) - 1))
+    return time_taken, counter, in_order
+
+
+def race_file_task(report, path: str, algorithm: str, count_operations: bool = False) -> tuple:
+    '''
+    Worker task of one race entry on an array file, mapped by every worker
+    '''
+    return race_task(report, ArrayFile.load(path), algorithm, count_operations)
+
+
+def estimate_task(report, array: list, algorithm: str):
+    '''
+    Worker task that predicts the running time and memory of sorting the array,
+    see ComplexityEstimator.estimate. The models are read from the cache file
+    first, the ones of the GUI process may be older than it.
+    '''
+    ComplexityEstimator.reload()
+    return ComplexityEstimator.estimate(array, algorithm)
+
+
+def estimate_file_task(report, path: str, algorithm: str):
+    '''
+    Worker task that estimates the sort of the array file at path
+    '''
+    return estimate_task(report, ArrayFile.load(path), algorithm)
+
+
+def _run_task(connection, task, args: tuple) -> None:
+    '''
+    Entry point of the worker process. Sends progress messages while the task
+    runs and then exactly one "done" or "error" message.
+    '''
+    try:
+        result = task(lambda fraction: connection.send(("progress", fraction)), *args)
+        connection.send(("done", result))
+    except Exception as error:
+        connection.send(("error", f"{type(error).__name__}: {error}"))
+    finally:
+        connection.close()
+
+
+class SortJob:
+    '''
+    Runs a task in a separate process so the GUI stays responsive. The GUI polls
+    the job from root.after, and cancel or a timeout kills the process.
+    '''
+
+    # States a job can be in
+    RUNNING = "running"
+    DONE = "done"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+    TIMEOUT = "timeout"
+
+    def __init__(self, task, args: tuple = (), timeout: float = None) -> None:
+        '''
+        Constructor to initialize attributes. The task must be a module level
+        function taking a progress callback followed by args.
+        '''
+        self.__task = task
+        self.__args = args
+        self.__timeout = timeout
+        self.__process = None
+        self.__connection = None
+        self.__started = None
+
+        # Public state, read by the GUI after every poll
+        self.state = None
+        self.progress = None
+        self.result = None
+        self.error = None
+
+    def start(self) -> None:
+        '''
+        Starts the worker process
+        '''
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self.__process = multiprocessing.Process(
+            target=_run_task, args=(sender, self.__task, self.__args), daemon=True)
+        self.__process.start()
+        # The child owns the sending end now
+        sender.close()
+        self.__connection = receiver
+        self.__started = time.perf_counter()
+        self.state = SortJob.RUNNING
+
+    def elapsed(self) -> float:
+        '''
+        Seconds since the job was started
+        '''
+        return time.perf_counter() - self.__started
+
+    def poll(self) -> str:
+        '''
+        Reads every message the worker sent so far and enforces the timeout.
+        Never blocks, returns the state of the job.
+        '''
+        if self.state != SortJob.RUNNING:
+            return self.state
+
+        try:
+            while self.__connection.poll():
+                message = self.__connection.recv()
+                if message[0] == "progress":
+                    self.progress = message[1]
+                else:
+                    self.__finish(message[0])
+                    if message[0] == SortJob.DONE:
+                        self.result = message[1]
+                    else:
+                        self.error = message[1]
+                    return self.state
+        except EOFError:
+            # The process died without reporting anything
+            self.__finish(SortJob.ERROR)
+            self.error = "The worker process stopped unexpectedly"
+            return self.state
+
+        if self.__timeout is not None and self.elapsed() > self.__timeout:
+            self.__kill(SortJob.TIMEOUT)
+        return self.state
+
+    def cancel(self) -> None:
+        '''
+        Aborts the job by terminating its process
+        '''
+        if self.state == SortJob.RUNNING:
+            self.__kill(SortJob.CANCELLED)
+
+    def __kill(self, state: str) -> None:
+        '''
+        Terminates the worker process and records the final state
+        '''
+        self.__process.terminate()
+        self.__finish(state)
+
+    def __finish(self, state: str) -> None:
+        '''
+        Records the final state and releases the process and pipe
+        '''
+        self.state = state
+        self.__connection.close()
+        self.__process.join(timeout=1)